@@ -0,0 +1,356 @@
+# bench/micro.py
+"""
+core veri katmanı mikro benchmark'ları (asv benzeri).
+
+Her boyut için core.synth ile geçici bir veri kökü üretilir; işlemler aynı
+süreçte storage.use_root ile o köke karşı ölçülür. Benchmark başına repeat
+kez ölçülür, rapora çağrı başına min/medyan ms girer:
+    hazırlıksız → timeit gibi çağrı sayısı otomatik seçilir (önbellek sıcak)
+    [soğuk]     → her çağrıdan önce core.cache ve modül durumları boşaltılır
+                  (taze süreçteki ilk çağrı)
+Sonuç bench/results/micro-<arka uç>.json'a yazılır. --save-baseline aynı
+raporu bench/baselines/'a kaydeder; sonraki koşular oraya göre
+karşılaştırılır ve eşiği aşan gerilemeler işaretlenir.
+
+    python bench/micro.py                                # small + medium
+    python bench/micro.py --sizes large --only get_curriculum list_progress
+    python bench/micro.py --save-baseline                # referansı güncelle
+    python bench/micro.py --check --threshold 1.3        # gerileme → çıkış kodu 1
+"""
+from __future__ import annotations
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+import argparse
+import itertools
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+RESULTS = ROOT / "bench" / "results"
+BASELINES = ROOT / "bench" / "baselines"
+_MIN_TIME = 0.05   # sn; sıcak ölçümde tek tekrarın en kısa süresi
+_THRESHOLD = 1.5   # medyan bu oranı aşarsa gerileme (küçük boyutta ölçüm gürültüsü ~%30)
+
+# ad → fabrika(ctx) → fn ya da (hazırlık, fn)
+BENCHES: dict = {}
+
+
+def bench(name: str):
+    def deco(factory):
+        BENCHES[name] = factory
+        return factory
+    return deco
+
+
+# ----------------- ölçüm -----------------
+
+def _cold() -> None:
+    """Taze süreç gibi: bekleyenleri yaz, önbelleği ve kök başına modül durumunu at."""
+    from core import assignments, cache, curriculum, storage
+
+    assignments.flush_assignments()
+    curriculum.flush_journal()
+    cache.invalidate()
+    root = storage.data_root()
+    assignments._TENANTS.pop(root, None)
+    curriculum._TENANTS.pop(root, None)
+
+
+def _autorange(fn) -> int:
+    for n in itertools.chain.from_iterable((k, 2 * k, 5 * k) for k in (10 ** i for i in range(7))):
+        t0 = perf_counter()
+        for _ in range(n):
+            fn()
+        if perf_counter() - t0 >= _MIN_TIME:
+            return n
+    return n
+
+
+def measure(spec, repeat: int) -> dict:
+    setup, fn = spec if isinstance(spec, tuple) else (None, spec)
+    times = []
+    if setup is None:
+        number = _autorange(fn)
+        for _ in range(repeat):
+            t0 = perf_counter()
+            for _ in range(number):
+                fn()
+            times.append((perf_counter() - t0) / number)
+    else:
+        number = 1
+        for _ in range(repeat):
+            setup()
+            t0 = perf_counter()
+            fn()
+            times.append(perf_counter() - t0)
+    return {"min_ms": round(min(times) * 1000, 4), "median_ms": round(median(times) * 1000, 4),
+            "number": number, "repeat": repeat}
+
+
+# ----------------- benchmark'lar -----------------
+
+@bench("load_topics")
+def _load_topics(ctx):
+    from core.dataio import load_topics
+    return lambda: load_topics("beginner_min")
+
+
+@bench("load_topics[soğuk]")
+def _load_topics_cold(ctx):
+    from core.dataio import load_topics
+    return _cold, lambda: load_topics("beginner_min")
+
+
+@bench("load_students")
+def _load_students(ctx):
+    from core.dataio import load_students
+    return load_students
+
+
+@bench("load_students[soğuk]")
+def _load_students_cold(ctx):
+    from core.dataio import load_students
+    return _cold, load_students
+
+
+@bench("add_student")
+def _add_student(ctx):
+    from core.dataio import add_student
+    n = itertools.count()
+    return lambda: add_student(f"Bench {ctx['tag']} {next(n)}")
+
+
+@bench("get_curriculum")
+def _get_curriculum(ctx):
+    from core.curriculum import get_curriculum
+    return lambda: get_curriculum(ctx["sid"], ctx["subject"])
+
+
+@bench("get_curriculum[soğuk]")
+def _get_curriculum_cold(ctx):
+    from core.curriculum import get_curriculum
+    return _cold, lambda: get_curriculum(ctx["sid"], ctx["subject"])
+
+
+@bench("log_minutes")
+def _log_minutes(ctx):
+    from core.curriculum import log_minutes
+    return lambda: log_minutes(ctx["sid"], ctx["subject"], ctx["topic"], 5)
+
+
+@bench("list_progress")
+def _list_progress(ctx):
+    from core.curriculum import list_progress
+    return lambda: list_progress(ctx["sid"], ctx["subject"])
+
+
+@bench("list_progress[soğuk]")
+def _list_progress_cold(ctx):
+    from core.curriculum import list_progress
+    return _cold, lambda: list_progress(ctx["sid"], ctx["subject"])
+
+
+@bench("get_assignments")
+def _get_assignments(ctx):
+    from core.assignments import get_assignments
+    return lambda: get_assignments(int(ctx["sid"]), ctx["week"])
+
+
+@bench("get_assignments[soğuk]")
+def _get_assignments_cold(ctx):
+    from core.assignments import get_assignments
+    return _cold, lambda: get_assignments(int(ctx["sid"]), ctx["week"])
+
+
+@bench("update_status")
+def _update_status(ctx):
+    from core.assignments import update_status
+    r = ctx["assignment"]
+    flip = itertools.cycle([True, False])
+    # yazım _FLUSH_EVERY değişiklikte bir toplu yapılır; ölçüm bu amortize maliyeti verir
+    return lambda: update_status(int(r["student_id"]), ctx["week"], r["ders"], r["konu"], next(flip),
+                                 r["birim"], r["kaynak"])
+
+
+@bench("add_bulk")
+def _add_bulk(ctx):
+    from core.assignments import add_bulk
+    ws = ctx["week"]
+    rows = [{"week_start": ws, "student_id": int(ctx["sid"]), "ders": ctx["subject"], "konu": f"Bench {i}",
+             "birim": "Soru", "miktar": 20, "kaynak": "", "durum": False} for i in range(20)]
+    return lambda: add_bulk(rows)
+
+
+@bench("recommend_exams")
+def _recommend_exams(ctx):
+    from core.exam_reviews import recommend_exams
+    return lambda: recommend_exams("TYT Türkçe", "Orta")
+
+
+@bench("recommend_exams[soğuk]")
+def _recommend_exams_cold(ctx):
+    from core.exam_reviews import recommend_exams
+    return _cold, lambda: recommend_exams("TYT Türkçe", "Orta")
+
+
+@bench("build_sequential_plan")
+def _build_sequential_plan(ctx):
+    from core.plan import build_sequential_plan
+    return lambda: build_sequential_plan(ctx["status"], 90, ctx["dates"])
+
+
+def _pdf(backend: str):
+    def factory(ctx):
+        from core.export import assignments_to_pdf
+        rows, ws = ctx["rows"], ctx["week"]
+        return lambda: assignments_to_pdf(rows, "Bench Öğrenci", ws, ws + timedelta(days=6), backend)
+    return factory
+
+
+bench("assignments_to_pdf[matplotlib]")(_pdf("matplotlib"))
+bench("assignments_to_pdf[direct]")(_pdf("direct"))
+
+
+# ----------------- koşu -----------------
+
+def _context(tag: str) -> dict:
+    """Ölçümlerde kullanılacak örnek öğrenci/ders/hafta (planı ve ödevi olan ilk öğrenci)."""
+    from core import assignments, curriculum, dataio, plan, storage
+
+    week = date.fromisoformat(str(sorted(storage.partitions("assignments"))[0]))
+    week_df = assignments.get_week_assignments(week)
+    sid = str(int(week_df["student_id"].iloc[0]))
+    cur = curriculum.get_curriculum(sid)
+    subject = str(cur["subject"].iloc[0])
+    rows = week_df[week_df["student_id"] == int(sid)]
+    topics = dataio.load_topics("beginner_min")
+    status = plan.compute_status(topics[topics["subject"] == subject], dataio.load_progress(), int(sid))[0]
+    return {
+        "tag": tag, "sid": sid, "subject": subject, "week": week, "rows": rows,
+        "topic": str(cur.loc[cur["subject"] == subject, "topic"].iloc[0]),
+        "assignment": rows.iloc[0].to_dict(),
+        "status": status,
+        "dates": plan.get_study_dates(week, [0, 2, 4, 6], days=28),
+    }
+
+
+def run_size(size_name: str, size: dict, names: list[str], repeat: int, seed: int, backend: str) -> dict:
+    from core import assignments, curriculum, storage
+    from core.synth import generate
+
+    tmp = Path(tempfile.mkdtemp(prefix="koc-micro-"))
+    try:
+        counts = generate(tmp, seed=seed, **size)
+        out = []
+        with storage.use_root(tmp):
+            storage.partitions("assignments")  # bölümleme ölçüme girmesin
+            if backend == "sqlite":
+                storage.import_csv()
+            ctx = _context(size_name)
+            for name in names:
+                try:
+                    spec = BENCHES[name](ctx)
+                    res = measure(spec, repeat)
+                except ImportError as e:
+                    res = {"skipped": f"kurulu değil: {e.name}"}
+                out.append({"name": name, **res})
+            assignments.flush_assignments()
+            curriculum.flush_journal()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return {"rows": counts, "benches": out}
+
+
+def run(sizes: list[str], names: list[str] | None = None, repeat: int = 7, seed: int = 0,
+        backend: str = "csv") -> dict:
+    from core.synth import SIZES
+    import pandas as pd
+
+    os.environ["KOC_STORAGE"] = backend
+    names = names or list(BENCHES)
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "backend": backend,
+        "seed": seed,
+        "sizes": {s: run_size(s, SIZES[s], names, repeat, seed, backend) for s in sizes},
+    }
+
+
+def compare(rep: dict, baseline: dict | None, threshold: float = _THRESHOLD) -> list[dict]:
+    """Satır başına oran (medyan / referans medyan); eşik dışındakiler işaretlenir."""
+    rows = []
+    for size, res in rep["sizes"].items():
+        old = {b["name"]: b for b in ((baseline or {}).get("sizes", {}).get(size) or {}).get("benches", [])}
+        for b in res["benches"]:
+            o = old.get(b["name"], {})
+            ratio = b["median_ms"] / o["median_ms"] if "median_ms" in b and o.get("median_ms") else None
+            flag = ""
+            if ratio is not None and ratio > threshold:
+                flag = "YAVAŞ"
+            elif ratio is not None and ratio < 1 / threshold:
+                flag = "HIZLI"
+            rows.append({"size": size, **b, "baseline_ms": o.get("median_ms"), "ratio": ratio, "flag": flag})
+    return rows
+
+
+def print_report(rows: list[dict]) -> None:
+    size = None
+    for r in rows:
+        if r["size"] != size:
+            size = r["size"]
+            print(f"\n== {size}")
+        if "skipped" in r:
+            print(f"  {r['name']:<34} atlandı ({r['skipped']})")
+            continue
+        base = f"   ref {r['baseline_ms']:>10.3f}  x{r['ratio']:.2f} {r['flag']}" if r["ratio"] else ""
+        print(f"  {r['name']:<34} {r['median_ms']:>10.3f} ms  (min {r['min_ms']:.3f}, n={r['number']}){base}")
+
+
+if __name__ == "__main__":
+    from core.synth import SIZES
+
+    ap = argparse.ArgumentParser(description="core veri katmanı mikro benchmark'ları.")
+    ap.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small", "medium"])
+    ap.add_argument("--only", nargs="+", help="Yalnız bu benchmark'lar (ad ön eki)")
+    ap.add_argument("--repeat", type=int, default=7)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--backend", choices=["csv", "sqlite"], default="csv")
+    ap.add_argument("--baseline", help="Referans rapor (varsayılan bench/baselines/micro-<arka uç>.json)")
+    ap.add_argument("--save-baseline", action="store_true", help="Bu koşuyu referans olarak kaydet")
+    ap.add_argument("--threshold", type=float, default=_THRESHOLD, help="Gerileme sayılacak medyan oranı")
+    ap.add_argument("--check", action="store_true", help="Gerileme varsa çıkış kodu 1")
+    ap.add_argument("--list", action="store_true", help="Benchmark adlarını yaz")
+    args = ap.parse_args()
+
+    if args.list:
+        print("\n".join(BENCHES))
+        sys.exit(0)
+    names = [n for n in BENCHES if not args.only or any(n.startswith(o) for o in args.only)]
+    rep = run(args.sizes, names, args.repeat, args.seed, args.backend)
+
+    base_path = Path(args.baseline) if args.baseline else BASELINES / f"micro-{args.backend}.json"
+    baseline = json.loads(base_path.read_text(encoding="utf-8")) if base_path.exists() else None
+    rows = compare(rep, baseline, args.threshold)
+    print_report(rows)
+
+    out = RESULTS / f"micro-{args.backend}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(rep, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n→ {out}")
+    if args.save_baseline:
+        base_path.parent.mkdir(parents=True, exist_ok=True)
+        base_path.write_text(json.dumps(rep, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"→ referans: {base_path}")
+    if args.check and any(r["flag"] == "YAVAŞ" for r in rows):
+        sys.exit(1)
@@ -0,0 +1,188 @@
+# bench/pages.py
+"""
+Sayfa render benchmark'ı.
+
+core.synth ile geçici bir klasöre istenen boyutta sentetik veri üretilir ve
+her sayfa KOC_DATA o klasörü gösterecek şekilde ayrı bir süreçte Streamlit
+AppTest ile başsız çalıştırılır:
+    cold        → taze süreçte ilk run (import'lar + ilk okuma dahil)
+    warm        → aynı AppTest'te tekrar run (önbellekler sıcak)
+    interactions→ ilk selectbox'ı sonraki seçeneğe almak, ilk checkbox'ı
+                  çevirmek gibi genel etkileşimler sonrası run
+Sonuç JSON rapora yazılır; --baseline ile önceki raporla karşılaştırılır.
+
+    python bench/pages.py --size medium
+    python bench/pages.py --students 500 --weeks 30 --pages 1 5 --baseline bench/results/pages-medium.json
+"""
+from __future__ import annotations
+from datetime import datetime
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+RESULTS = ROOT / "bench" / "results"
+_TIMEOUT = 120
+
+
+# ----------------- çocuk süreç: tek sayfa -----------------
+
+def _timed(fn) -> float:
+    t0 = perf_counter()
+    fn()
+    return (perf_counter() - t0) * 1000
+
+
+def _interactions(at) -> list[tuple[str, object]]:
+    """Yıkıcı olmayan genel etkileşimler (buton tıklanmaz)."""
+    out = []
+    if len(at.selectbox):
+        sb = at.selectbox[0]
+        opts = list(sb.options)
+        if len(opts) > 1:
+            nxt = opts[(opts.index(sb.value) + 1) % len(opts)] if sb.value in opts else opts[0]
+            out.append((f"selectbox[0] → {nxt}", lambda: sb.select(nxt).run()))
+    if len(at.checkbox):
+        cb = at.checkbox[0]
+        out.append(("checkbox[0] çevir", lambda: (cb.uncheck() if cb.value else cb.check()).run()))
+    return out
+
+
+def run_page(page: Path, repeat: int) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(page), default_timeout=_TIMEOUT)
+    cold = _timed(at.run)
+    warm = [_timed(at.run) for _ in range(repeat)]
+    inter = []
+    for name, act in _interactions(at):
+        inter.append({"name": name, "ms": round(_timed(act), 1)})
+    return {
+        "cold_ms": round(cold, 1),
+        "warm_ms": {"min": round(min(warm), 1), "median": round(median(warm), 1)} if warm else None,
+        "interactions": inter,
+        "exceptions": [str(e.message) for e in at.exception],
+    }
+
+
+# ----------------- ana süreç -----------------
+
+def prepare(data: Path, size: dict, seed: int, env: dict) -> dict:
+    from core.synth import generate
+
+    counts = generate(data, seed=seed, **size)
+    # bölümleme / SQLite aktarımı ölçüme girmesin
+    subprocess.run([sys.executable, "-c", "from core import storage; storage.partitions('assignments')"],
+                   cwd=ROOT, env=env, check=True)
+    if env["KOC_STORAGE"] == "sqlite":
+        subprocess.run([sys.executable, "-m", "core.storage", "import"], cwd=ROOT, env=env,
+                       check=True, capture_output=True)
+    return counts
+
+
+def bench_pages(size: dict, pages: list[str] | None = None, repeat: int = 5, seed: int = 0,
+                backend: str = "csv", keep: bool = False) -> dict:
+    tmp = Path(tempfile.mkdtemp(prefix="koc-bench-"))
+    try:
+        env = {**os.environ, "KOC_STORAGE": backend, "KOC_DATA": str(tmp)}
+        counts = prepare(tmp, size, seed, env)
+        files = sorted((ROOT / "ui_streamlit" / "pages").glob("*.py"))
+        if pages:
+            files = [f for f in files if f.stem.split("_", 1)[0] in pages]
+        results = []
+        for f in files:
+            p = subprocess.run([sys.executable, str(Path(__file__).resolve()), "--child", str(f),
+                                "--repeat", str(repeat)], cwd=ROOT, env=env, capture_output=True, text=True)
+            if p.returncode:
+                res = {"error": (p.stderr.strip().splitlines() or ["?"])[-1]}
+            else:
+                res = json.loads(p.stdout.strip().splitlines()[-1])
+            results.append({"page": f.stem.split("_", 1)[0], "file": f.name, **res})
+    finally:
+        if keep:
+            print(f"veri klasörü: {tmp}")
+        else:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    import pandas as pd
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "backend": backend,
+        "seed": seed,
+        "size": size,
+        "rows": counts,
+        "pages": results,
+    }
+
+
+def _fmt_delta(now: float | None, old: float | None) -> str:
+    if now is None or not old:
+        return ""
+    return f" ({100 * (now - old) / old:+.0f}%)"
+
+
+def print_report(rep: dict, baseline: dict | None = None) -> None:
+    old = {p["page"]: p for p in (baseline or {}).get("pages", [])}
+    print(f"{rep['backend']}  {rep['rows']}")
+    for p in rep["pages"]:
+        if "error" in p:
+            print(f"{p['file']:<32} HATA: {p['error']}")
+            continue
+        b = old.get(p["page"], {})
+        warm = (p["warm_ms"] or {}).get("median")
+        bwarm = (b.get("warm_ms") or {}).get("median")
+        print(f"{p['file']:<32} cold {p['cold_ms']:>8.1f} ms{_fmt_delta(p['cold_ms'], b.get('cold_ms'))}"
+              f"   warm {warm or 0:>7.1f} ms{_fmt_delta(warm, bwarm)}")
+        for i in p["interactions"]:
+            print(f"{'':<34}{i['name']}: {i['ms']:.1f} ms")
+        for e in p["exceptions"]:
+            print(f"{'':<34}istisna: {e}")
+
+
+if __name__ == "__main__":
+    from core.synth import SIZES
+
+    ap = argparse.ArgumentParser(description="Sayfa başına cold/warm render süresi (Streamlit AppTest).")
+    ap.add_argument("--size", choices=sorted(SIZES), default="small")
+    ap.add_argument("--students", type=int)
+    ap.add_argument("--weeks", type=int)
+    ap.add_argument("--logs-per-student", type=int)
+    ap.add_argument("--catalog", type=int)
+    ap.add_argument("--pages", nargs="*", help="Sayfa numaraları (boş → hepsi)")
+    ap.add_argument("--repeat", type=int, default=5, help="warm run sayısı")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--backend", choices=["csv", "sqlite"], default="csv")
+    ap.add_argument("--out", help="JSON rapor yolu (varsayılan bench/results/pages-<boyut>.json)")
+    ap.add_argument("--baseline", help="Karşılaştırılacak önceki rapor")
+    ap.add_argument("--keep", action="store_true", help="Geçici veri klasörünü silme")
+    ap.add_argument("--child", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        print(json.dumps(run_page(Path(args.child), args.repeat), ensure_ascii=False))
+        sys.exit(0)
+
+    size = dict(SIZES[args.size])
+    for k in size:
+        if getattr(args, k) is not None:
+            size[k] = getattr(args, k)
+    rep = bench_pages(size, args.pages, args.repeat, args.seed, args.backend, args.keep)
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8")) if args.baseline else None
+    print_report(rep, baseline)
+    out = Path(args.out) if args.out else RESULTS / f"pages-{args.size}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(rep, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"→ {out}")
@@ -0,0 +1,29 @@
+# core/__init__.py
+"""
+Koç Asistan çekirdek modülleri.
+
+Alt modüller ilk erişimde yüklenir: `import core` ucuzdur, `core.export`
+gibi bir ad kullanıldığında modül import edilir ve pakete yerleşir.
+`from core.x import y` her zamanki gibi çalışır. Sayfa başına açılış
+maliyeti için: python -m core.coldstart
+"""
+from __future__ import annotations
+import importlib
+
+_SUBMODULES = frozenset({
+    "assignments", "cache", "channel_features", "coldstart", "curriculum", "dataio",
+    "exam_reviews", "export", "nightly", "pdfwriter", "plan", "resource_features",
+    "resources", "rollout", "storage", "synth", "trace", "weekly_pdfs",
+})
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        mod = importlib.import_module(f"{__name__}.{name}")
+        globals()[name] = mod
+        return mod
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | _SUBMODULES)
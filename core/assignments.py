@@ -1,11 +1,33 @@
 # core/assignments.py
-from pathlib import Path
 from datetime import date, timedelta
+from pathlib import Path
+import atexit
+import threading
 import pandas as pd
 
-ROOT = Path(__file__).resolve().parents[1]
-DATA = ROOT / "data"
-ASSIGN_PATH = DATA / "assignments.csv"
+from core import storage, cache, trace
+
+# Durum deposu: hafta bölümü başına anahtar → satır; işaretlemeler bellekte
+# birikir, yalnız değişen haftalar toplu yazılır. Depo veri kökü (kiracı)
+# başına ayrıdır: storage.tenant_state(_TENANTS, _new_tenant)
+_KEY = ["student_id","week_start","ders","konu","birim","kaynak"]
+_FLUSH_EVERY = 20      # bu kadar değişiklik birikince hemen yaz
+_FLUSH_DELAY = 2.0     # ilk bekleyen değişiklikten en geç bu kadar sn sonra yaz
+_TENANTS: dict[Path, dict] = {}
+
+def _new_tenant() -> dict:
+    return {
+        "lock": threading.RLock(),
+        # hafta → {"df", "rows": anahtar → konum, "topics": anahtar[:4] → konumlar, "stamp"}
+        "store": {},
+        # hafta → {anahtar: durum}; yazım çakışırsa bölüm yeniden okunup bunlar tekrar uygulanır
+        "dirty": {},
+        "pending": 0,
+        "timer": None,
+    }
+
+def _tenant() -> dict:
+    return storage.tenant_state(_TENANTS, _new_tenant)
 
 def week_start_of(d: date) -> date:
     return d - timedelta(days=d.weekday())  # Pazartesi
@@ -25,10 +47,9 @@ def _legacy_upgrade(df: pd.DataFrame) -> pd.DataFrame:
     df = df.drop(columns=drop_cols, errors="ignore")
     return df
 
-def load_assignments() -> pd.DataFrame:
-    if not ASSIGN_PATH.exists():
+def _normalize(df: pd.DataFrame | None) -> pd.DataFrame:
+    if df is None:
         return _empty_df()
-    df = pd.read_csv(ASSIGN_PATH, encoding="utf-8")
     if "week_start" in df.columns:
         df["week_start"] = pd.to_datetime(df["week_start"]).dt.date
     if "student_id" not in df.columns:
@@ -42,17 +63,124 @@ def load_assignments() -> pd.DataFrame:
         df["kaynak"] = df["kaynak"].fillna("").astype(str)
     return df[["week_start","student_id","ders","konu","birim","miktar","kaynak","durum"]]
 
+@cache.memo("assignments")
+def _load_assignments() -> pd.DataFrame:
+    return _normalize(storage.read("assignments"))
+
+def load_assignments() -> pd.DataFrame:
+    """Tüm haftalar (raporlar için). Haftalık işler get_assignments'ı kullanır."""
+    flush_assignments()
+    return _load_assignments()
+
+def iter_assignments():
+    """Hafta bölümlerini sırayla, normalize edilmiş olarak üretir (tüm tabloyu belleğe almadan)."""
+    flush_assignments()
+    for part in storage.scan("assignments"):
+        yield _normalize(part)
+
 def save_assignments(df: pd.DataFrame):
-    out = df.copy()
-    out.to_csv(ASSIGN_PATH, index=False, encoding="utf-8")
+    storage.write("assignments", df.copy())
 
 def get_assignments(student_id: int, week_start: date) -> pd.DataFrame:
-    df = load_assignments()
-    return df[(df["student_id"] == student_id) & (df["week_start"] == week_start)].copy()
+    # yalnız o haftanın bölümü okunur (SQLite'ta indeksli sorgu)
+    with _tenant()["lock"]:
+        df = _week(week_start)["df"]
+    return df[df["student_id"] == student_id].copy()
+
+def get_week_assignments(week_start: date) -> pd.DataFrame:
+    """Bir haftanın tüm öğrencilere ait ödevleri."""
+    with _tenant()["lock"]:
+        return _week(week_start)["df"].copy()
+
+# ---------- Durum deposu ----------
+def _week(week_start: date) -> dict:
+    """Hafta bölümünü anahtar sözlükleriyle bellekte tutar; bölüm dışarıdan değişirse yeniden kurar."""
+    t = _tenant()
+    stamp = storage.partition_stamp("assignments", week_start)
+    st = t["store"].get(week_start)
+    if st is None or (week_start not in t["dirty"] and st["stamp"] != stamp):
+        df = _normalize(storage.select("assignments", week_start=week_start))
+        df = df[df["week_start"] == week_start].reset_index(drop=True)
+        keys = list(zip(*(df[c].tolist() for c in _KEY)))
+        topics: dict[tuple, list[int]] = {}
+        for i, k in enumerate(keys):
+            topics.setdefault(k[:4], []).append(i)
+        st = {"df": df, "rows": {k: i for i, k in enumerate(keys)}, "topics": topics, "stamp": stamp}
+        t["store"][week_start] = st
+    return st
+
+def _mark_dirty(week_start: date, df: pd.DataFrame, idx) -> None:
+    t = _tenant()
+    changed = t["dirty"].setdefault(week_start, {})
+    for i in idx:
+        changed[tuple(df.at[i, c] for c in _KEY)] = bool(df.at[i, "durum"])
+    t["pending"] += len(idx)
+    if t["pending"] >= _FLUSH_EVERY:
+        flush_assignments()
+    elif t["timer"] is None:
+        # Timer yeni iş parçacığında çalışır; kök bağlamı taşınmaz, bağlanır
+        t["timer"] = threading.Timer(_FLUSH_DELAY, storage.bind_root(flush_assignments))
+        t["timer"].daemon = True
+        t["timer"].start()
+
+def flush_assignments() -> None:
+    """Bekleyen durum değişikliklerini diske aktarır; değişen her hafta bölümü bir kez yazılır."""
+    t = _tenant()
+    with t["lock"]:
+        if t["timer"] is not None:
+            t["timer"].cancel()
+            t["timer"] = None
+        for ws in sorted(t["dirty"]):
+            _flush_week(ws)
+        t["dirty"].clear()
+        t["pending"] = 0
+
+def _flush_all() -> None:
+    # süreç çıkışı: bekleyen her kiracı kendi kökünde yazılır
+    for root in list(_TENANTS):
+        with storage.use_root(root):
+            flush_assignments()
+
+@storage.optimistic("assignments")
+def _flush_week(week_start: date) -> None:
+    st = _tenant()["store"][week_start]
+    if storage.partition_stamp("assignments", week_start) != st["stamp"]:
+        # başka süreç bölümü değiştirmiş: yeniden oku, bizim değişiklikleri üstüne uygula
+        st = _replay(week_start)
+    storage.write_partition("assignments", week_start, st["df"], expect=st["stamp"])
+    st["stamp"] = storage.partition_stamp("assignments", week_start)
+
+def _replay(week_start: date) -> dict:
+    t = _tenant()
+    changes = t["dirty"].pop(week_start)
+    t["store"].pop(week_start, None)
+    st = _week(week_start)
+    df = st["df"]
+    col = df.columns.get_loc("durum")
+    for k, done in changes.items():
+        i = st["rows"].get(k)
+        if i is not None:
+            df.iat[i, col] = done
+    t["dirty"][week_start] = changes
+    return st
+
+def _add_rows(rows: pd.DataFrame) -> None:
+    """Satırları kendi hafta bölümlerine ekler; aynı anahtar varsa yenisi kalır."""
+    flush_assignments()
+    with _tenant()["lock"]:
+        for ws, new in rows.groupby("week_start", sort=True):
+            _add_week(ws, new)
+
+@storage.optimistic("assignments")
+def _add_week(week_start: date, new: pd.DataFrame) -> None:
+    st = _week(week_start)
+    merged = pd.concat([st["df"], new], ignore_index=True).drop_duplicates(subset=_KEY, keep="last")
+    storage.write_partition("assignments", week_start, merged, expect=st["stamp"])
+
+atexit.register(_flush_all)
 
 def add_assignments(student_id: int, week_start: date, ders: str, konular: list[str],
                     birim: str, miktar: int, kaynak: str = ""):
-    df = load_assignments()
     rows = []
     for konu in konular:
         rows.append({
@@ -65,35 +193,80 @@ def add_assignments(student_id: int, week_start: date, ders: str, konular: list[
             "kaynak": (kaynak or "").strip(),
             "durum": False
         })
-    df_new = pd.concat([df, pd.DataFrame(rows)], ignore_index=True).drop_duplicates(
-        subset=["week_start","student_id","ders","konu","birim","kaynak"], keep="last"
-    )
-    save_assignments(df_new)
+    if rows:
+        _add_rows(_normalize(pd.DataFrame(rows)))
 
 def add_bulk(rows: list[dict]):
     """rows: week_start, student_id, ders, konu, birim, miktar, kaynak, durum"""
     if not rows:
         return
-    df = load_assignments()
-    df_new = pd.concat([df, pd.DataFrame(rows)], ignore_index=True).drop_duplicates(
-        subset=["week_start","student_id","ders","konu","birim","kaynak"], keep="last"
-    )
-    save_assignments(df_new)
+    _add_rows(_normalize(pd.DataFrame(rows)))
 
 def update_status(student_id: int, week_start: date, ders: str, konu: str, done: bool,
                   birim: str | None = None, kaynak: str | None = None):
-    df = load_assignments()
-    mask = (
-        (df["student_id"] == int(student_id)) &
-        (df["week_start"] == week_start) &
-        (df["ders"] == ders) &
-        (df["konu"] == konu)
-    )
-    if birim is not None:
-        mask = mask & (df["birim"] == birim)
-    if kaynak is not None:
-        k = (kaynak or "").strip()
-        mask = mask & (df["kaynak"].fillna("") == k)
-    if mask.any():
-        df.loc[mask, "durum"] = bool(done)
-        save_assignments(df)
+    """
+    Anahtarla O(1) bulur; yazım _FLUSH_EVERY / _FLUSH_DELAY ile toplu yapılır.
+
+    Dayanıklılık ödünleşimi: değişiklik önce yalnız bu sürecin belleğinde
+    tutulur, diske en geç _FLUSH_DELAY sn sonra Timer ile (ya da atexit'te)
+    yazılır. Bu arada süreç SIGKILL/çökme ile ölürse işaretlemeler kaybolur;
+    diğer işçi süreçler de o ana dek eski durumu okur. Kalıcılığın hemen
+    gerektiği yollar (UI'daki "Kaydet") apply_status_changes kullanmalı ya da
+    ardından flush_assignments() çağırmalıdır.
+    """
+    with _tenant()["lock"]:
+        st = _week(week_start)
+        df = st["df"]
+        k = None if kaynak is None else (kaynak or "").strip()
+        if birim is not None and k is not None:
+            i = st["rows"].get((int(student_id), week_start, ders, konu, birim, k))
+            idx = [] if i is None else [i]
+        else:
+            idx = [i for i in st["topics"].get((int(student_id), week_start, ders, konu), [])
+                   if (birim is None or df.at[i, "birim"] == birim)
+                   and (k is None or df.at[i, "kaynak"] == k)]
+        idx = [i for i in idx if bool(df.at[i, "durum"]) != bool(done)]
+        if idx:
+            col = df.columns.get_loc("durum")
+            for i in idx:
+                df.iat[i, col] = bool(done)
+            _mark_dirty(week_start, df, idx)
+
+def apply_status_changes(changes) -> int:
+    """
+    Toplu durum güncellemesi. changes: dict listesi ya da DataFrame;
+    kolonlar student_id, week_start, ders, konu, done (+ isteğe bağlı birim, kaynak).
+    Aynı anahtar birden çok kez geçerse sonuncusu geçerlidir. Her hafta bölümü
+    tek merge ile güncellenir ve dönmeden önce eşzamanlı yazılır
+    (flush_assignments). Dönüş: değişen satır sayısı.
+    """
+    ch = pd.DataFrame(changes)
+    if ch.empty:
+        return 0
+    ch["student_id"] = ch["student_id"].astype(int)
+    ch["week_start"] = pd.to_datetime(ch["week_start"]).dt.date
+    ch["done"] = ch["done"].astype(bool)
+    if "kaynak" in ch.columns:
+        ch["kaynak"] = ch["kaynak"].fillna("").astype(str).str.strip()
+    on = [c for c in _KEY if c in ch.columns]
+    ch = ch.drop_duplicates(subset=on, keep="last")
+
+    n = 0
+    t = _tenant()
+    with t["lock"]:
+        for ws, part in ch.groupby("week_start", sort=True):
+            df = _week(ws)["df"]
+            m = df[on].reset_index().merge(part[on + ["done"]], on=on, how="inner")
+            m = m[df["durum"].to_numpy()[m["index"].to_numpy()] != m["done"].to_numpy()]
+            if m.empty:
+                continue
+            df.loc[m["index"].to_numpy(), "durum"] = m["done"].to_numpy()
+            changed = t["dirty"].setdefault(ws, {})
+            for row in df.loc[m["index"].to_numpy(), _KEY + ["durum"]].itertuples(index=False):
+                changed[tuple(row[:-1])] = bool(row[-1])
+            n += len(m)
+        flush_assignments()
+    return n
+
+
+trace.instrument(globals())
@@ -0,0 +1,88 @@
+# core/cache.py
+"""
+Loader'lar için süreç içi önbellek.
+
+@memo(kaynak, ...) ile sarılan fonksiyonun (normalize edilmiş) sonucu,
+kaynakların damgası — (yol, mtime_ns, boyut) — değişmediği sürece yeniden
+üretilmez. Kaynak bir storage tablo adı ("students"), bir Path ya da
+Path döndüren bir fonksiyon (kökle değişen settings.json, topics.csv)
+olabilir. storage.write/append ilgili tablonun kayıtlarını kendiliğinden
+düşürür; dosya dışarıdan değişirse damga tutmaz. Kayıtlar veri köküne
+(storage.data_root) göre ayrıdır: kiracılar birbirinin önbelleğini görmez.
+
+Dönen değer her çağrıda kopyadır: pandas copy-on-write açıksa sığ (ucuz)
+kopya, değilse derin kopya. Çağıran tarafın değiştirmesi önbelleği bozmaz.
+"""
+from __future__ import annotations
+from pathlib import Path
+import copy
+import functools
+import pandas as pd
+
+from core import storage
+
+try:
+    _COW = int(pd.__version__.split(".")[0]) >= 3 or pd.get_option("mode.copy_on_write") is True
+except Exception:
+    _COW = False
+
+# anahtar → (damgalar, değer); kaynak yolu → o kaynağa bağlı anahtarlar
+_CACHE: dict[tuple, tuple[tuple, object]] = {}
+_DEPS: dict[str, set[tuple]] = {}
+
+
+def _stamp(source) -> tuple | None:
+    if callable(source):
+        source = source()
+    if isinstance(source, Path):
+        return storage.file_stamp(source)
+    return storage.stamp(source)
+
+
+def _dep(source) -> str:
+    # tablo adı geçerli köke bağlanır; yol zaten köke özgü
+    if callable(source):
+        source = source()
+    if isinstance(source, Path):
+        return str(source)
+    return str(storage.data_root() / source)
+
+
+def _copy(v):
+    if isinstance(v, (pd.DataFrame, pd.Series)):
+        return v.copy(deep=not _COW)
+    if isinstance(v, (dict, list)):
+        return copy.deepcopy(v)
+    return v
+
+
+def memo(*sources):
+    """Sonucu kaynak damgalarına bağlı olarak önbelleğe alan dekoratör."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            stamps = tuple(_stamp(s) for s in sources)
+            key = (storage.data_root(), fn.__module__, fn.__qualname__, args, tuple(sorted(kwargs.items())))
+            hit = _CACHE.get(key)
+            if hit is not None and hit[0] == stamps:
+                return _copy(hit[1])
+            val = fn(*args, **kwargs)
+            _CACHE[key] = (stamps, val)
+            for s in sources:
+                _DEPS.setdefault(_dep(s), set()).add(key)
+            return _copy(val)
+        return wrapper
+    return deco
+
+
+def invalidate(source=None) -> None:
+    """Kaynağa (geçerli kökte tablo adı / Path) bağlı kayıtları siler; None → hepsi."""
+    if source is None:
+        _CACHE.clear()
+        _DEPS.clear()
+        return
+    for key in _DEPS.pop(_dep(source), ()):
+        _CACHE.pop(key, None)
+
+
+storage.on_write(invalidate)
@@ -0,0 +1,143 @@
+# core/coldstart.py
+"""
+Sayfa açılış (cold start) denetimi.
+
+Her sayfanın import anında çalışan import'ları (fonksiyon içindekiler
+hariç) taze bir Python sürecinde -X importtime ile yürütülür. streamlit
+sunucu sürecinde zaten yüklü olduğundan ölçüme girmez; sayfanın kendi
+ödediği süre bütçesiyle karşılaştırılır.
+
+    python -m core.coldstart              # rapor
+    python -m core.coldstart --check      # bütçe aşılırsa çıkış kodu 1
+    python -m core.coldstart --json out.json
+"""
+from __future__ import annotations
+from pathlib import Path
+import argparse
+import ast
+import json
+import subprocess
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = [ROOT / "ui_streamlit" / "app.py", *sorted((ROOT / "ui_streamlit" / "pages").glob("*.py"))]
+
+# sunucunun zaten ödediği import'lar
+_BASELINE = ("streamlit",)
+_MARK = "##koc-coldstart"
+
+# sayfa no → ms; pandas tek başına ~350-550 ms tutar, sayfalar bunun üstüne az şey eklemeli
+BUDGET_MS = {
+    "app": 50,
+    "1": 750, "2": 750, "3": 750, "4": 750,
+    "5": 750, "6": 750, "7": 750, "8": 750,
+}
+_DEFAULT_BUDGET_MS = 750
+
+_CHILD = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+for m in {baseline!r}:
+    try:
+        __import__(m)
+    except ImportError:
+        pass
+sys.stderr.write({mark!r} + "\\n")
+missing, t0 = [], time.perf_counter()
+for stmt in {stmts!r}:
+    try:
+        exec(stmt, {{}})
+    except ImportError as e:
+        missing.append(e.name or stmt)
+print(json.dumps({{"ms": (time.perf_counter() - t0) * 1000, "missing": missing}}))
+"""
+
+
+def page_id(path: Path) -> str:
+    return "app" if path.name == "app.py" else path.stem.split("_", 1)[0]
+
+
+def import_statements(path: Path) -> list[str]:
+    """Modül yüklenirken çalışan import'lar (if/try/with içindekiler dahil, fonksiyon/sınıf hariç)."""
+    out: list[str] = []
+
+    def visit(body):
+        for node in body:
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                if not (isinstance(node, ast.ImportFrom) and node.module == "__future__"):
+                    out.append(ast.unparse(node))
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                continue
+            else:
+                for field in ("body", "orelse", "finalbody"):
+                    visit(getattr(node, field, []) or [])
+                for h in getattr(node, "handlers", []) or []:
+                    visit(h.body)
+
+    visit(ast.parse(path.read_text(encoding="utf-8")).body)
+    return out
+
+
+def _parse_importtime(stderr: str) -> list[tuple[str, float]]:
+    """İşaretten sonraki üst düzey modüller: (ad, kümülatif ms)."""
+    rows, seen = [], False
+    for line in stderr.splitlines():
+        if line == _MARK:
+            seen = True
+            continue
+        if not seen or not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = line.split("|", 2)
+        if name.startswith("  ") or not cum.strip().isdigit():
+            continue  # iç içe import ya da başlık satırı
+        rows.append((name.strip(), int(cum) / 1000))
+    return rows
+
+
+def measure_page(path: Path, repeat: int = 3) -> dict:
+    stmts = import_statements(path)
+    code = _CHILD.format(root=str(ROOT), baseline=_BASELINE, mark=_MARK, stmts=stmts)
+    best = None
+    for _ in range(repeat):
+        p = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                           capture_output=True, text=True, cwd=ROOT)
+        if p.returncode:
+            raise RuntimeError(f"{path.name}: {p.stderr.strip().splitlines()[-1:]}")
+        res = json.loads(p.stdout.strip().splitlines()[-1])
+        if best is None or res["ms"] < best["ms"]:
+            best = {**res, "modules": _parse_importtime(p.stderr)}
+    pid = page_id(path)
+    budget = BUDGET_MS.get(pid, _DEFAULT_BUDGET_MS)
+    heaviest = sorted(best["modules"], key=lambda r: -r[1])[:5]
+    return {
+        "page": pid,
+        "file": path.name,
+        "ms": round(best["ms"], 1),
+        "budget_ms": budget,
+        "ok": best["ms"] <= budget,
+        "heaviest": [{"module": m, "ms": round(ms, 1)} for m, ms in heaviest],
+        "missing": sorted(set(best["missing"])),
+    }
+
+
+def audit(pages: list[Path] | None = None, repeat: int = 3) -> list[dict]:
+    return [measure_page(p, repeat) for p in (pages or PAGES)]
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Sayfa başına import (cold start) süresini ölçer.")
+    ap.add_argument("--repeat", type=int, default=3, help="Sayfa başına ölçüm (en iyisi alınır)")
+    ap.add_argument("--check", action="store_true", help="Bütçe aşımında çıkış kodu 1")
+    ap.add_argument("--json", help="Raporu bu dosyaya yaz")
+    args = ap.parse_args()
+    rep = audit(repeat=args.repeat)
+    for r in rep:
+        heavy = ", ".join(f"{h['module']} {h['ms']:.0f}" for h in r["heaviest"][:3])
+        flag = "OK  " if r["ok"] else "AŞIM"
+        print(f"{flag} {r['file']:<32} {r['ms']:>7.1f} / {r['budget_ms']} ms   {heavy}")
+        if r["missing"]:
+            print(f"     kurulu değil (ölçüme girmedi): {', '.join(r['missing'])}")
+    if args.json:
+        Path(args.json).write_text(json.dumps(rep, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.check and not all(r["ok"] for r in rep):
+        sys.exit(1)
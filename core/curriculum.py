@@ -1,34 +1,64 @@
 # core/curriculum.py
 from __future__ import annotations
-from pathlib import Path
 from datetime import datetime
+from pathlib import Path
+import atexit
+import json
+import os
+import threading
 import uuid
 import pandas as pd
 
-ROOT = Path(__file__).resolve().parents[1]
-DATA = ROOT / "data"
-CURR = DATA / "curriculum.csv"
-CURR_LOG = DATA / "curriculum_progress.csv"
+from core import storage, cache, trace
 
 # Şema
 _CURR_COLS = ["student_id", "subject", "topic", "target_min"]
 # log_id ekledik → tekil silme/düzeltme mümkün
 _LOG_COLS  = ["log_id", "ts", "student_id", "subject", "topic", "minutes"]
 
+# log_minutes satırı önce data/curriculum_progress.journal'a (JSON satırı)
+# eklenir ve hemen döner. Bu kadar olayda ya da bu kadar saniyede bir günlük
+# ana log'a tek eklemeyle aktarılır (grup commit). Okuyucular ana log +
+# günlüğü birleştirir; süreç çökse de günlükteki satırlar sonraki aktarımda yazılır.
+# Günlük her aktarım grubunda bir kez fsync'lenir (satır başına değil). Log'un
+# sıkıştırılması (compact_log) gece işine bırakılır (core.nightly).
+_JOURNAL = "curriculum_progress.journal"
+_JOURNAL_FLUSH_EVERY = 50
+_JOURNAL_FLUSH_DELAY = 0.5
+
+# Modül durumu veri kökü (kiracı) başına ayrıdır.
+_TENANTS: dict[Path, dict] = {}
+
+def _new_tenant() -> dict:
+    return {
+        # Yapılan dakika özeti: student_id → {(subject, topic): dakika}. Log'un
+        # hangi damgasına ait olduğu done_stamp'te durur; log'u bu modül yazdığında
+        # özet artımlı güncellenir, başka biri yazdıysa baştan kurulur.
+        "done": {},
+        "done_stamp": None,
+        "journal_lock": threading.RLock(),
+        "journal_count": 0,
+        "journal_timer": None,
+        "journal_cache": None,   # (günlük damgası, DataFrame)
+    }
+
+def _tenant() -> dict:
+    return storage.tenant_state(_TENANTS, _new_tenant)
+
 # ----------------- low level -----------------
 
-def _ensure():
-    DATA.mkdir(parents=True, exist_ok=True)
-    if not CURR.exists():
-        pd.DataFrame(columns=_CURR_COLS).to_csv(CURR, index=False, encoding="utf-8")
-    if not CURR_LOG.exists():
-        pd.DataFrame(columns=_LOG_COLS).to_csv(CURR_LOG, index=False, encoding="utf-8")
-
-def _read_curr() -> pd.DataFrame:
-    _ensure()
-    if CURR.stat().st_size:
-        df = pd.read_csv(CURR, encoding="utf-8")
-    else:
+def _read_curr(**where) -> pd.DataFrame:
+    """where: student_id/subject/topic eşitlik ön filtresi (SQLite'ta indeksli)."""
+    if where and storage.get_backend().indexed:
+        return _norm_curr(storage.select("curriculum", **where))
+    return _load_curr()
+
+@cache.memo("curriculum")
+def _load_curr() -> pd.DataFrame:
+    return _norm_curr(storage.read("curriculum"))
+
+def _norm_curr(df: pd.DataFrame | None) -> pd.DataFrame:
+    if df is None:
         df = pd.DataFrame(columns=_CURR_COLS)
 
     for c in _CURR_COLS:
@@ -38,11 +68,18 @@ def _read_curr() -> pd.DataFrame:
     df["target_min"] = pd.to_numeric(df["target_min"], errors="coerce").fillna(0).astype(int)
     return df[_CURR_COLS]
 
-def _read_log() -> pd.DataFrame:
-    _ensure()
-    if CURR_LOG.stat().st_size:
-        df = pd.read_csv(CURR_LOG, encoding="utf-8")
-    else:
+def _read_log(**where) -> pd.DataFrame:
+    """where: student_id/subject/topic eşitlik ön filtresi (SQLite'ta indeksli)."""
+    if where and storage.get_backend().indexed:
+        return _norm_log(storage.select("curriculum_progress", **where))
+    return _load_log()
+
+@cache.memo("curriculum_progress")
+def _load_log() -> pd.DataFrame:
+    return _norm_log(storage.read("curriculum_progress"))
+
+def _norm_log(df: pd.DataFrame | None) -> pd.DataFrame:
+    if df is None:
         df = pd.DataFrame(columns=_LOG_COLS)
 
     # Şema migrate: log_id yoksa üret
@@ -54,41 +91,243 @@ def _read_log() -> pd.DataFrame:
             df[c] = 0 if c == "minutes" else ""
     df["student_id"] = df["student_id"].astype(str)
     df["minutes"] = pd.to_numeric(df["minutes"], errors="coerce").fillna(0).astype(int)
-    # ts ISO string; sıralama için yeterli
+    # ts: datetime (boş/bozuk → NaT); dosyada ISO string olarak durur
+    df["ts"] = pd.to_datetime(df["ts"], errors="coerce", format="ISO8601")
     return df[_LOG_COLS]
 
 def _write_curr(df: pd.DataFrame):
-    df[_CURR_COLS].to_csv(CURR, index=False, encoding="utf-8")
-
-def _write_log(df: pd.DataFrame):
-    df[_LOG_COLS].to_csv(CURR_LOG, index=False, encoding="utf-8")
+    storage.write("curriculum", df[_CURR_COLS])
+
+def _write_log(df: pd.DataFrame, added: pd.DataFrame | None = None,
+               removed: pd.DataFrame | None = None):
+    """Log'u baştan yazar; added/removed: özete yansıtılacak satır farkı."""
+    out = df[_LOG_COLS].copy()
+    out["ts"] = pd.to_datetime(out["ts"], errors="coerce", format="ISO8601").dt.strftime("%Y-%m-%dT%H:%M:%S")
+    # özetin güncelliği ile yazım arasına başka süreç girmesin
+    with storage.lock("curriculum_progress"):
+        in_sync = _done_in_sync()
+        storage.write("curriculum_progress", out)
+        _done_after_write(in_sync, added, removed)
+
+@storage.optimistic("curriculum_progress")
+def _append_logs(new: pd.DataFrame):
+    """Log satırlarını tablonun sonuna ekler; şema eskiyse tam yazıma düşer."""
+    new = new[_LOG_COLS].copy()
+    new["ts"] = pd.to_datetime(new["ts"], errors="coerce", format="ISO8601").dt.strftime("%Y-%m-%dT%H:%M:%S")
+    with storage.lock("curriculum_progress"):
+        in_sync = _done_in_sync()
+        ok = storage.append("curriculum_progress", new)
+        if ok:
+            _done_after_write(in_sync, added=new)
+    if not ok:
+        # boş tablo / eski şema → tam yazım (log_id migrate edilir)
+        _write_log(pd.concat([_read_log(), new], ignore_index=True), added=new)
+
+# ----------------- günlük (write-ahead) -----------------
+
+def _journal_path() -> Path:
+    return storage.get_backend().lock_root / _JOURNAL
+
+def _journal_write(row: dict):
+    """Satırı günlüğe tek write ile ekler (O_APPEND); aktarımla çakışmasın diye kilit altında."""
+    p = _journal_path()
+    line = (json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8")
+    with storage.lock(p.name, p.parent):
+        fd = os.open(p, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+def _journal_sync(p: Path):
+    """Günlüğe o ana dek eklenmiş tüm satırları tek fsync ile diske indirir (grup commit)."""
+    fd = os.open(p, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _journal_rows(p: Path) -> pd.DataFrame:
+    t = _tenant()
+    stamp = storage.file_stamp(p)
+    if t["journal_cache"] is not None and t["journal_cache"][0] == stamp:
+        return t["journal_cache"][1]
+    rows = []
+    if stamp is not None:
+        with p.open("rb") as f:
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    continue  # çökmede yarım kalmış son satır
+    df = _norm_log(pd.DataFrame(rows, columns=_LOG_COLS))
+    t["journal_cache"] = (stamp, df)
+    return df
+
+def _pending() -> tuple[pd.DataFrame | None, tuple | None]:
+    """Günlükte bekleyen satırlar + aynı anda alınmış ana log damgası (günlük boşsa None, None)."""
+    p = _journal_path()
+    st = storage.file_stamp(p)
+    if st is None or not st[2]:
+        return None, None
+    with storage.lock(p.name, p.parent):
+        return _journal_rows(p), storage.stamp("curriculum_progress")
+
+def _with_pending(fn):
+    """fn(bekleyenler); okuma sırasında günlük ana log'a aktarıldıysa baştan dener."""
+    for _ in range(storage.RETRIES):
+        pending, stamp = _pending()
+        out = fn(pending)
+        if stamp is None or storage.stamp("curriculum_progress") == stamp:
+            break
+    return out
+
+def _schedule_flush():
+    t = _tenant()
+    with t["journal_lock"]:
+        t["journal_count"] += 1
+        if t["journal_count"] < _JOURNAL_FLUSH_EVERY:
+            if t["journal_timer"] is None:
+                # Timer yeni iş parçacığında çalışır; kök bağlamı taşınmaz, bağlanır
+                t["journal_timer"] = threading.Timer(_JOURNAL_FLUSH_DELAY, storage.bind_root(flush_journal))
+                t["journal_timer"].daemon = True
+                t["journal_timer"].start()
+            return
+    flush_journal()
+
+def flush_journal() -> int:
+    """Günlükteki satırları ana log'a tek eklemeyle aktarır; aktarılan satır sayısı."""
+    t = _tenant()
+    with t["journal_lock"]:
+        if t["journal_timer"] is not None:
+            t["journal_timer"].cancel()
+            t["journal_timer"] = None
+        t["journal_count"] = 0
+    p = _journal_path()
+    st = storage.file_stamp(p)
+    if st is None or not st[2]:
+        return 0
+    mark = p.with_name(p.name + ".commit")
+    with storage.lock("curriculum_progress"), storage.lock(p.name, p.parent):
+        # aktarılacak grup önce günlükte kalıcı olsun
+        _journal_sync(p)
+        new = _journal_rows(p)
+        if mark.exists():
+            # önceki aktarım ekleme ile boşaltma arasında kesilmiş: eklenmiş olanları atla
+            new = new[~new["log_id"].isin(_read_log()["log_id"])]
+        if not new.empty:
+            mark.touch()
+            _append_logs(new)
+        os.truncate(p, 0)
+        mark.unlink(missing_ok=True)
+    return len(new)
+
+def _flush_all():
+    # süreç çıkışı: varsayılan kök + bu süreçte kullanılan her kiracı
+    for root in {storage.data_root(), *_TENANTS}:
+        with storage.use_root(root):
+            flush_journal()
+
+atexit.register(_flush_all)
+
+# ----------------- done_min özeti -----------------
+
+def _done_in_sync() -> bool:
+    st = _tenant()["done_stamp"]
+    return st is not None and storage.stamp("curriculum_progress") == st
+
+def _done_apply(rows: pd.DataFrame | None, sign: int):
+    if rows is None or rows.empty:
+        return
+    done = _tenant()["done"]
+    for sid, subj, topic, m in rows[["student_id", "subject", "topic", "minutes"]].itertuples(index=False):
+        per = done.setdefault(str(sid), {})
+        key = (subj, str(topic))
+        per[key] = per.get(key, 0) + sign * int(m)
+
+def _done_after_write(in_sync: bool, added: pd.DataFrame | None = None,
+                      removed: pd.DataFrame | None = None):
+    """Yazımdan önce özet güncelse farkı uygular ve yeni damgayı benimser."""
+    if not in_sync:
+        return  # bir sonraki okumada baştan kurulur
+    _done_apply(removed, -1)
+    _done_apply(added, +1)
+    _tenant()["done_stamp"] = storage.stamp("curriculum_progress")
+
+def _done_index() -> dict[str, dict[tuple[str, str], int]]:
+    t = _tenant()
+    stamp = storage.stamp("curriculum_progress")
+    if t["done_stamp"] is None or stamp != t["done_stamp"]:
+        lg = _read_log()
+        sums = lg.groupby(["student_id", "subject", "topic"], observed=True)["minutes"].sum()
+        idx: dict[str, dict[tuple[str, str], int]] = {}
+        for (sid, subj, topic), m in sums.items():
+            idx.setdefault(sid, {})[(subj, topic)] = int(m)
+        t["done"], t["done_stamp"] = idx, stamp
+    return t["done"]
+
+def _done_minutes(student_id: str, subject: str | None = None) -> dict[tuple[str, str], int]:
+    """Öğrencinin (subject, topic) → yapılan dakika eşlemesi."""
+    if storage.get_backend().indexed:
+        # SQLite: tek öğrencinin satırları indeksten gelir, özet gerekmez
+        where = {"student_id": str(student_id), "subject": subject or None}
+        lg = _read_log(**where)
+        lg = lg[lg["student_id"] == str(student_id)]
+        if subject:
+            lg = lg[lg["subject"] == subject]
+        sums = lg.groupby(["subject", "topic"], observed=True)["minutes"].sum()
+        return {k: int(v) for k, v in sums.items()}
+    return _done_index().get(str(student_id), {})
 
 # ----------------- public api -----------------
 
+@storage.optimistic("curriculum")
+def generate_plan_rows(rows: pd.DataFrame) -> int:
+    """
+    (student_id, subject, topic, target_min) satırlarından planda olmayanları
+    tek okuma + küme farkı (anti-join) + tek yazımla ekler. Var olana dokunmaz.
+    """
+    keys = ["student_id", "subject", "topic"]
+    new = rows[_CURR_COLS].copy()
+    new["student_id"] = new["student_id"].astype(str)
+    new["topic"] = new["topic"].astype(str)
+    new["target_min"] = pd.to_numeric(new["target_min"], errors="coerce").fillna(0).astype(int)
+    new = new.drop_duplicates(subset=keys, keep="first")
+    if new.empty:
+        return 0
+
+    cur = _read_curr()
+    have = pd.MultiIndex.from_frame(cur[keys])
+    new = new[~pd.MultiIndex.from_frame(new[keys]).isin(have)]
+    if not new.empty:
+        _write_curr(pd.concat([cur, new], ignore_index=True))
+    return len(new)
+
+def generate_plan(student_id: str, subject: str, items: list[tuple[str, int]]) -> int:
+    """items: [(konu, hedef_dk), …]. Eksik konuları tek seferde ekler; eklenen satır sayısı."""
+    return generate_plan_cohort([student_id], subject, items)
+
+def generate_plan_cohort(student_ids: list, subject: str, items: list[tuple[str, int]]) -> int:
+    """Aynı ders planını birden çok öğrenciye tek okuma/yazımla uygular."""
+    if not student_ids or not items:
+        return 0
+    topics = pd.DataFrame(items, columns=["topic", "target_min"])
+    sids = pd.DataFrame({"student_id": [str(s) for s in student_ids]})
+    rows = sids.merge(topics, how="cross")
+    rows["subject"] = subject
+    return generate_plan_rows(rows)
+
 def generate_from_topics(student_id: str, subject: str, topics: list[str], minutes_each: int = 180):
     """topics listesindeki her konu için hedef oluşturur; varsa dokunmaz."""
     if not topics:
         return
-    cur = _read_curr()
-    student_id = str(student_id)
-    new_rows = []
-    for t in topics:
-        t = str(t)
-        mask = (cur["student_id"] == student_id) & (cur["subject"] == subject) & (cur["topic"] == t)
-        if not mask.any():
-            new_rows.append({
-                "student_id": student_id, "subject": subject, "topic": t, "target_min": int(minutes_each)
-            })
-    if new_rows:
-        cur = pd.concat([cur, pd.DataFrame(new_rows)], ignore_index=True)
-        _write_curr(cur)
+    generate_plan(student_id, subject, [(str(t), int(minutes_each)) for t in topics])
 
 def log_minutes(student_id: str, subject: str, topic: str, minutes: int):
     """İlerleme ekler (dakika). Negatif gönderirsen geri alır."""
     mins = int(minutes)
     if mins == 0:
         return
-    df = _read_log()
     row = {
         "log_id": uuid.uuid4().hex,
         "ts": datetime.now().isoformat(timespec="seconds"),
@@ -97,8 +336,23 @@ def log_minutes(student_id: str, subject: str, topic: str, minutes: int):
         "topic": str(topic),
         "minutes": mins,
     }
-    df2 = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
-    _write_log(df2)
+    _journal_write(row)
+    _schedule_flush()
+
+def compact_log() -> int:
+    """
+    Log dosyasını şemaya uygun şekilde baştan yazar: eksik log_id'leri üretir,
+    aynı log_id'li tekrarları atar. Kalan satır sayısını döndürür.
+    """
+    flush_journal()
+    return _compact()
+
+@storage.optimistic("curriculum_progress")
+def _compact() -> int:
+    df = _read_log()
+    dup = df.duplicated(subset=["log_id"], keep="last")
+    _write_log(df[~dup], removed=df[dup])
+    return int((~dup).sum())
 
 def set_done(student_id: str, subject: str, topic: str):
     """Kalan dakikayı otomatik ekler ve konuyu tamamlar."""
@@ -112,21 +366,29 @@ def set_done(student_id: str, subject: str, topic: str):
 
 def get_curriculum(student_id: str, subject: str | None = None) -> pd.DataFrame:
     """Plan + yapılan + kalan + yüzde."""
-    cur = _read_curr()
-    lg  = _read_log()
+    where = {"student_id": str(student_id)}
+    if subject:
+        where["subject"] = subject
+    cur = _read_curr(**where)
 
     cur = cur[cur["student_id"] == str(student_id)].copy()
     if subject:
         cur = cur[cur["subject"] == subject].copy()
 
-    if lg.empty:
-        done = pd.DataFrame(columns=["student_id","subject","topic","done_min"])
-    else:
-        done = (lg.groupby(["student_id","subject","topic"], as_index=False)["minutes"]
-                  .sum().rename(columns={"minutes":"done_min"}))
-
-    m = cur.merge(done, how="left", on=["student_id","subject","topic"])
-    m["done_min"] = pd.to_numeric(m["done_min"], errors="coerce").fillna(0).astype(int)
+    # yapılan dakika: log'u gruplamak yerine özetten anahtarla okunur (+ günlükte bekleyenler)
+    def _done(pending):
+        done = dict(_done_minutes(student_id, subject))
+        if pending is not None:
+            p = pending[pending["student_id"] == str(student_id)]
+            if subject:
+                p = p[p["subject"] == subject]
+            for k, v in p.groupby(["subject", "topic"])["minutes"].sum().items():
+                done[k] = done.get(k, 0) + int(v)
+        return done
+    done = _with_pending(_done)
+    m = cur.reset_index(drop=True)
+    m["done_min"] = [done.get((s, str(t)), 0) for s, t in zip(m["subject"], m["topic"])]
+    m["done_min"] = m["done_min"].astype(int)
     m["remain_min"] = (m["target_min"] - m["done_min"]).clip(lower=0).astype(int)
     m["pct"] = (100 * m["done_min"] / m["target_min"].replace(0, pd.NA)).fillna(0).round(1)
     # 'order' varsa dışarıda sıralarsın; burada sade döndürüyoruz
@@ -149,7 +411,12 @@ def pick_for_student(student_id: str, subject: str, n: int = 5) -> pd.DataFrame:
 def list_progress(student_id: str, subject: str | None = None,
                   topic: str | None = None, limit: int = 50) -> pd.DataFrame:
     """Son girişleri getirir (yeni → eski)."""
-    df = _read_log()
+    where = {"student_id": str(student_id), "subject": subject or None,
+             "topic": str(topic) if topic else None}
+    def _logs(pending):
+        df = _read_log(**where)
+        return df if pending is None else pd.concat([df, pending], ignore_index=True)
+    df = _with_pending(_logs)
     df = df[df["student_id"] == str(student_id)].copy()
     if subject:
         df = df[df["subject"] == subject]
@@ -162,45 +429,53 @@ def list_progress(student_id: str, subject: str | None = None,
         df = df.head(limit)
     return df[_LOG_COLS].reset_index(drop=True)
 
+@storage.optimistic("curriculum_progress")
 def undo_last(student_id: str, subject: str, topic: str) -> bool:
     """Bu konu için en son logu siler."""
+    flush_journal()
     df = _read_log()
     mask = (df["student_id"] == str(student_id)) & (df["subject"] == subject) & (df["topic"] == str(topic))
     if not mask.any():
         return False
     idx = df[mask].sort_values("ts", ascending=False).index
-    df = df.drop(idx[0])
-    _write_log(df)
+    _write_log(df.drop(idx[0]), removed=df.loc[[idx[0]]])
     return True
 
+@storage.optimistic("curriculum_progress")
 def delete_logs(log_ids: list[str]) -> int:
     """Verilen log_id listesini siler; kaç satır sildiğini döndürür."""
+    flush_journal()
     if not log_ids:
         return 0
     df = _read_log()
-    before = len(df)
-    df = df[~df["log_id"].isin(set(log_ids))].copy()
-    _write_log(df)
-    return before - len(df)
+    gone = df["log_id"].isin(set(log_ids))
+    if not gone.any():
+        return 0  # eşleşme yok: yeniden yazıp damgayı boşuna değiştirme
+    _write_log(df[~gone].copy(), removed=df[gone])
+    return int(gone.sum())
 
+@storage.optimistic("curriculum_progress")
 def edit_log(log_id: str, new_minutes: int) -> bool:
     """Tek bir log satırının dakika değerini değiştirir."""
+    flush_journal()
     df = _read_log()
     mask = df["log_id"] == log_id
     if not mask.any():
         return False
+    old = df[mask].copy()
     df.loc[mask, "minutes"] = int(new_minutes)
-    _write_log(df)
+    _write_log(df, added=df[mask], removed=old)
     return True
 
+@storage.optimistic("curriculum_progress")
 def reset_topic(student_id: str, subject: str, topic: str) -> int:
     """Bu konuya ait TÜM logları siler (temiz başlangıç)."""
+    flush_journal()
     df = _read_log()
     mask = (df["student_id"] == str(student_id)) & (df["subject"] == subject) & (df["topic"] == str(topic))
     n = int(mask.sum())
     if n:
-        df = df[~mask].copy()
-        _write_log(df)
+        _write_log(df[~mask].copy(), removed=df[mask])
     return n
 
 
@@ -210,20 +485,8 @@ def delete_topic_plan(student_id: str, subject: str, topic: str, also_logs: bool
     Seçili konunun plan satırını siler; also_logs=True ise aynı konunun tüm loglarını da temizler.
     Dönüş: {"plan_deleted": N, "logs_deleted": M}
     """
-    cur = _read_curr()
-    m = (cur["student_id"] == str(student_id)) & (cur["subject"] == subject) & (cur["topic"] == str(topic))
-    n_plan = int(m.sum())
-    if n_plan:
-        _write_curr(cur[~m].copy())
-
-    n_logs = 0
-    if also_logs:
-        lg = _read_log()
-        lm = (lg["student_id"] == str(student_id)) & (lg["subject"] == subject) & (lg["topic"] == str(topic))
-        n_logs = int(lm.sum())
-        if n_logs:
-            _write_log(lg[~lm].copy())
-
+    n_plan = _drop_plan_rows(student_id, subject, topic)
+    n_logs = _drop_log_rows(student_id, subject, topic) if also_logs else 0
     return {"plan_deleted": n_plan, "logs_deleted": n_logs}
 
 
@@ -232,18 +495,33 @@ def delete_subject_plan(student_id: str, subject: str, also_logs: bool = True) -
     Bir dersin TÜM planını siler; also_logs=True ise o derse ait TÜM logları da temizler.
     Dönüş: {"plan_deleted": N, "logs_deleted": M}
     """
+    n_plan = _drop_plan_rows(student_id, subject)
+    n_logs = _drop_log_rows(student_id, subject) if also_logs else 0
+    return {"plan_deleted": n_plan, "logs_deleted": n_logs}
+
+
+@storage.optimistic("curriculum")
+def _drop_plan_rows(student_id: str, subject: str, topic: str | None = None) -> int:
     cur = _read_curr()
     m = (cur["student_id"] == str(student_id)) & (cur["subject"] == subject)
-    n_plan = int(m.sum())
-    if n_plan:
+    if topic is not None:
+        m &= cur["topic"] == str(topic)
+    n = int(m.sum())
+    if n:
         _write_curr(cur[~m].copy())
+    return n
 
-    n_logs = 0
-    if also_logs:
-        lg = _read_log()
-        lm = (lg["student_id"] == str(student_id)) & (lg["subject"] == subject)
-        n_logs = int(lm.sum())
-        if n_logs:
-            _write_log(lg[~lm].copy())
+@storage.optimistic("curriculum_progress")
+def _drop_log_rows(student_id: str, subject: str, topic: str | None = None) -> int:
+    flush_journal()
+    lg = _read_log()
+    m = (lg["student_id"] == str(student_id)) & (lg["subject"] == subject)
+    if topic is not None:
+        m &= lg["topic"] == str(topic)
+    n = int(m.sum())
+    if n:
+        _write_log(lg[~m].copy(), removed=lg[m])
+    return n
 
-    return {"plan_deleted": n_plan, "logs_deleted": n_logs}
+
+trace.instrument(globals())
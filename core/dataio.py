@@ -3,13 +3,22 @@ from datetime import datetime
 import pandas as pd
 import json
 
+from core import storage, cache, trace
+
 ROOT = Path(__file__).resolve().parents[1]
-DATA = ROOT / "data"
+DATA = storage.DATA  # varsayılan kök; dosyalar storage.data_root() altında çözülür
 DATA.mkdir(parents=True, exist_ok=True)
 
 # ---------- Settings ----------
+def _settings_path() -> Path:
+    return storage.data_root() / "settings.json"
+
+def _topics_path() -> Path:
+    return storage.data_root() / "topics.csv"
+
+@cache.memo(_settings_path)
 def load_settings() -> dict:
-    p = DATA / "settings.json"
+    p = _settings_path()
     with p.open("r", encoding="utf-8-sig") as f:
         raw = f.read().strip()
         if not raw:
@@ -23,18 +32,19 @@ def load_settings() -> dict:
     return s
 
 def save_settings(settings: dict) -> None:
-    p = DATA / "settings.json"
-    with p.open("w", encoding="utf-8") as f:
-        json.dump(settings, f, ensure_ascii=False, indent=2)
+    p = _settings_path()
+    storage.write_text(p, json.dumps(settings, ensure_ascii=False, indent=2))
+    cache.invalidate(p)
 
 def level_to_col(level: str) -> str:
     m = {"beginner": "beginner_min", "intermediate": "intermediate_min", "advanced": "advanced_min"}
     return m.get(level, "beginner_min")
 
 # ---------- Topics ----------
+@cache.memo(_topics_path)
 def load_topics(level_col: str) -> pd.DataFrame:
     """topics.csv'yi ; veya , ayraçla güvenli şekilde okur."""
-    p = DATA / "topics.csv"
+    p = _topics_path()
     # Önce ; ile dene (önerilen format)
     try:
         df = pd.read_csv(p, sep=";", encoding="utf-8")
@@ -52,109 +62,182 @@ def load_topics(level_col: str) -> pd.DataFrame:
     return df
 
 # ---------- Students ----------
-_STUDENTS_PATH = DATA / "students.csv"
-
-def _ensure_students_file():
-    if not _STUDENTS_PATH.exists():
-        df = pd.DataFrame([{
-            "student_id": 1,
-            "student_name": "Öğrenci A",
-            "active": True,
-            "created_at": datetime.now().isoformat(timespec="seconds")
-        }])
-        df.to_csv(_STUDENTS_PATH, index=False, encoding="utf-8")
+def _default_students() -> pd.DataFrame:
+    return pd.DataFrame([{
+        "student_id": 1,
+        "student_name": "Öğrenci A",
+        "active": True,
+        "created_at": datetime.now().isoformat(timespec="seconds")
+    }])
 
+@cache.memo("students")
 def load_students() -> pd.DataFrame:
-    _ensure_students_file()
-    df = pd.read_csv(_STUDENTS_PATH, encoding="utf-8")
+    df = storage.read("students")
+    if df is None:
+        df = _default_students()
+        save_students(df)
     if "active" not in df.columns: df["active"] = True
     if "created_at" not in df.columns: df["created_at"] = datetime.now().isoformat(timespec="seconds")
     return df
 
 def save_students(df: pd.DataFrame):
-    df.to_csv(_STUDENTS_PATH, index=False, encoding="utf-8")
+    storage.write("students", df)
 
 def _next_student_id(df: pd.DataFrame) -> int:
     if df.empty: return 1
     return int(df["student_id"].max()) + 1
 
+# Öğrenci kaydı: casefold ad → id, id → satır konumu. students tablosunun
+# damgasına bağlıdır; bu modülün yazımlarında artımlı güncellenir, tablo
+# dışarıdan değişirse bir kez baştan kurulur. Veri kökü başına ayrıdır.
+_REGISTRIES: dict[Path, dict] = {}
+
+def _name_key(name: str) -> str:
+    return (name or "").strip().casefold()
+
+def _new_registry() -> dict:
+    return {"stamp": None, "by_name": {}, "rows": {}, "cols": [], "next_id": 1}
+
+def _registry() -> dict:
+    reg = storage.tenant_state(_REGISTRIES, _new_registry)
+    stamp = storage.stamp("students")
+    if reg["stamp"] is None or reg["stamp"] != stamp:
+        df = load_students()
+        ids = df["student_id"].astype(int).tolist()
+        reg.update(
+            by_name={_name_key(str(n)): i for n, i in zip(df["student_name"].tolist(), ids)},
+            rows={i: k for k, i in enumerate(ids)},
+            cols=[str(c) for c in df.columns],
+            next_id=_next_student_id(df),
+            stamp=stamp,
+        )
+    return reg
+
+def _registry_adopt(reg: dict) -> None:
+    """Bu modülün yazımından sonra (kilit altında) yeni damgayı benimser."""
+    reg["stamp"] = storage.stamp("students")
+
 def student_exists(name: str) -> bool:
-    df = load_students()
-    name_cf = (name or "").strip().casefold()
-    return any(str(x).strip().casefold() == name_cf for x in df["student_name"].tolist())
+    return _name_key(name) in _registry()["by_name"]
 
 def add_student(name: str) -> int:
-    if not name or not name.strip():
+    return add_students([name])[0]
+
+def add_students(names: list[str]) -> list[int]:
+    """
+    Öğrencileri tek kilit ve tek eklemeyle kaydeder; yeni id'leri döner.
+    Boş ya da var olan (veya listede tekrarlanan) ad varsa hiçbiri eklenmez.
+    """
+    clean = [(n or "").strip() for n in names]
+    if any(not n for n in clean):
         raise ValueError("Öğrenci adı boş olamaz.")
-    if student_exists(name):
+    keys = [n.casefold() for n in clean]
+    if len(set(keys)) != len(keys):
         raise ValueError("Bu isimde bir öğrenci zaten var.")
-    df = load_students()
-    new_id = _next_student_id(df)
-    row = {"student_id": new_id, "student_name": name.strip(), "active": True,
-           "created_at": datetime.now().isoformat(timespec="seconds")}
-    df2 = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
-    save_students(df2)
-    return new_id
+    if not clean:
+        return []
+    # kilit altında: kontrol ile ekleme arasına başka süreç giremez
+    with storage.lock("students"):
+        reg = _registry()
+        if any(k in reg["by_name"] for k in keys):
+            raise ValueError("Bu isimde bir öğrenci zaten var.")
+        ids = list(range(reg["next_id"], reg["next_id"] + len(clean)))
+        new = pd.DataFrame({"student_id": ids, "student_name": clean, "active": True,
+                            "created_at": datetime.now().isoformat(timespec="seconds")})
+        # tablo fazladan kolon taşıyorsa boş geçilir; başlık tutmazsa tam yazım
+        if set(new.columns) <= set(reg["cols"]) and storage.append("students", new.reindex(columns=reg["cols"])):
+            n = len(reg["rows"])
+            for k, (key, sid) in enumerate(zip(keys, ids)):
+                reg["by_name"][key] = sid
+                reg["rows"][sid] = n + k
+            reg["next_id"] = ids[-1] + 1
+            _registry_adopt(reg)
+        else:
+            save_students(pd.concat([load_students(), new], ignore_index=True))
+            reg["stamp"] = None
+    return ids
 
+@storage.optimistic("students")
 def rename_student(student_id: int, new_name: str):
     if not new_name or not new_name.strip():
         raise ValueError("Yeni ad boş olamaz.")
-    df = load_students()
-    if student_exists(new_name):
+    reg = _registry()
+    if _name_key(new_name) in reg["by_name"]:
         raise ValueError("Bu isimde bir öğrenci zaten var.")
-    mask = df["student_id"] == int(student_id)
-    if not mask.any(): raise ValueError("Öğrenci bulunamadı.")
-    df.loc[mask, "student_name"] = new_name.strip()
-    save_students(df)
+    pos = reg["rows"].get(int(student_id))
+    if pos is None: raise ValueError("Öğrenci bulunamadı.")
+    df = load_students()
+    col = df.columns.get_loc("student_name")
+    old = df.iat[pos, col]
+    df.iat[pos, col] = new_name.strip()
+    with storage.lock("students"):
+        save_students(df)
+        reg["by_name"].pop(_name_key(str(old)), None)
+        reg["by_name"][_name_key(new_name)] = int(student_id)
+        _registry_adopt(reg)
 
-def deactivate_student(student_id: int):
+def _set_active(student_id: int, active: bool):
+    reg = _registry()
+    pos = reg["rows"].get(int(student_id))
+    if pos is None: raise ValueError("Öğrenci bulunamadı.")
     df = load_students()
-    mask = df["student_id"] == int(student_id)
-    if not mask.any(): raise ValueError("Öğrenci bulunamadı.")
-    df.loc[mask, "active"] = False
-    save_students(df)
+    df.iat[pos, df.columns.get_loc("active")] = active
+    with storage.lock("students"):
+        save_students(df)
+        _registry_adopt(reg)
+
+@storage.optimistic("students")
+def deactivate_student(student_id: int):
+    _set_active(student_id, False)
 
+@storage.optimistic("students")
 def reactivate_student(student_id: int):
-    df = load_students()
-    mask = df["student_id"] == int(student_id)
-    if not mask.any(): raise ValueError("Öğrenci bulunamadı.")
-    df.loc[mask, "active"] = True
-    save_students(df)
+    _set_active(student_id, True)
 
 # ---------- Progress ----------
+_PROGRESS_COLS = ["date","topic","minutes","student_id"]
+
+@cache.memo("progress")
 def load_progress() -> pd.DataFrame:
-    p = DATA / "progress.csv"
     try:
-        df = pd.read_csv(p, encoding="utf-8", parse_dates=["date"])
+        df = storage.read("progress")
+        if df is not None:
+            df["date"] = pd.to_datetime(df["date"], format="mixed")
     except Exception:
-        df = pd.DataFrame(columns=["date","topic","minutes","student_id"])
+        df = None
+    if df is None:
+        df = pd.DataFrame(columns=_PROGRESS_COLS)
     if "student_id" not in df.columns:
         df["student_id"] = 1
     return df
 
 def save_progress(df: pd.DataFrame):
-    df.to_csv(DATA / "progress.csv", index=False, encoding="utf-8")
+    storage.write("progress", df)
 
+@storage.optimistic("progress")
 def append_progress(date_str: str, topic: str, minutes: int, student_id: int = 1):
-    df = load_progress()
-    new_row = {"date": date_str, "topic": topic, "minutes": int(minutes), "student_id": int(student_id)}
-    df2 = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-    save_progress(df2)
+    new = pd.DataFrame([{"date": date_str, "topic": topic, "minutes": int(minutes),
+                         "student_id": int(student_id)}], columns=_PROGRESS_COLS)
+    # şema tutuyorsa tek satır eklenir; eski dosyada (student_id yok) tam yazım
+    if not storage.append("progress", new):
+        save_progress(pd.concat([load_progress(), new], ignore_index=True))
 
 # ---------- UI State (kalıcı tercihler) ----------
-UI_STATE_FILE = DATA / "ui_state.json"
+def _ui_state_path() -> Path:
+    return storage.data_root() / "ui_state.json"
 
+@cache.memo(_ui_state_path)
 def _load_ui_state() -> dict:
     try:
-        with UI_STATE_FILE.open("r", encoding="utf-8") as f:
+        with _ui_state_path().open("r", encoding="utf-8") as f:
             return json.load(f)
     except Exception:
         return {}
 
 def _save_ui_state(state: dict):
-    UI_STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with UI_STATE_FILE.open("w", encoding="utf-8") as f:
-        json.dump(state, f, ensure_ascii=False, indent=2)
+    p = _ui_state_path()
+    storage.write_text(p, json.dumps(state, ensure_ascii=False, indent=2))
+    cache.invalidate(p)
 
 def get_last_selected_student(page: str = "koc_panel") -> int | None:
     """Son seçili öğrenci ID'sini döner (yoksa None)."""
@@ -167,6 +250,14 @@ def get_last_selected_student(page: str = "koc_panel") -> int | None:
 
 def set_last_selected_student(student_id: int, page: str = "koc_panel") -> None:
     """Son seçili öğrenci ID'sini kalıcı olarak kaydeder."""
-    state = _load_ui_state()
-    state.setdefault("last_selected_student", {})[page] = int(student_id)
-    _save_ui_state(state)
+    # oku-değiştir-yaz: diğer süreçlerin sayfa kayıtları kaybolmasın
+    p = _ui_state_path()
+    with storage.lock(p.name, p.parent):
+        state = _load_ui_state()
+        if state.get("last_selected_student", {}).get(page) == int(student_id):
+            return
+        state.setdefault("last_selected_student", {})[page] = int(student_id)
+        _save_ui_state(state)
+
+
+trace.instrument(globals())
@@ -1,12 +1,9 @@
 # core/exam_reviews.py
 from __future__ import annotations
-from pathlib import Path
 import pandas as pd
 from typing import Literal
 
-ROOT = Path(__file__).resolve().parents[1]
-DATA = ROOT / "data"
-CSV = DATA / "exam_reviews.csv"
+from core import storage, cache
 
 _COLS = [
     "exam_id",       # artan id
@@ -23,15 +20,12 @@ _COLS = [
 def _empty_df() -> pd.DataFrame:
     return pd.DataFrame(columns=_COLS)
 
+@cache.memo("exam_reviews")
 def load_exam_reviews() -> pd.DataFrame:
-    DATA.mkdir(parents=True, exist_ok=True)
-    if not CSV.exists() or CSV.stat().st_size == 0:
-        _empty_df().to_csv(CSV, index=False, encoding="utf-8")
+    df = storage.read("exam_reviews")
+    if df is None:
+        # tablo yok / boş → boş şemayla döner; okuma yolunda yazılmaz
         return _empty_df()
-    try:
-        df = pd.read_csv(CSV, encoding="utf-8")
-    except pd.errors.EmptyDataError:
-        df = _empty_df()
     for c in _COLS:
         if c not in df.columns:
             df[c] = ""
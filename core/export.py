@@ -1,79 +1,237 @@
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
 import hashlib
+import json
+import os
+import textwrap
+import threading
 import pandas as pd
 
-def _fmt_dt(dt: datetime) -> str:
-    return dt.strftime("%Y%m%dT%H%M%S")
+from core import storage, trace
+
+# PDF önbelleği: içerik özeti → bytes, en eski kullanılan önce düşer
+_PDF_CACHE_MAX = 32
+_PDF_CACHE: "OrderedDict[str, bytes]" = OrderedDict()
+# Streamlit oturumları ayrı iş parçacıklarında; sıra güncellemesi/atma kilit altında
+_PDF_LOCK = threading.Lock()
+# PDF'e basılan kolonlar; durum vb. değişince özet değişmez
+_PDF_COLS = ["ders", "konu", "birim", "miktar", "kaynak"]
+
+_ICS_HEADER = "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//TYT-Kocluk//Planner v0.1//TR"
+_ICS_FOOTER = "\r\nEND:VCALENDAR"
+
+def _ics_events(dated_plan: pd.DataFrame, start_time: str = "19:00") -> pd.DataFrame:
+    """
+    Plan satırlarından olay tablosu: [student_id], uid, start, end, summary.
+    Bir gün için birden çok satır varsa ardışık bloklar halinde arka arkaya konur
+    (gün içi sıra korunur). student_id kolonu varsa gruplama öğrenci + gün olur.
+    """
+    keys = ["student_id", "date"] if "student_id" in dated_plan.columns else ["date"]
+    df = dated_plan.sort_values(keys, kind="stable")
+    mins = df["minutes"].astype(int)
+    end_off = mins.groupby([df[k] for k in keys], sort=False).cumsum()
+    h, m = map(int, start_time.split(":"))
+    base = pd.to_datetime(pd.Series([datetime(d.year, d.month, d.day) for d in df["date"]],
+                                    index=df.index, dtype="datetime64[ns]"))
+    base = base + pd.Timedelta(hours=h, minutes=m)
+    start = base + pd.to_timedelta(end_off - mins, unit="m")
+    end = base + pd.to_timedelta(end_off, unit="m")
+
+    uid_src = [f"{d.isoformat()}_{t}_{n}" for d, t, n in zip(df["date"], df["topic"], mins)]
+    if "student_id" in df.columns:
+        # aynı konu/gün farklı öğrencilerde ayrı olay olsun
+        uid_src = [f"{s}_{u}" for s, u in zip(df["student_id"], uid_src)]
+    # aynı gün/konu/süre tekrar ederse UID'ler çakışmasın
+    dup = pd.Series(uid_src).groupby(uid_src, sort=False).cumcount().to_numpy()
+    uid_src = [f"{u}_{k}" if k else u for u, k in zip(uid_src, dup)]
+    out = pd.DataFrame({
+        "uid": [hashlib.sha1(u.encode("utf-8")).hexdigest()[:12] + "@tyt-kocluk" for u in uid_src],
+        "start": start.dt.strftime("%Y%m%dT%H%M%S"),
+        "end": end.dt.strftime("%Y%m%dT%H%M%S"),
+        "summary": "Çalışma - " + df["topic"].astype(str),
+    }, index=df.index)
+    if "student_id" in df.columns:
+        out.insert(0, "student_id", df["student_id"])
+    return out.reset_index(drop=True)
+
+def _vevent(uid: str, stamp: str, start: str, end: str, summary: str, seq: int = 0) -> str:
+    seq_line = f"\r\nSEQUENCE:{seq}" if seq else ""
+    return (f"\r\nBEGIN:VEVENT\r\nUID:{uid}\r\nDTSTAMP:{stamp}{seq_line}"
+            f"\r\nDTSTART:{start}\r\nDTEND:{end}\r\nSUMMARY:{summary}\r\nEND:VEVENT")
+
+def _iter_calendar(events: pd.DataFrame, stamp: str) -> Iterator[bytes]:
+    yield _ICS_HEADER.encode("utf-8")
+    for uid, start, end, summary in zip(events["uid"], events["start"], events["end"], events["summary"]):
+        yield _vevent(uid, stamp, start, end, summary).encode("utf-8")
+    yield _ICS_FOOTER.encode("utf-8")
+
+def iter_ics(dated_plan: pd.DataFrame, start_time: str = "19:00") -> Iterator[bytes]:
+    """plan_to_ics'in akış sürümü: başlık, her VEVENT ve kapanış ayrı parça olarak gelir."""
+    now = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    return _iter_calendar(_ics_events(dated_plan, start_time), now)
 
 def plan_to_ics(dated_plan: pd.DataFrame, start_time="19:00"):
     """
     dated_plan: columns -> date (date/datetime), topic (str), minutes (int)
     Bir gün için birden çok satır varsa ardışık bloklar halinde arka arkaya konur.
     """
-    # Gün bazında grupla
-    out = []
+    return b"".join(iter_ics(dated_plan, start_time))
+
+def ics_feeds(dated_plans: pd.DataFrame, start_time: str = "19:00") -> dict[int, Iterator[bytes]]:
+    """
+    Çok öğrencili plandan (student_id, date, topic, minutes) tek geçişte
+    öğrenci başına takvim akışı: {student_id: bytes parçaları üreten iterator}.
+    """
     now = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-    header = [
-        "BEGIN:VCALENDAR",
-        "VERSION:2.0",
-        "PRODID:-//TYT-Kocluk//Planner v0.1//TR",
-    ]
-    out.extend(header)
-
-    for day, block in dated_plan.groupby("date"):
-        h, m = map(int, start_time.split(":"))
-        start_dt = datetime(day.year, day.month, day.day, h, m, 0)
-
-        for _, row in block.iterrows():
-            dur = int(row["minutes"])
-            end_dt = start_dt + timedelta(minutes=dur)
-            uid_src = f"{day.isoformat()}_{row['topic']}_{dur}".encode("utf-8")
-            uid = hashlib.sha1(uid_src).hexdigest()[:12] + "@tyt-kocluk"
-            lines = [
-                "BEGIN:VEVENT",
-                f"UID:{uid}",
-                f"DTSTAMP:{now}",
-                f"DTSTART:{_fmt_dt(start_dt)}",
-                f"DTEND:{_fmt_dt(end_dt)}",
-                f"SUMMARY:Çalışma - {row['topic']}",
-                "END:VEVENT",
-            ]
-            out.extend(lines)
-            start_dt = end_dt  # bir sonraki blok, bir öncekinin bitişinden başlar
-
-    out.append("END:VCALENDAR")
-    return "\r\n".join(out).encode("utf-8")
+    events = _ics_events(dated_plans, start_time)
+    return {int(sid): _iter_calendar(ev, now) for sid, ev in events.groupby("student_id", sort=True)}
+
+
+# --- Artımlı ICS beslemesi ---------------------------------------------------
+def _manifest_path(path: Path) -> Path:
+    return path.with_name(path.name + ".manifest.json")
+
+def _write_feed(path: Path, events: pd.DataFrame) -> dict:
+    """
+    Olay tablosunu path'e yazar; manifest (UID → içerik özeti, DTSTAMP, SEQUENCE)
+    sayesinde değişmeyen olaylar bayt bayt aynı kalır, değişenlerin DTSTAMP'i
+    yenilenip SEQUENCE'ı artar. Hiçbir şey değişmediyse dosyaya dokunulmaz.
+    Manifest okuma → besleme + manifest yazımı "exports" kilidi altındadır;
+    iki dosya da atomik yazılır.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with storage.lock("exports"):
+        return _write_feed_locked(path, events)
+
+def _write_feed_locked(path: Path, events: pd.DataFrame) -> dict:
+    mpath = _manifest_path(path)
+    try:
+        old = json.loads(mpath.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        old = {}
+    now = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+
+    new, added, changed = {}, 0, 0
+    for uid, start, end, summary in zip(events["uid"], events["start"], events["end"], events["summary"]):
+        h = hashlib.sha1(f"{start}|{end}|{summary}".encode("utf-8")).hexdigest()[:16]
+        prev = old.get(uid)
+        if prev is None:
+            added += 1
+            new[uid] = {"h": h, "stamp": now, "seq": 0}
+        elif prev["h"] != h:
+            changed += 1
+            new[uid] = {"h": h, "stamp": now, "seq": prev.get("seq", 0) + 1}
+        else:
+            new[uid] = prev
+    removed = len(old.keys() - new.keys())
+    rep = {"events": len(new), "added": added, "changed": changed, "removed": removed,
+           "unchanged": len(new) - added - changed, "written": False}
+    if not (added or changed or removed) and path.exists():
+        return rep
+
+    with storage.atomic_path(path) as tmp, tmp.open("wb") as f:
+        f.write(_ICS_HEADER.encode("utf-8"))
+        for uid, start, end, summary in zip(events["uid"], events["start"], events["end"], events["summary"]):
+            e = new[uid]
+            f.write(_vevent(uid, e["stamp"], start, end, summary, e["seq"]).encode("utf-8"))
+        f.write(_ICS_FOOTER.encode("utf-8"))
+    with storage.atomic_path(mpath) as tmp:
+        tmp.write_text(json.dumps(new, ensure_ascii=False), encoding="utf-8")
+    rep["written"] = True
+    return rep
+
+def write_ics_feed(dated_plan: pd.DataFrame, path: Path, start_time: str = "19:00") -> dict:
+    """Tek öğrencilik planı diskteki beslemeye artımlı yazar. Dönüş: added/changed/removed/... sayıları."""
+    return _write_feed(Path(path), _ics_events(dated_plan, start_time))
+
+def write_ics_feeds(dated_plans: pd.DataFrame, out_dir: Path, start_time: str = "19:00") -> dict[int, dict]:
+    """Çok öğrencili planı öğrenci başına out_dir/plan_<id>.ics beslemelerine artımlı yazar."""
+    events = _ics_events(dated_plans, start_time)
+    out_dir = Path(out_dir)
+    return {int(sid): _write_feed(out_dir / f"plan_{int(sid)}.ics", ev.reset_index(drop=True))
+            for sid, ev in events.groupby("student_id", sort=True)}
 
 
 # --- ASSIGNMENTS → PDF -------------------------------------------------------
-def assignments_to_pdf(assign_df: pd.DataFrame, student_name: str, week_start, week_end) -> bytes:
+# "matplotlib" (varsayılan) | "direct" (core.pdfwriter, matplotlib'siz)
+PDF_BACKEND = os.environ.get("KOC_PDF_BACKEND", "matplotlib")
+
+# ---------- Yerleşim (iki arka uç için ortak; sayfa oranı cinsinden) ----------
+LEFT, RIGHT, TOP, BOTTOM = 0.07, 0.07, 0.07, 0.08
+HEADER_H = 0.030
+LINE_H   = 0.020
+PAD_T    = 0.006   # satır içi üst boşluk
+PAD_B    = 0.004   # satır içi alt boşluk
+GAP      = 0.004   # satırlar arası boşluk
+MIN_Y    = 0.05
+
+COLS = {"check": 0.04, "konu": 0.55, "hedef": 0.14, "kaynak": 0.27}
+X_CHECK  = 0
+X_KONU   = X_CHECK + COLS["check"]
+X_HEDEF  = X_KONU  + COLS["konu"]
+X_KAYNAK = X_HEDEF + COLS["hedef"]
+
+CHAR_LIMIT = {"konu": 70, "hedef": 18, "kaynak": 36}
+
+GREY_BG   = (246/255, 248/255, 251/255)
+HEADER_BG = (232/255, 236/255, 242/255)
+BORDER    = (205/255, 210/255, 218/255)
+PALETTE   = [
+    (64/255, 120/255, 242/255),
+    (0/255, 170/255, 136/255),
+    (240/255, 98/255, 94/255),
+    (246/255, 178/255, 51/255),
+    (156/255, 105/255, 226/255),
+    (61/255, 213/255, 152/255),
+]
+
+# ---------- Yardımcılar ----------
+def _fmt_minutes(m: int) -> str:
+    m = int(m); h, r = divmod(m, 60)
+    return f"{h}s {r}dk" if h else f"{r}dk"
+
+def _fmt_amount(birim: str, miktar) -> str:
+    try: miktar = int(miktar)
+    except Exception: pass
+    if birim == "Dakika": return _fmt_minutes(miktar)
+    if birim == "Soru":   return f"{miktar} Soru"
+    if birim == "Video":  return f"{miktar} Video"
+    return f"{miktar} {birim}" if birim else str(miktar)
+
+def _wrap(s: str, max_chars: int) -> list[str]:
+    s = str(s or "").strip()
+    if not s: return [""]
+    return textwrap.wrap(s, width=max_chars, break_long_words=False, break_on_hyphens=True)
+
+def _row_height(konu_wrapped, hedef_wrapped, kaynak_wrapped) -> float:
+    max_lines = max(len(konu_wrapped), len(hedef_wrapped), len(kaynak_wrapped))
+    return PAD_T + max_lines*LINE_H + PAD_B
+
+def _prepare(assign_df: pd.DataFrame) -> pd.DataFrame:
+    df = assign_df.copy()
+    for col in ["ders", "konu", "birim", "miktar"]:
+        if col not in df.columns: df[col] = ""
+    df["hedef_txt"] = df.apply(lambda r: _fmt_amount(str(r["birim"]), r["miktar"]), axis=1)
+    return df.sort_values(["ders", "konu", "kaynak"]).reset_index(drop=True)
+
+
+def assignments_to_pdf(assign_df: pd.DataFrame, student_name: str, week_start, week_end,
+                       backend: str | None = None) -> bytes:
     """
     Ödevleri A4 dikey, hizaları sabit bir tablo düzeninde PDF'e çevirir.
     Sütunlar: [ ] | Konu | Hedef | Kaynak
+    backend: "matplotlib" | "direct" (None → PDF_BACKEND)
     """
-    import io, textwrap
+    if (backend or PDF_BACKEND) == "direct":
+        return _assignments_to_pdf_direct(assign_df, student_name, week_start, week_end)
+
+    import io
     import matplotlib.pyplot as plt
     from matplotlib.backends.backend_pdf import PdfPages
     import matplotlib.patches as patches
 
-    # ---------- Yardımcılar ----------
-    def _fmt_minutes(m: int) -> str:
-        m = int(m); h, r = divmod(m, 60)
-        return f"{h}s {r}dk" if h else f"{r}dk"
-
-    def _fmt_amount(birim: str, miktar) -> str:
-        try: miktar = int(miktar)
-        except Exception: pass
-        if birim == "Dakika": return _fmt_minutes(miktar)
-        if birim == "Soru":   return f"{miktar} Soru"
-        if birim == "Video":  return f"{miktar} Video"
-        return f"{miktar} {birim}" if birim else str(miktar)
-
-    def _wrap(s: str, max_chars: int) -> list[str]:
-        s = str(s or "").strip()
-        if not s: return [""]
-        return textwrap.wrap(s, width=max_chars, break_long_words=False, break_on_hyphens=True)
-
     buf = io.BytesIO()
 
     # ---------- Boş liste ise tek sayfa ----------
@@ -88,34 +246,6 @@ def assignments_to_pdf(assign_df: pd.DataFrame, student_name: str, week_start, w
             pdf.savefig(fig, bbox_inches="tight"); plt.close(fig)
         return buf.getvalue()
 
-    # ---------- Stil / Yerleşim ----------
-    LEFT, RIGHT, TOP, BOTTOM = 0.07, 0.07, 0.07, 0.08
-    HEADER_H = 0.030
-    LINE_H   = 0.020
-    PAD_T    = 0.006   # satır içi üst boşluk
-    PAD_B    = 0.004   # satır içi alt boşluk
-    GAP      = 0.004   # satırlar arası boşluk
-    MIN_Y    = 0.05
-
-    COLS = {"check": 0.04, "konu": 0.55, "hedef": 0.14, "kaynak": 0.27}
-    X_CHECK  = 0
-    X_KONU   = X_CHECK + COLS["check"]
-    X_HEDEF  = X_KONU  + COLS["konu"]
-    X_KAYNAK = X_HEDEF + COLS["hedef"]
-
-    CHAR_LIMIT = {"konu": 70, "hedef": 18, "kaynak": 36}
-
-    GREY_BG   = (246/255, 248/255, 251/255)
-    HEADER_BG = (232/255, 236/255, 242/255)
-    BORDER    = (205/255, 210/255, 218/255)
-    PALETTE   = [
-        (64/255, 120/255, 242/255),
-        (0/255, 170/255, 136/255),
-        (240/255, 98/255, 94/255),
-        (246/255, 178/255, 51/255),
-        (156/255, 105/255, 226/255),
-        (61/255, 213/255, 152/255),
-    ]
     subj_color = {}
 
     # ---------- Sayfa kurucu ----------
@@ -157,12 +287,8 @@ def assignments_to_pdf(assign_df: pd.DataFrame, student_name: str, week_start, w
                 color="white", fontweight="bold")
         return y - (bar_h + GAP)
 
-    def row_height(konu_wrapped, hedef_wrapped, kaynak_wrapped) -> float:
-        max_lines = max(len(konu_wrapped), len(hedef_wrapped), len(kaynak_wrapped))
-        return PAD_T + max_lines*LINE_H + PAD_B
-
     def draw_row(ax, konu_wrapped, hedef_wrapped, kaynak_wrapped, y: float) -> float:
-        h = row_height(konu_wrapped, hedef_wrapped, kaynak_wrapped)
+        h = _row_height(konu_wrapped, hedef_wrapped, kaynak_wrapped)
 
         # arka plan
         ax.add_patch(patches.Rectangle((0, y-h), 1, h, facecolor=GREY_BG, edgecolor=BORDER, linewidth=0.5))
@@ -195,11 +321,7 @@ def assignments_to_pdf(assign_df: pd.DataFrame, student_name: str, week_start, w
         return y - h - GAP
 
     # ---------- Veri ----------
-    df = assign_df.copy()
-    for col in ["ders", "konu", "birim", "miktar"]:
-        if col not in df.columns: df[col] = ""
-    df["hedef_txt"] = df.apply(lambda r: _fmt_amount(str(r["birim"]), r["miktar"]), axis=1)
-    df = df.sort_values(["ders", "konu", "kaynak"]).reset_index(drop=True)
+    df = _prepare(assign_df)
 
     # ---------- PDF ----------
     with PdfPages(buf) as pdf:
@@ -221,7 +343,7 @@ def assignments_to_pdf(assign_df: pd.DataFrame, student_name: str, week_start, w
                 hedef_w  = _wrap(str(r["hedef_txt"]), CHAR_LIMIT["hedef"])
                 kaynak_w = _wrap(str(r.get("kaynak") or ""), CHAR_LIMIT["kaynak"])
 
-                h_need = row_height(konu_w, hedef_w, kaynak_w) + GAP
+                h_need = _row_height(konu_w, hedef_w, kaynak_w) + GAP
                 if y - h_need < MIN_Y:
                     pdf.savefig(fig, bbox_inches="tight"); plt.close(fig)
                     fig, ax, page_no, y = new_page(page_no)
@@ -233,3 +355,121 @@ def assignments_to_pdf(assign_df: pd.DataFrame, student_name: str, week_start, w
         pdf.savefig(fig, bbox_inches="tight"); plt.close(fig)
 
     return buf.getvalue()
+
+
+def _assignments_to_pdf_direct(assign_df: pd.DataFrame, student_name: str, week_start, week_end) -> bytes:
+    """assignments_to_pdf ile aynı yerleşim; core.pdfwriter ile doğrudan PDF operatörleri."""
+    from core.pdfwriter import PdfDocument
+
+    doc = PdfDocument()
+    W, H = doc.width, doc.height
+    AX_W, AX_H = 1-LEFT-RIGHT, 1-TOP-BOTTOM
+    # figür oranı → punto; eksen (0..1) → punto
+    fx = lambda x: x * W
+    fy = lambda y: y * H
+    ax_x = lambda x: (LEFT + x*AX_W) * W
+    ax_y = lambda y: (BOTTOM + y*AX_H) * H
+    subj_color = {}
+
+    def title():
+        doc.text(fx(0.5), fy(1-TOP+0.01), f"Ödev Listesi — {student_name}", 16, "center", "top", bold=True)
+        doc.text(fx(0.5), fy(1-TOP-0.02), f"Hafta: {week_start} — {week_end}", 12, "center", "top")
+
+    if assign_df is None or assign_df.empty:
+        doc.new_page()
+        doc.text(fx(0.5), fy(0.94), f"Ödev Listesi — {student_name}", 16, "center", "top", bold=True)
+        doc.text(fx(0.5), fy(0.90), f"Hafta: {week_start} — {week_end}", 12, "center", "top")
+        doc.text(fx(0.5), fy(0.50), "Bu hafta için ödev bulunmuyor.", 12, "center", "center")
+        return doc.finish()
+
+    def new_page(page_no: int):
+        page_no += 1
+        doc.new_page()
+        title()
+        doc.text(fx(0.5), fy(BOTTOM-0.03), f"Sayfa {page_no}", 9, "center", "bottom", color=(0.3, 0.3, 0.3))
+        top = 1-0.10
+        doc.rect(ax_x(0), ax_y(top), AX_W*W, HEADER_H*AX_H*H, fill=HEADER_BG, stroke=BORDER, lw=0.8)
+        mid = ax_y(top + HEADER_H/2)
+        doc.text(ax_x(X_KONU + COLS["konu"]/2),     mid, "Konu",   11, "center", "center", bold=True)
+        doc.text(ax_x(X_HEDEF + COLS["hedef"]/2),   mid, "Hedef",  11, "center", "center", bold=True)
+        doc.text(ax_x(X_KAYNAK + COLS["kaynak"]/2), mid, "Kaynak", 11, "center", "center", bold=True)
+        for x in (X_KONU, X_HEDEF, X_KAYNAK):
+            doc.line(ax_x(x), ax_y(0), ax_x(x), ax_y(1), BORDER, 0.6)
+        return page_no, top-HEADER_H - GAP
+
+    def draw_subject(subject: str, y: float) -> float:
+        bar_h = LINE_H * 1.2
+        color = subj_color.setdefault(subject, PALETTE[len(subj_color) % len(PALETTE)])
+        doc.rect(ax_x(0), ax_y(y - bar_h), AX_W*W, bar_h*AX_H*H, fill=color, stroke=color)
+        doc.text(ax_x(0.006), ax_y(y - bar_h/2), f"[{subject}]", 11, "left", "center",
+                 color=(1, 1, 1), bold=True)
+        return y - (bar_h + GAP)
+
+    def draw_row(konu_w, hedef_w, kaynak_w, y: float) -> float:
+        h = _row_height(konu_w, hedef_w, kaynak_w)
+        doc.rect(ax_x(0), ax_y(y-h), AX_W*W, h*AX_H*H, fill=GREY_BG, stroke=BORDER, lw=0.5)
+        doc.rect(ax_x(0.006), ax_y(y - PAD_T - 0.014), 0.018*AX_W*W, 0.018*AX_H*H,
+                 fill=(1, 1, 1), stroke=BORDER, lw=0.8)
+        for lines, x, ha in ((konu_w,   X_KONU + 0.006,           "left"),
+                             (hedef_w,  X_HEDEF + COLS["hedef"]/2, "center"),
+                             (kaynak_w, X_KAYNAK + 0.006,          "left")):
+            yy = y - PAD_T
+            for s in lines:
+                doc.text(ax_x(x), ax_y(yy), s, 10, ha, "top")
+                yy -= LINE_H
+        doc.line(ax_x(0), ax_y(y-h), ax_x(1), ax_y(y-h), BORDER, 0.6)
+        return y - h - GAP
+
+    df = _prepare(assign_df)
+    page_no, y = new_page(0)
+    for ders, sub in df.groupby("ders", sort=False):
+        if y - (LINE_H * 1.2 + GAP) < MIN_Y:
+            page_no, y = new_page(page_no)
+        y = draw_subject(ders, y)
+        for konu, hedef, kaynak in zip(sub["konu"], sub["hedef_txt"], sub["kaynak"]):
+            konu_w   = _wrap(str(konu),         CHAR_LIMIT["konu"])
+            hedef_w  = _wrap(str(hedef),        CHAR_LIMIT["hedef"])
+            kaynak_w = _wrap(str(kaynak or ""), CHAR_LIMIT["kaynak"])
+            if y - (_row_height(konu_w, hedef_w, kaynak_w) + GAP) < MIN_Y:
+                page_no, y = new_page(page_no)
+                y = draw_subject(ders, y)
+            y = draw_row(konu_w, hedef_w, kaynak_w, y)
+    return doc.finish()
+
+
+# --- PDF önbelleği -----------------------------------------------------------
+def pdf_cache_key(assign_df: pd.DataFrame, student_name: str, week_start, week_end,
+                  backend: str | None = None) -> str:
+    """Ödev satırları (basılan kolonlar), öğrenci adı, hafta aralığı ve arka uçtan sha1 özeti."""
+    h = hashlib.sha1(f"{student_name}|{week_start}|{week_end}|{backend or PDF_BACKEND}".encode("utf-8"))
+    if assign_df is not None and not assign_df.empty:
+        cols = [c for c in _PDF_COLS if c in assign_df.columns]
+        rows = assign_df[cols].astype(str).reset_index(drop=True)
+        h.update("|".join(cols).encode("utf-8"))
+        h.update(pd.util.hash_pandas_object(rows, index=False).values.tobytes())
+    return h.hexdigest()
+
+def cached_pdf(key: str) -> bytes | None:
+    """Önbellekte varsa PDF'i döndürür (üretmez)."""
+    with _PDF_LOCK:
+        pdf = _PDF_CACHE.get(key)
+        if pdf is not None:
+            _PDF_CACHE.move_to_end(key)
+    return pdf
+
+def assignments_to_pdf_cached(assign_df: pd.DataFrame, student_name: str, week_start, week_end,
+                              backend: str | None = None) -> bytes:
+    """assignments_to_pdf + içerik adresli LRU önbellek (_PDF_CACHE_MAX kayıt)."""
+    key = pdf_cache_key(assign_df, student_name, week_start, week_end, backend)
+    pdf = cached_pdf(key)
+    if pdf is None:
+        pdf = assignments_to_pdf(assign_df, student_name, week_start, week_end, backend)
+        # üretim kilit dışında; yalnız ekleme ve atma kilitli
+        with _PDF_LOCK:
+            _PDF_CACHE[key] = pdf
+            while len(_PDF_CACHE) > _PDF_CACHE_MAX:
+                _PDF_CACHE.popitem(last=False)
+    return pdf
+
+
+trace.instrument(globals())
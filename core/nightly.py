@@ -0,0 +1,58 @@
+# core/nightly.py
+"""
+Gece işi: tüm aktif öğrencilerin konu durumunu ve tarihli çalışma planını
+settings.json'daki seviye / günlük dakika / çalışma günlerine göre tek geçişte
+üretir (core.plan.build_cohort_plans). İstenirse plan CSV'ye yazılır.
+Ardından müfredat log'u sıkıştırılır (core.curriculum.compact_log); gün içinde
+log yalnızca sonuna eklenerek büyür.
+
+    python -m core.nightly --days 14 --out data/nightly_plan.csv
+"""
+from __future__ import annotations
+from datetime import date
+from pathlib import Path
+from time import perf_counter
+import argparse
+
+from core.curriculum import compact_log
+from core.dataio import load_settings, load_topics, load_students, load_progress, level_to_col
+from core.plan import build_cohort_plans
+
+_WEEKDAYS = {"Mon": 0, "Tue": 1, "Wed": 2, "Thu": 3, "Fri": 4, "Sat": 5, "Sun": 6}
+
+
+def nightly_plans(days: int = 7, start_from: date | None = None,
+                  student_ids: list[int] | None = None) -> dict:
+    """
+    Dönüş: build_cohort_plans çıktısı + {"students", "seconds"}
+    student_ids: None → tüm aktif öğrenciler
+    """
+    t0 = perf_counter()
+    s = load_settings()
+    topics = load_topics(level_to_col(s["level"]))
+    students = load_students()
+    students = students[students["active"] == True]
+    if student_ids is not None:
+        students = students[students["student_id"].isin([int(x) for x in student_ids])]
+    weekdays = [_WEEKDAYS[d] for d in s["study_days"] if d in _WEEKDAYS]
+
+    out = build_cohort_plans(topics, load_progress(), students["student_id"].tolist(),
+                             int(s["daily_minutes"]), start_from or date.today(), weekdays, days)
+    out["students"] = int(len(students))
+    out["seconds"] = round(perf_counter() - t0, 3)
+    return out
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Aktif öğrenciler için tarihli planları üretir.")
+    ap.add_argument("--days", type=int, default=7, help="Kaç takvim günü ileriye (varsayılan 7)")
+    ap.add_argument("--students", nargs="*", type=int, help="Öğrenci ID'leri (boş → tüm aktifler)")
+    ap.add_argument("--out", help="Planın yazılacağı CSV yolu (boş → yazma)")
+    ap.add_argument("--no-compact", action="store_true", help="Müfredat log'unu sıkıştırma")
+    args = ap.parse_args()
+    rep = nightly_plans(args.days, student_ids=args.students)
+    if args.out:
+        rep["plan"].to_csv(Path(args.out), index=False, encoding="utf-8")
+    print(f"{rep['students']} öğrenci → {len(rep['plan'])} plan satırı, {rep['seconds']} sn")
+    if not args.no_compact:
+        print(f"müfredat log'u sıkıştırıldı: {compact_log()} satır")
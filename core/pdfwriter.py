@@ -0,0 +1,368 @@
+# core/pdfwriter.py
+"""
+matplotlib'siz, doğrudan PDF yazıcı (yalnız standart kütüphane).
+
+Metin, gömülü bir TrueType yazı tipiyle (Type0 / Identity-H) basılır; böylece
+ğ ş ı İ ç ö ü gibi Türkçe karakterler her görüntüleyicide doğru çıkar. Yazı
+tipi, yalnızca kullanılan glifler bırakılarak alt küme halinde gömülür.
+
+Yazı tipi sırası: KOC_PDF_FONT ortam değişkeni → matplotlib'in DejaVuSans'ı
+(matplotlib içe aktarılmadan, find_spec ile) → bilinen sistem yolları.
+
+Koordinatlar punto cinsindendir, orijin sayfanın sol altıdır.
+"""
+from __future__ import annotations
+from functools import lru_cache
+from importlib.util import find_spec
+from pathlib import Path
+import os
+import re
+import struct
+import zlib
+
+A4 = (595.44, 841.68)   # 8.27 x 11.69 inç
+
+_SYSTEM_FONTS = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+    "/System/Library/Fonts/Supplemental/Arial.ttf",
+    "/Library/Fonts/Arial.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+]
+
+# Alt küme yazı tipine alınacak tablolar (PDF CIDFontType2 için yeterli olanlar)
+_KEEP_TABLES = ("head", "hhea", "hmtx", "loca", "glyf", "maxp", "cvt ", "fpgm", "prep")
+
+
+def find_font() -> Path:
+    """Türkçe destekli bir TTF yolu bulur; bulunamazsa FileNotFoundError."""
+    env = os.environ.get("KOC_PDF_FONT")
+    if env:
+        return Path(env)
+    spec = find_spec("matplotlib")
+    if spec is not None and spec.origin:
+        p = Path(spec.origin).parent / "mpl-data" / "fonts" / "ttf" / "DejaVuSans.ttf"
+        if p.exists():
+            return p
+    for s in _SYSTEM_FONTS:
+        if Path(s).exists():
+            return Path(s)
+    raise FileNotFoundError("PDF için Unicode TTF bulunamadı; KOC_PDF_FONT ile yol verin.")
+
+
+# ----------------- TrueType -----------------
+class TrueTypeFont:
+    """Ölçü, cmap ve alt küme için asgari TTF okuyucu."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.data = data = self.path.read_bytes()
+        n = struct.unpack_from(">H", data, 4)[0]
+        self.tables: dict[str, tuple[int, int]] = {}
+        for i in range(n):
+            tag, _, off, ln = struct.unpack_from(">4sIII", data, 12 + 16 * i)
+            self.tables[tag.decode("latin-1")] = (off, ln)
+
+        head = self.tables["head"][0]
+        self.upm = struct.unpack_from(">H", data, head + 18)[0]
+        self.bbox = struct.unpack_from(">4h", data, head + 36)
+        self.loca_format = struct.unpack_from(">h", data, head + 50)[0]
+        hhea = self.tables["hhea"][0]
+        self.ascent, self.descent = struct.unpack_from(">hh", data, hhea + 4)
+        n_hmetrics = struct.unpack_from(">H", data, hhea + 34)[0]
+        self.num_glyphs = struct.unpack_from(">H", data, self.tables["maxp"][0] + 4)[0]
+
+        hmtx = self.tables["hmtx"][0]
+        adv = [struct.unpack_from(">H", data, hmtx + 4 * i)[0] for i in range(n_hmetrics)]
+        self.advances = adv + [adv[-1]] * (self.num_glyphs - n_hmetrics)
+
+        self.cap_height = int(self.ascent * 0.7)
+        if "OS/2" in self.tables:
+            os2, ln = self.tables["OS/2"]
+            if struct.unpack_from(">H", data, os2)[0] >= 2 and ln >= 90:
+                self.cap_height = struct.unpack_from(">h", data, os2 + 88)[0]
+
+        self.cmap = self._read_cmap()
+        self.name = re.sub(r"[^A-Za-z0-9-]", "", self.path.stem) or "Font"
+
+    def _read_cmap(self) -> dict[int, int]:
+        data = self.data
+        base = self.tables["cmap"][0]
+        n = struct.unpack_from(">H", data, base + 2)[0]
+        subs = {}
+        for i in range(n):
+            pid, eid, off = struct.unpack_from(">HHI", data, base + 4 + 8 * i)
+            subs[(pid, eid)] = base + off
+        for key in ((3, 10), (0, 4), (3, 1), (0, 3), (0, 1), (0, 0)):
+            if key not in subs:
+                continue
+            off = subs[key]
+            fmt = struct.unpack_from(">H", data, off)[0]
+            if fmt == 4:
+                return self._cmap4(off)
+            if fmt == 12:
+                return self._cmap12(off)
+        raise ValueError(f"{self.path.name}: desteklenen Unicode cmap yok.")
+
+    def _cmap4(self, off: int) -> dict[int, int]:
+        data = self.data
+        seg = struct.unpack_from(">H", data, off + 6)[0] // 2
+        ends = struct.unpack_from(f">{seg}H", data, off + 14)
+        starts = struct.unpack_from(f">{seg}H", data, off + 16 + 2 * seg)
+        deltas = struct.unpack_from(f">{seg}h", data, off + 16 + 4 * seg)
+        ro_pos = off + 16 + 6 * seg
+        ros = struct.unpack_from(f">{seg}H", data, ro_pos)
+        out = {}
+        for i in range(seg):
+            for c in range(starts[i], ends[i] + 1):
+                if c == 0xFFFF:
+                    continue
+                if ros[i] == 0:
+                    g = (c + deltas[i]) & 0xFFFF
+                else:
+                    g = struct.unpack_from(">H", data, ro_pos + 2 * i + ros[i] + 2 * (c - starts[i]))[0]
+                    if g:
+                        g = (g + deltas[i]) & 0xFFFF
+                if g:
+                    out[c] = g
+        return out
+
+    def _cmap12(self, off: int) -> dict[int, int]:
+        n = struct.unpack_from(">I", self.data, off + 12)[0]
+        out = {}
+        for i in range(n):
+            start, end, g = struct.unpack_from(">III", self.data, off + 16 + 12 * i)
+            for c in range(start, end + 1):
+                out[c] = g + c - start
+        return out
+
+    def _glyph(self, gid: int) -> bytes:
+        loca = self.tables["loca"][0]
+        if self.loca_format == 0:
+            a, b = (2 * x for x in struct.unpack_from(">HH", self.data, loca + 2 * gid))
+        else:
+            a, b = struct.unpack_from(">II", self.data, loca + 4 * gid)
+        glyf = self.tables["glyf"][0]
+        return self.data[glyf + a: glyf + b]
+
+    def _components(self, g: bytes) -> list[int]:
+        """Bileşik glifin alt glifleri."""
+        if len(g) < 10 or struct.unpack_from(">h", g, 0)[0] >= 0:
+            return []
+        out, pos = [], 10
+        while True:
+            flags, gid = struct.unpack_from(">HH", g, pos)
+            out.append(gid)
+            pos += 4 + (4 if flags & 0x1 else 2)
+            pos += 2 if flags & 0x8 else 4 if flags & 0x40 else 8 if flags & 0x80 else 0
+            if not flags & 0x20:
+                return out
+
+    def subset(self, gids: set[int]) -> bytes:
+        """Yalnızca verilen glifleri (ve bileşenlerini) içeren TTF; glif numaraları korunur."""
+        keep, todo = set(), {0} | set(gids)
+        while todo:
+            gid = todo.pop()
+            if gid in keep or gid >= self.num_glyphs:
+                continue
+            keep.add(gid)
+            todo.update(self._components(self._glyph(gid)))
+
+        glyf, loca = bytearray(), []
+        for gid in range(self.num_glyphs):
+            loca.append(len(glyf))
+            if gid in keep:
+                glyf += self._glyph(gid)
+                glyf += b"\0" * (-len(glyf) % 4)
+        loca.append(len(glyf))
+
+        off, ln = self.tables["head"]
+        head = bytearray(self.data[off: off + ln])
+        struct.pack_into(">I", head, 8, 0)       # checkSumAdjustment
+        struct.pack_into(">h", head, 50, 1)      # uzun loca
+        tables = {t: self.data[o: o + l] for t, (o, l) in self.tables.items() if t in _KEEP_TABLES}
+        tables.update(head=bytes(head), glyf=bytes(glyf), loca=struct.pack(f">{len(loca)}I", *loca))
+        return _sfnt(tables)
+
+
+def _checksum(b: bytes) -> int:
+    b += b"\0" * (-len(b) % 4)
+    return sum(struct.unpack(f">{len(b) // 4}I", b)) & 0xFFFFFFFF
+
+
+def _sfnt(tables: dict[str, bytes]) -> bytes:
+    tags = sorted(tables)
+    n = len(tags)
+    es = n.bit_length() - 1
+    out = bytearray(struct.pack(">IHHHH", 0x00010000, n, 16 << es, es, 16 * n - (16 << es)))
+    off = 12 + 16 * n
+    body = bytearray()
+    for t in tags:
+        b = tables[t]
+        out += struct.pack(">4sIII", t.encode("latin-1"), _checksum(b), off + len(body), len(b))
+        body += b + b"\0" * (-len(b) % 4)
+    out += body
+    head = off + sum(len(tables[t]) + (-len(tables[t]) % 4) for t in tags[:tags.index("head")])
+    struct.pack_into(">I", out, head + 8, (0xB1B0AFBA - _checksum(bytes(out))) & 0xFFFFFFFF)
+    return bytes(out)
+
+
+@lru_cache(maxsize=4)
+def load_font(path: str | None = None) -> TrueTypeFont:
+    return TrueTypeFont(Path(path) if path else find_font())
+
+
+# ----------------- Belge -----------------
+def _num(v: float) -> str:
+    return f"{v:.2f}".rstrip("0").rstrip(".")
+
+
+@lru_cache(maxsize=64)
+def _rgb(c) -> str:
+    return " ".join(_num(x) for x in c)
+
+
+class PdfDocument:
+    """
+    Sayfa sayfa çizim yapan basit PDF kurucu. Her sayfanın içeriği bitince
+    sıkıştırılır; yazı tipi alt kümesi finish() sırasında gömülür.
+    """
+
+    def __init__(self, font: TrueTypeFont | None = None, size: tuple[float, float] = A4):
+        self.font = font or load_font()
+        self.width, self.height = size
+        self._pages: list[bytes] = []
+        self._ops: list[str] | None = None
+        self._used: dict[int, str] = {}
+
+    # --- sayfa ---
+    def new_page(self) -> None:
+        self._flush()
+        self._ops = []
+
+    def _flush(self) -> None:
+        if self._ops is not None:
+            self._pages.append(zlib.compress("\n".join(self._ops).encode("latin-1")))
+            self._ops = None
+
+    # --- çizim ---
+    def rect(self, x, y, w, h, fill=None, stroke=None, lw: float = 0.5) -> None:
+        ops = ["q"]
+        if fill is not None:
+            ops.append(f"{_rgb(fill)} rg")
+        if stroke is not None:
+            ops.append(f"{_rgb(stroke)} RG {_num(lw)} w")
+        ops.append(f"{_num(x)} {_num(y)} {_num(w)} {_num(h)} re")
+        ops.append("B" if fill is not None and stroke is not None else "f" if fill is not None else "S")
+        ops.append("Q")
+        self._ops.append(" ".join(ops))
+
+    def line(self, x1, y1, x2, y2, color=(0, 0, 0), lw: float = 0.5) -> None:
+        self._ops.append(f"q {_rgb(color)} RG {_num(lw)} w {_num(x1)} {_num(y1)} m {_num(x2)} {_num(y2)} l S Q")
+
+    def text_width(self, s: str, size: float) -> float:
+        f = self.font
+        return sum(f.advances[f.cmap.get(ord(ch), 0)] for ch in s) * size / f.upm
+
+    def text(self, x, y, s: str, size: float = 10, ha: str = "left", va: str = "baseline",
+             color=(0, 0, 0), bold: bool = False) -> None:
+        """ha: left|center|right, va: top|center|bottom|baseline (matplotlib'e benzer)."""
+        if not s:
+            return
+        f = self.font
+        gids = []
+        for ch in s:
+            g = f.cmap.get(ord(ch), 0)
+            gids.append(g)
+            if g:
+                self._used.setdefault(g, ch)
+        if ha != "left":
+            w = sum(f.advances[g] for g in gids) * size / f.upm
+            x -= w / 2 if ha == "center" else w
+        asc, desc = f.ascent / f.upm * size, f.descent / f.upm * size
+        if va == "top":
+            y -= asc
+        elif va == "center":
+            y -= (asc + desc) / 2
+        elif va == "bottom":
+            y -= desc
+        hexs = "".join(f"{g:04X}" for g in gids)
+        # kalın: dolgu + ince kontur (ayrı kalın yazı tipi gömmeden)
+        style = f"2 Tr {_rgb(color)} RG {_num(size * 0.035)} w " if bold else ""
+        self._ops.append(f"q BT /F1 {_num(size)} Tf {style}{_rgb(color)} rg "
+                         f"{_num(x)} {_num(y)} Td <{hexs}> Tj ET Q")
+
+    # --- çıktı ---
+    def finish(self) -> bytes:
+        self._flush()
+        if not self._pages:
+            self._pages.append(zlib.compress(b""))
+        f = self.font
+        scale = 1000 / f.upm
+        used = [0] + sorted(self._used)
+
+        objs: list[bytes] = []
+
+        def add(body: bytes) -> int:
+            objs.append(body)
+            return len(objs)
+
+        def stream(data: bytes, extra: str = "") -> bytes:
+            return (f"<< /Length {len(data)} /Filter /FlateDecode {extra}>>\nstream\n".encode("latin-1")
+                    + data + b"\nendstream")
+
+        font_file = f.subset(set(used))
+        ff = add(stream(zlib.compress(font_file), f"/Length1 {len(font_file)} "))
+        name = f"KOCAAA+{f.name}"
+        bbox = " ".join(str(int(v * scale)) for v in f.bbox)
+        fd = add((f"<< /Type /FontDescriptor /FontName /{name} /Flags 32 /FontBBox [{bbox}] "
+                  f"/ItalicAngle 0 /Ascent {int(f.ascent * scale)} /Descent {int(f.descent * scale)} "
+                  f"/CapHeight {int(f.cap_height * scale)} /StemV 80 /FontFile2 {ff} 0 R >>").encode("latin-1"))
+        widths = " ".join(f"{g} [{int(f.advances[g] * scale)}]" for g in used)
+        cid = add((f"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /{name} "
+                   f"/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+                   f"/FontDescriptor {fd} 0 R /CIDToGIDMap /Identity /DW 1000 /W [{widths}] >>").encode("latin-1"))
+        tu = add(stream(zlib.compress(_to_unicode(self._used).encode("latin-1"))))
+        font = add((f"<< /Type /Font /Subtype /Type0 /BaseFont /{name} /Encoding /Identity-H "
+                    f"/DescendantFonts [{cid} 0 R] /ToUnicode {tu} 0 R >>").encode("latin-1"))
+
+        pages_id = len(objs) + 2 * len(self._pages) + 1
+        kids = []
+        for content in self._pages:
+            c = add(stream(content))
+            kids.append(add((f"<< /Type /Page /Parent {pages_id} 0 R "
+                             f"/MediaBox [0 0 {_num(self.width)} {_num(self.height)}] "
+                             f"/Resources << /Font << /F1 {font} 0 R >> >> /Contents {c} 0 R >>").encode("latin-1")))
+        add(f"<< /Type /Pages /Kids [{' '.join(f'{k} 0 R' for k in kids)}] /Count {len(kids)} >>".encode("latin-1"))
+        catalog = add(f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode("latin-1"))
+
+        out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for i, body in enumerate(objs, start=1):
+            offsets.append(len(out))
+            out += f"{i} 0 obj\n".encode("latin-1") + body + b"\nendobj\n"
+        xref = len(out)
+        out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode("latin-1")
+        out += "".join(f"{o:010d} 00000 n \n" for o in offsets).encode("latin-1")
+        out += (f"trailer\n<< /Size {len(objs) + 1} /Root {catalog} 0 R >>\n"
+                f"startxref\n{xref}\n%%EOF\n").encode("latin-1")
+        return bytes(out)
+
+
+def _to_unicode(used: dict[int, str]) -> str:
+    """Metin kopyalama / arama için glif → Unicode eşlemesi."""
+    items = sorted(used.items())
+    out = ["/CIDInit /ProcSet findresource begin", "12 dict begin", "begincmap",
+           "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def",
+           "/CMapName /Adobe-Identity-UCS def", "/CMapType 2 def",
+           "1 begincodespacerange", "<0000> <FFFF>", "endcodespacerange"]
+    for i in range(0, len(items), 100):
+        chunk = items[i:i + 100]
+        out.append(f"{len(chunk)} beginbfchar")
+        for g, ch in chunk:
+            out.append(f"<{g:04X}> <{ch.encode('utf-16-be').hex().upper()}>")
+        out.append("endbfchar")
+    out += ["endcmap", "CMapName currentdict /CMap defineresource pop", "end", "end"]
+    return "\n".join(out)
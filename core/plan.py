@@ -1,6 +1,9 @@
 from datetime import date, timedelta
+import numpy as np
 import pandas as pd
 
+from core import trace
+
 def compute_status(topics: pd.DataFrame, progress: pd.DataFrame, student_id: int = 1):
     dfp = progress[progress["student_id"] == student_id].copy()
     done = dfp.groupby("topic", as_index=False)["minutes"].sum().rename(columns={"minutes":"done_min"})
@@ -12,6 +15,29 @@ def compute_status(topics: pd.DataFrame, progress: pd.DataFrame, student_id: int
     overall_pct = 0 if overall_target == 0 else round(100 * overall_done / overall_target, 1)
     return merged, overall_done, overall_target, overall_pct
 
+def compute_status_many(topics: pd.DataFrame, progress: pd.DataFrame, student_ids: list[int]) -> pd.DataFrame:
+    """
+    compute_status'un çok öğrencili sürümü: progress bir kez (student_id, topic)
+    üzerinden gruplanır, öğrenci × konu tablosuyla tek merge yapılır.
+    Dönüş: student_id + compute_status'taki merged kolonları (uzun format).
+    """
+    ids = pd.Series(list(student_ids), name="student_id")
+    dfp = progress[progress["student_id"].isin(ids)]
+    done = (dfp.groupby(["student_id","topic"], as_index=False)["minutes"].sum()
+               .rename(columns={"minutes":"done_min"}))
+    grid = ids.to_frame().merge(topics, how="cross")
+    merged = grid.merge(done, on=["student_id","topic"], how="left")
+    merged["done_min"] = merged["done_min"].fillna(0).astype(int)
+    merged["remaining_min"] = (merged["target_min"] - merged["done_min"]).clip(lower=0)
+    return merged
+
+def overall_status(status: pd.DataFrame) -> pd.DataFrame:
+    """compute_status_many çıktısından öğrenci başına done / target / pct."""
+    o = (status.groupby("student_id", as_index=False)
+               .agg(done=("done_min","sum"), target=("target_min","sum")))
+    o["pct"] = (100 * o["done"] / o["target"].where(o["target"] != 0)).round(1).fillna(0)
+    return o
+
 def next_study_day(start_date: date, study_weekdays: list[int], base: date | None = None) -> date:
     d = base or start_date
     while d.weekday() not in study_weekdays:
@@ -27,36 +53,91 @@ def get_study_dates(start_from: date, study_weekdays: list[int], days: int = 7):
         d += timedelta(days=1)
     return out
 
+def _schedule(groups: np.ndarray, remaining: np.ndarray, daily_minutes: int, n_days: int):
+    """
+    Sıralı konu listesini günlere böler (gruplar = öğrenciler, ardışık bloklar).
+    Her grubun kalan dakikaları uç uca dizilir; kümülatif toplam ile gün sınırları
+    (daily_minutes katları) birleştirilir ve her parça searchsorted ile konusuna
+    bağlanır. Dönüş: (satır indeksi, gün indeksi, dakika) dizileri.
+    """
+    empty = (np.empty(0, dtype=np.int64),) * 3
+    rem = np.clip(np.asarray(remaining, dtype=np.int64), 0, None)
+    keep = np.flatnonzero(rem > 0)
+    if daily_minutes <= 0 or n_days <= 0 or keep.size == 0:
+        return empty
+
+    g, r = np.asarray(groups)[keep], rem[keep]
+    first = np.flatnonzero(np.r_[True, g[1:] != g[:-1]])          # grup başları
+    sizes = np.diff(np.r_[first, g.size])
+    slot = np.repeat(np.arange(first.size), sizes)                 # 0..G-1
+    cs = np.cumsum(r)
+    local_end = cs - np.repeat(np.r_[0, cs][first], sizes)         # grup içi kümülatif
+
+    cap = int(daily_minutes) * int(n_days)                         # grup başına kapasite
+    ends = slot * cap + np.minimum(local_end, cap)
+    cuts = (np.arange(first.size)[:, None] * cap
+            + np.arange(n_days)[None, :] * int(daily_minutes)).ravel()
+    pts = np.union1d(cuts, ends)
+    starts, stops = pts[:-1], pts[1:]
+
+    item = np.searchsorted(ends, starts, side="right")
+    ok = item < ends.size
+    ok[ok] &= slot[item[ok]] == starts[ok] // cap                  # gruplar arası boşlukları at
+    starts, stops, item = starts[ok], stops[ok], item[ok]
+    day = (starts - slot[item] * cap) // int(daily_minutes)
+    return keep[item], day, stops - starts
+
 def build_daily_plan(topics_status: pd.DataFrame, daily_minutes: int):
-    left = daily_minutes
-    plan_rows = []
-    for _, row in topics_status.sort_values(["subject","order"]).iterrows():
-        if left <= 0:
-            break
-        rem = int(row["remaining_min"])
-        if rem <= 0:
-            continue
-        take = min(rem, left)
-        plan_rows.append((row["topic"], int(take)))
-        left -= take
-    return plan_rows
+    ts = topics_status.sort_values(["subject","order"])
+    idx, _, mins = _schedule(np.zeros(len(ts), dtype=np.int64),
+                             ts["remaining_min"].to_numpy(), daily_minutes, 1)
+    topics = ts["topic"].to_numpy()
+    return [(topics[i], int(m)) for i, m in zip(idx, mins)]
 
 def build_sequential_plan(topics_status: pd.DataFrame, daily_minutes: int, dates: list[date]) -> pd.DataFrame:
-    ts = topics_status.copy()
-    remaining = ts[["subject","order","topic","remaining_min"]].copy()
-    remaining["remaining_min"] = remaining["remaining_min"].astype(int)
-
-    rows = []
-    for d in dates:
-        left = daily_minutes
-        for idx, row in remaining.sort_values(["subject","order"]).iterrows():
-            if left <= 0:
-                break
-            rem = int(row["remaining_min"])
-            if rem <= 0:
-                continue
-            take = min(rem, left)
-            rows.append({"date": d, "topic": row["topic"], "minutes": int(take)})
-            remaining.at[idx, "remaining_min"] = rem - take
-            left -= take
-    return pd.DataFrame(rows)
+    ts = topics_status.assign(student_id=0)
+    out = build_sequential_plans(ts, daily_minutes, dates)
+    return out.drop(columns="student_id") if not out.empty else out
+
+def build_cohort_plans(topics: pd.DataFrame, progress: pd.DataFrame, student_ids: list[int],
+                       daily_minutes: int, start_from: date, study_weekdays: list[int],
+                       days: int = 7) -> dict:
+    """
+    Gece işi için: tüm öğrencilerin durumunu ve tarihli planını tek geçişte üretir.
+    Dönüş: {"status": uzun durum tablosu, "overall": öğrenci özeti,
+            "plan": student_id/date/topic/minutes}
+    """
+    status = compute_status_many(topics, progress, student_ids)
+    dates = get_study_dates(start_from, study_weekdays, days)
+    return {
+        "status": status,
+        "overall": overall_status(status),
+        "plan": build_sequential_plans(status, daily_minutes, dates),
+    }
+
+def build_sequential_plans(topics_status: pd.DataFrame, daily_minutes: int, dates: list[date]) -> pd.DataFrame:
+    """
+    Çok öğrencili sürüm: topics_status'ta student_id kolonu olmalı. Her öğrenci
+    aynı tarih listesiyle, kendi kalan dakikalarına göre planlanır.
+    Dönüş kolonları: student_id, date, topic, minutes.
+    """
+    ts = topics_status.sort_values(["student_id","subject","order"], kind="stable")
+    groups = pd.factorize(ts["student_id"])[0]
+    idx, day, mins = _schedule(groups, ts["remaining_min"].astype(int).to_numpy(),
+                               daily_minutes, len(dates))
+    if idx.size == 0:
+        return pd.DataFrame()
+    # gün → öğrenci → konu sırası (tek öğrencide eski çıktıyla aynı)
+    order = np.lexsort((idx, day, groups[idx]))
+    idx, day, mins = idx[order], day[order], mins[order]
+    dates_arr = np.empty(len(dates), dtype=object)
+    dates_arr[:] = list(dates)
+    return pd.DataFrame({
+        "student_id": ts["student_id"].to_numpy()[idx],
+        "date": dates_arr[day],
+        "topic": ts["topic"].to_numpy()[idx],
+        "minutes": mins.astype(int),
+    })
+
+
+trace.instrument(globals())
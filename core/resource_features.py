@@ -1,10 +1,6 @@
-from pathlib import Path
 import pandas as pd
-import html
 
-ROOT = Path(__file__).resolve().parents[1]
-DATA = ROOT / "data"
-RF = DATA / "resource_features.csv"
+from core import storage, cache
 
 _COLUMNS = [
     "resource_id", "name", "subject", "type", "difficulty",
@@ -14,23 +10,15 @@ _COLUMNS = [
 def _empty_df() -> pd.DataFrame:
     return pd.DataFrame(columns=_COLUMNS)
 
-def _ensure_initialized():
-    DATA.mkdir(parents=True, exist_ok=True)
-    if not RF.exists() or RF.stat().st_size == 0:
-        _empty_df().to_csv(RF, index=False, encoding="utf-8")
-        return
-    try:
-        pd.read_csv(RF, nrows=1, encoding="utf-8")
-    except Exception:
-        _empty_df().to_csv(RF, index=False, encoding="utf-8")
-
+@cache.memo("resource_features")
 def load_resource_features() -> pd.DataFrame:
-    _ensure_initialized()
     try:
-        df = pd.read_csv(RF, encoding="utf-8")
-    except pd.errors.EmptyDataError:
+        df = storage.read("resource_features")
+    except (FileNotFoundError, pd.errors.EmptyDataError, pd.errors.ParserError):
+        df = None
+    if df is None:
+        # tablo yok / boş / bozuk → boş şemayla döner; okuma yolunda yazılmaz
         df = _empty_df()
-        df.to_csv(RF, index=False, encoding="utf-8")
     # eksik kolonları tamamla
     for c in _columns_needed():
         if c not in df.columns:
@@ -42,8 +30,9 @@ def _columns_needed():
     return _COLUMNS
 
 def save_resource_features(df: pd.DataFrame):
-    df[_COLUMNS].to_csv(RF, index=False, encoding="utf-8")
+    storage.write("resource_features", df[_COLUMNS])
 
+@storage.optimistic("resource_features")
 def upsert_resource_feature(
     resource_id: int,
     name: str,
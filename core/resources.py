@@ -1,9 +1,6 @@
-from pathlib import Path
 import pandas as pd
 
-ROOT = Path(__file__).resolve().parents[1]
-DATA = ROOT / "data"
-RES = DATA / "resources.csv"
+from core import storage, cache, trace
 
 _COLUMNS = [
     "resource_id", "name", "type", "subject",
@@ -13,22 +10,14 @@ _COLUMNS = [
 def _empty_df() -> pd.DataFrame:
     return pd.DataFrame(columns=_COLUMNS)
 
-def _ensure_res_initialized():
-    DATA.mkdir(parents=True, exist_ok=True)
-    if not RES.exists() or RES.stat().st_size == 0:
-        _empty_df().to_csv(RES, index=False, encoding="utf-8")
-        return
-    try:
-        pd.read_csv(RES, nrows=0, encoding="utf-8")
-    except Exception:
-        _empty_df().to_csv(RES, index=False, encoding="utf-8")
-
+@cache.memo("resources")
 def load_resources() -> pd.DataFrame:
-    _ensure_res_initialized()
     try:
-        df = pd.read_csv(RES, encoding="utf-8")
-    except pd.errors.EmptyDataError:
-        _empty_df().to_csv(RES, index=False, encoding="utf-8")
+        df = storage.read("resources")
+    except (FileNotFoundError, pd.errors.EmptyDataError, pd.errors.ParserError):
+        df = None
+    if df is None:
+        # tablo yok / boş / bozuk → boş şemayla döner; okuma yolunda yazılmaz
         df = _empty_df()
     for c in _COLUMNS:
         if c not in df.columns:
@@ -38,7 +27,7 @@ def load_resources() -> pd.DataFrame:
     return df[_COLUMNS]
 
 def save_resources(df: pd.DataFrame):
-    df[_COLUMNS].to_csv(RES, index=False, encoding="utf-8")
+    storage.write("resources", df[_COLUMNS])
 
 def get_resources(subject: str | None = None, type_: str | None = None,
                   area: str | None = None, difficulty: str | None = None) -> pd.DataFrame:
@@ -49,6 +38,7 @@ def get_resources(subject: str | None = None, type_: str | None = None,
     if difficulty: df = df[df["difficulty"] == difficulty]
     return df.sort_values(["subject","area","difficulty","name"]).reset_index(drop=True)
 
+@storage.optimistic("resources")
 def add_resource(name: str, type_: str, subject: str,
                  total_items: int = 0, notes: str = "",
                  area: str = "", difficulty: str = "") -> int:
@@ -68,6 +58,7 @@ def add_resource(name: str, type_: str, subject: str,
     save_resources(df2)
     return int(new_id)
 
+@storage.optimistic("resources")
 def update_resource(resource_id: int, **kwargs):
     df = load_resources()
     mask = df["resource_id"] == int(resource_id)
@@ -77,6 +68,10 @@ def update_resource(resource_id: int, **kwargs):
             df.loc[mask, k] = v
     save_resources(df)
 
+@storage.optimistic("resources")
 def delete_resource(resource_id: int):
     df = load_resources()
     save_resources(df[df["resource_id"] != int(resource_id)])
+
+
+trace.instrument(globals())
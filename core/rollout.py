@@ -0,0 +1,62 @@
+# core/rollout.py
+"""
+Dönem başı toplu müfredat kurulumu: tüm aktif öğrencilere, seçilen seviye ve
+ders listesine göre topics.csv'den plan oluşturur. Öğrenci × konu çarpımı tek
+seferde hesaplanır, curriculum tablosu bir kez yazılır; var olan plan satırlarına
+dokunulmaz.
+
+    python -m core.rollout --level beginner --subjects Türkçe Matematik
+"""
+from __future__ import annotations
+from time import perf_counter
+import argparse
+
+from core.dataio import load_topics, load_students, level_to_col
+from core.curriculum import generate_plan_rows
+
+# Arayüzdeki Türkçe seviye adları da kabul edilir
+_LEVEL_ALIASES = {"başlangıç": "beginner", "orta": "intermediate", "ileri": "advanced"}
+
+
+def rollout_curriculum(level: str, subjects: list[str] | None = None,
+                       student_ids: list[int] | None = None) -> dict:
+    """
+    level: beginner | intermediate | advanced (ya da Başlangıç/Orta/İleri)
+    subjects: None → topics.csv'deki tüm dersler
+    student_ids: None → tüm aktif öğrenciler
+    Dönüş: {"students", "subjects", "topics", "rows_written", "seconds"}
+    """
+    t0 = perf_counter()
+    level = _LEVEL_ALIASES.get(level.strip().casefold(), level.strip())
+    topics = load_topics(level_to_col(level))
+    if subjects:
+        topics = topics[topics["subject"].isin(subjects)]
+    topics = topics[topics["target_min"] > 0]
+
+    students = load_students()
+    students = students[students["active"] == True]
+    if student_ids is not None:
+        students = students[students["student_id"].isin([int(s) for s in student_ids])]
+
+    rows = (students[["student_id"]]
+            .merge(topics[["subject", "topic", "target_min"]], how="cross"))
+    written = generate_plan_rows(rows) if not rows.empty else 0
+
+    return {
+        "students": int(len(students)),
+        "subjects": int(topics["subject"].nunique()),
+        "topics": int(len(topics)),
+        "rows_written": int(written),
+        "seconds": round(perf_counter() - t0, 3),
+    }
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Aktif öğrencilere toplu müfredat kurar.")
+    ap.add_argument("--level", required=True, help="beginner | intermediate | advanced")
+    ap.add_argument("--subjects", nargs="*", help="Ders listesi (boş → hepsi)")
+    ap.add_argument("--students", nargs="*", type=int, help="Öğrenci ID'leri (boş → tüm aktifler)")
+    args = ap.parse_args()
+    rep = rollout_curriculum(args.level, args.subjects, args.students)
+    print(f"{rep['students']} öğrenci × {rep['topics']} konu ({rep['subjects']} ders) → "
+          f"{rep['rows_written']} yeni satır, {rep['seconds']} sn")
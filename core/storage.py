@@ -0,0 +1,1073 @@
+# core/storage.py
+"""
+Tablo depolama katmanı.
+
+core modülleri dosyalara doğrudan değil, buradaki tablo API'si üzerinden erişir:
+    read(table)            → tüm tablo (ham DataFrame) ya da None (tablo yok/boş)
+    select(table, **eq)    → eşitlik filtresine uyan satırlar (nokta sorgu)
+    write(table, df)       → tabloyu baştan yazar
+    append(table, df)      → satır ekler; şema uymuyorsa False döner
+    stamp(table)           → (yol, mtime_ns, boyut, inode) ya da SQLite'ta
+                             (yol, tablo, sürüm); önbellek anahtarı için
+
+Bölümlü tablolar (assignments → week_start) için ayrıca:
+    scan(table)                    → bölüm bölüm DataFrame üreten iterator
+    write_partition(table, k, df)  → yalnız o bölümü baştan yazar
+    partition_stamp(table, k)      → bölümün damgası
+    archive(table, before)         → eski bölümleri sıkıştırır (CSV)
+
+Veri klasörü varsayılan olarak data/'dır; KOC_DATA ortam değişkeniyle
+değiştirilir. Tek süreçte birden çok kiracı (koçluk merkezi) için kök
+bağlama göre de seçilebilir: use_root(yol) / set_root(yol) bir ContextVar
+ayarlar, data_root() geçerli kökü verir. Arka uçlar, kilitler, önbellek
+(core.cache) ve modül durumları (tenant_state) köke göre ayrıdır; kiracılar
+birbirinin dosyasını, kilidini ve önbelleğini görmez. KOC_TENANTS altındaki
+<ad>/ klasörleri tenant_root(ad) ile çözülür.
+
+Varsayılan arka uç CSV'dir (data/<tablo>.csv). Büyüyen log tabloları
+(curriculum_progress, progress) için pyarrow kuruluysa yanına tipli bir
+Arrow/Feather anlık görüntüsü (<tablo>.feather) yazılır; okuma CSV yerine
+bellek eşlemeli sütunlu okumayla yapılır; görüntüden sonra append ile eklenen
+satırlar (<tablo>.feather.tail zinciriyle doğrulanır) CSV'nin kuyruğundan
+okunur, başka her değişiklik tam okumaya düşer. KOC_STORAGE=sqlite ile aynı
+tablolar data/koc.sqlite3 içinde, student_id/subject/topic/week_start
+üzerinde indeksli ve transaction'lı olarak tutulur. Normalizasyon (tip
+dönüşümü, eksik kolon tamamlama) her zaman modülün kendi loader'ında kalır;
+select() bu yüzden bir ön filtredir, CSV'de tüm tabloyu döndürebilir.
+
+CSV'de bölümlü tablo data/<tablo>/<anahtar>.csv dosyalarında, küçük bir
+data/<tablo>/_manifest.json ile tutulur. Eski tek dosya (data/<tablo>.csv)
+ilk erişimde bölümlere ayrılır ve <tablo>.csv.bak olarak kenara alınır.
+Arşivlenen bölümler <anahtar>.csv.gz olur; okuma aynı şekilde sürer.
+
+CSV → SQLite tek seferlik aktarım:
+    python -m core.storage import
+Eski haftaları arşivleme:
+    python -m core.storage archive --before 2025-06-01
+
+Eşzamanlılık (birden çok Streamlit süreci aynı data/ klasöründe):
+  * Dosyalar geçici dosyaya yazılıp os.replace ile yerine konur; okuyucu
+    yarım dosya görmez, okumalar kilit almaz.
+  * write/append/write_partition tablo başına fcntl kilidi (data/.locks/)
+    altında yapılır; fcntl yoksa (Windows) yalnız süreç içi kilit kalır.
+  * @optimistic("tablo") ile sarılan oku-değiştir-yaz fonksiyonlarında
+    damga (mtime/boyut/inode) baştaki okumadan beri değiştiyse yazım
+    ConflictError verir ve fonksiyon taze okumayla yeniden çalışır; son
+    deneme kilit tutularak yapılır. SQLite'ta damga, yazımla aynı
+    transaction'da artan _versions sayacıdır (tablo ve bölüm başına).
+"""
+from __future__ import annotations
+from pathlib import Path
+from contextlib import ExitStack, closing, contextmanager
+from contextvars import ContextVar
+from datetime import date, datetime
+import csv
+import gzip
+import io
+import json
+import os
+import random
+import shutil
+import sqlite3
+import threading
+import time
+import functools
+import re
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: süreçler arası kilit yok
+    fcntl = None
+
+ROOT = Path(__file__).resolve().parents[1]
+# KOC_DATA ile başka bir veri klasörü (ör. python -m core.synth çıktısı) kullanılabilir
+DATA = Path(os.environ.get("KOC_DATA") or ROOT / "data").resolve()
+DB_NAME = "koc.sqlite3"
+DB_PATH = DATA / DB_NAME
+# kiracı klasörlerinin üst klasörü (KOC_TENANTS/<ad>/)
+TENANTS = Path(os.environ["KOC_TENANTS"]).resolve() if os.environ.get("KOC_TENANTS") else None
+
+# tablo adı → indekslenecek kolon grupları (tablo adı = CSV dosya adı)
+_INDEXES: dict[str, list[list[str]]] = {
+    "students":            [["student_id"]],
+    "progress":            [["student_id", "topic"]],
+    "curriculum":          [["student_id", "subject", "topic"]],
+    "curriculum_progress": [["student_id", "subject", "topic"], ["log_id"]],
+    "assignments":         [["student_id", "week_start"]],
+    "resources":           [["resource_id"], ["subject"]],
+    "resource_features":   [["subject", "name"]],
+    "exam_reviews":        [["subject"]],
+    "channel_features":    [["subject"]],
+}
+TABLES = list(_INDEXES)
+
+# Anlık görüntü alınan tablolar → kolon tipleri
+_SNAPSHOTS: dict[str, dict[str, str]] = {
+    "curriculum_progress": {"log_id": "string", "ts": "timestamp", "student_id": "string",
+                            "subject": "category", "topic": "category", "minutes": "int32"},
+    "progress":            {"date": "timestamp", "topic": "category", "minutes": "int32",
+                            "student_id": "int64"},
+}
+# Bölümlü tablolar → bölüm kolonu (tarih; anahtar YYYY-MM-DD)
+_PARTITIONS: dict[str, str] = {"assignments": "week_start"}
+_MANIFEST = "_manifest.json"
+# bölüm kolonu tarih olarak okunamayan satırların bölümü (tarihlerden sonra sıralanır)
+NO_PART = "_tarihsiz"
+
+# CSV'ye yalnızca satır eklendiğini doğrulamak için saklanan son bayt sayısı
+_TAIL_CHECK = 64
+# görüntüden sonra bu kadar satır eklendiyse görüntü okuma sırasında tazelenir
+_SNAPSHOT_REFRESH_ROWS = 1000
+
+
+def _cell(v):
+    """Python/NumPy/pandas değerini CSV/SQLite'a yazılabilir sade tipe çevirir."""
+    if v is None:
+        return None
+    # önce eksik değer: pd.NaT bir datetime örneğidir, isoformat'a düşmemeli
+    try:
+        if pd.isna(v):
+            return None
+    except (TypeError, ValueError):
+        pass
+    if isinstance(v, np.generic):
+        v = v.item()
+    if isinstance(v, (datetime, date)):
+        return v.isoformat()
+    return v
+
+
+def _rows(df: pd.DataFrame) -> list[tuple]:
+    return [tuple(_cell(v) for v in r) for r in df.itertuples(index=False, name=None)]
+
+
+# ----------------- CSV -----------------
+
+def _arrow():
+    """pyarrow opsiyonel; yoksa anlık görüntü kullanılmaz."""
+    try:
+        import pyarrow as pa
+        import pyarrow.feather as feather
+    except ImportError:
+        return None
+    return pa, feather
+
+
+def _typed(df: pd.DataFrame, spec: dict[str, str]) -> pd.DataFrame:
+    out = df.copy()
+    for c, kind in spec.items():
+        if c not in out.columns:
+            continue
+        if kind == "timestamp":
+            out[c] = pd.to_datetime(out[c], errors="coerce", format="ISO8601")
+        elif kind == "category":
+            out[c] = out[c].astype("string").astype("category")
+        elif kind == "string":
+            out[c] = out[c].astype("string")
+        else:
+            out[c] = pd.to_numeric(out[c], errors="coerce").fillna(0).astype(kind)
+    return out
+
+
+def part_key(v) -> str:
+    """Bölüm anahtarı: tarih/tarih-saat/metin → 'YYYY-MM-DD'; tarih değilse NO_PART."""
+    if isinstance(v, str) and v == NO_PART:
+        return NO_PART
+    try:
+        ts = pd.Timestamp(_cell(v))
+    except (TypeError, ValueError):
+        return NO_PART
+    return NO_PART if pd.isna(ts) else ts.date().isoformat()
+
+
+def _part_keys(s: pd.Series) -> pd.Series:
+    # çözümlenemeyen bölüm değeri satırı düşürmesin: ayrı bölüme gider
+    keys = pd.to_datetime(s.astype(str), errors="coerce", format="mixed").dt.strftime("%Y-%m-%d")
+    return keys.fillna(NO_PART)
+
+
+def file_stamp(p: Path) -> tuple | None:
+    try:
+        st = p.stat()
+    except FileNotFoundError:
+        return None
+    # inode: os.replace her yazımda değiştirir (aynı ms'de aynı boyutlu iki yazım ayrışır)
+    return (str(p), st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+# ----------------- veri kökü (kiracı) -----------------
+
+_ROOT: ContextVar[Path | None] = ContextVar("koc_data_root", default=None)
+_TENANT_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]*")
+_STATE_GUARD = threading.Lock()
+
+
+def data_root() -> Path:
+    """Geçerli veri kökü: bağlamda ayarlanmışsa o, değilse DATA."""
+    return _ROOT.get() or DATA
+
+
+def set_root(root: Path | str | None):
+    """Kökü bu bağlam (iş parçacığı / Streamlit çalıştırması) için ayarlar; None → DATA. Token döner."""
+    return _ROOT.set(Path(root).resolve() if root is not None else None)
+
+
+@contextmanager
+def use_root(root: Path | str | None):
+    tok = set_root(root)
+    try:
+        yield data_root()
+    finally:
+        _ROOT.reset(tok)
+
+
+def bind_root(fn):
+    """fn'i şu anki köke bağlar; yeni iş parçacığı (Timer) bağlamı devralmadığı için."""
+    root = data_root()
+
+    def run(*args, **kwargs):
+        with use_root(root):
+            return fn(*args, **kwargs)
+    return run
+
+
+def tenant_root(name: str) -> Path:
+    """KOC_TENANTS/<ad>; ad harf/rakam/-/_/. içerebilir, klasör var olmalı."""
+    if TENANTS is None:
+        raise ValueError("KOC_TENANTS ayarlı değil.")
+    if not _TENANT_NAME.fullmatch(name or ""):
+        raise ValueError(f"Geçersiz kiracı adı: {name!r}")
+    root = TENANTS / name
+    if not root.is_dir():
+        raise ValueError(f"Kiracı klasörü yok: {name}")
+    return root
+
+
+def tenant_state(states: dict, factory):
+    """states[geçerli kök]; yoksa factory() ile kurulur. Modül durumunu kiracı başına ayırır."""
+    root = data_root()
+    st = states.get(root)
+    if st is None:
+        with _STATE_GUARD:
+            st = states.get(root)
+            if st is None:
+                st = states[root] = factory()
+    return st
+
+
+# ----------------- kilit / atomik yazım -----------------
+
+class ConflictError(RuntimeError):
+    """Okumadan sonra tablo başka bir süreç/iş parçacığı tarafından değiştirildi."""
+
+
+_LOCKS: dict[str, threading.RLock] = {}
+_LOCKS_GUARD = threading.Lock()
+_HELD = threading.local()
+
+
+@contextmanager
+def lock(name: str, root: Path | None = None):
+    """
+    Ada göre özel kilit: süreç içinde RLock, süreçler arasında
+    <root>/.locks/<ad>.lock üzerinde fcntl.flock. Aynı iş parçacığında iç içe alınabilir.
+    """
+    root = Path(root) if root is not None else get_backend().lock_root
+    key = str(root / name)
+    with _LOCKS_GUARD:
+        rl = _LOCKS.setdefault(key, threading.RLock())
+    held = _HELD.__dict__.setdefault("names", {})
+    with rl:
+        if held.get(key):
+            held[key] += 1
+            try:
+                yield
+            finally:
+                held[key] -= 1
+            return
+        f = None
+        if fcntl is not None:
+            (root / ".locks").mkdir(parents=True, exist_ok=True)
+            f = open(root / ".locks" / f"{name}.lock", "a+b")
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        held[key] = 1
+        try:
+            yield
+        finally:
+            held.pop(key, None)
+            if f is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                f.close()
+
+
+@contextmanager
+def atomic_path(path: Path):
+    """Geçici yol verir; blok başarıyla biterse fsync + os.replace ile hedefe taşır."""
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        yield tmp
+        with tmp.open("rb+") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def write_text(path: Path, text: str) -> None:
+    """Tablo dışı dosyalar (settings.json, ui_state.json) için kilitli, atomik yazım."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with lock(path.name, path.parent), atomic_path(path) as tmp:
+        tmp.write_text(text, encoding="utf-8")
+
+
+class CsvBackend:
+    name = "csv"
+    indexed = False
+
+    def __init__(self, root: Path = DATA):
+        self.root = Path(root)
+        self.lock_root = self.root
+
+    def path(self, table: str) -> Path:
+        return self.root / f"{table}.csv"
+
+    def stamp(self, table: str) -> tuple | None:
+        if table in _PARTITIONS:
+            self._ensure_parts(table)
+            return file_stamp(self._manifest_path(table))
+        return file_stamp(self.path(table))
+
+    def snapshot_path(self, table: str) -> Path:
+        return self.root / f"{table}.feather"
+
+    # --- bölümler ---
+    def _manifest_path(self, table: str) -> Path:
+        return self.root / table / _MANIFEST
+
+    def _manifest(self, table: str) -> dict:
+        try:
+            return json.loads(self._manifest_path(table).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {"column": _PARTITIONS[table], "parts": {}}
+
+    def _save_manifest(self, table: str, man: dict) -> None:
+        with atomic_path(self._manifest_path(table)) as tmp:
+            tmp.write_text(json.dumps(man, ensure_ascii=False, indent=1, sort_keys=True), encoding="utf-8")
+
+    def _part_path(self, table: str, key: str, man: dict | None = None) -> Path:
+        info = (man or self._manifest(table))["parts"].get(key)
+        return self.root / table / (info["file"] if info else f"{key}.csv")
+
+    def nbytes(self, table: str, key=None) -> int:
+        """Tablonun (ya da bölümün) diskteki boyutu; ölçüm kancası için."""
+        if table not in _PARTITIONS:
+            st = file_stamp(self.path(table))
+            return st[2] if st else 0
+        man = self._manifest(table)
+        keys = [part_key(key)] if key is not None else list(man["parts"])
+        return sum((file_stamp(self._part_path(table, k, man)) or (0, 0, 0))[2] for k in keys)
+
+    def _ensure_parts(self, table: str) -> None:
+        """Bölüm klasörü yoksa kurar; eski tek CSV varsa bölümlere ayırır."""
+        if self._manifest_path(table).exists():
+            return
+        with lock(table, self.lock_root):
+            if not self._manifest_path(table).exists():
+                self._migrate_parts(table)
+
+    def _migrate_parts(self, table: str) -> None:
+        (self.root / table).mkdir(parents=True, exist_ok=True)
+        legacy = self.path(table)
+        df = None
+        if legacy.exists() and legacy.stat().st_size:
+            try:
+                df = pd.read_csv(legacy, encoding="utf-8")
+            except pd.errors.EmptyDataError:
+                pass
+        man = {"column": _PARTITIONS[table], "parts": {}}
+        if df is not None:
+            self._write_parts(table, df, man)
+        self._save_manifest(table, man)
+        if legacy.exists():
+            os.replace(legacy, legacy.with_name(legacy.name + ".bak"))
+
+    def _write_parts(self, table: str, df: pd.DataFrame, man: dict) -> None:
+        keys = _part_keys(df[_PARTITIONS[table]])
+        for key, part in df.groupby(keys, sort=True):
+            self._write_part(table, key, part, man)
+
+    def _write_part(self, table: str, key: str, df: pd.DataFrame, man: dict) -> None:
+        old = man["parts"].get(key)
+        if df.empty:
+            if old:
+                (self.root / table / old["file"]).unlink(missing_ok=True)
+                del man["parts"][key]
+            return
+        archived = bool(old and old.get("archived"))
+        name = f"{key}.csv.gz" if archived else f"{key}.csv"
+        with atomic_path(self.root / table / name) as tmp:
+            df.to_csv(tmp, index=False, encoding="utf-8", compression="gzip" if archived else None)
+        man["parts"][key] = {"file": name, "rows": int(len(df)), "archived": archived}
+
+    def partitions(self, table: str) -> list[str]:
+        self._ensure_parts(table)
+        return sorted(self._manifest(table)["parts"])
+
+    def partition_stamp(self, table: str, key) -> tuple | None:
+        self._ensure_parts(table)
+        return file_stamp(self._part_path(table, part_key(key)))
+
+    def _read_part(self, table: str, key: str, man: dict | None = None) -> pd.DataFrame | None:
+        p = self._part_path(table, key, man)
+        try:
+            return pd.read_csv(p, encoding="utf-8")
+        except (FileNotFoundError, pd.errors.EmptyDataError):
+            return None
+
+    def scan(self, table: str):
+        if table not in _PARTITIONS:
+            df = self.read(table)
+            if df is not None:
+                yield df
+            return
+        self._ensure_parts(table)
+        man = self._manifest(table)
+        for key in sorted(man["parts"]):
+            df = self._read_part(table, key, man)
+            if df is not None:
+                yield df
+
+    def write_partition(self, table: str, key, df: pd.DataFrame) -> None:
+        self._ensure_parts(table)
+        man = self._manifest(table)
+        self._write_part(table, part_key(key), df, man)
+        self._save_manifest(table, man)
+
+    def archive(self, table: str, before) -> list[str]:
+        """before'dan eski bölümleri gzip'ler. Dönüş: arşivlenen anahtarlar."""
+        self._ensure_parts(table)
+        man, cut, done = self._manifest(table), part_key(before), []
+        for key, info in sorted(man["parts"].items()):
+            if key >= cut or info.get("archived"):
+                continue
+            src = self.root / table / info["file"]
+            dst = src.with_name(f"{key}.csv.gz")
+            with src.open("rb") as f, atomic_path(dst) as tmp, gzip.open(tmp, "wb") as g:
+                shutil.copyfileobj(f, g)
+            man["parts"][key] = {**info, "file": dst.name, "archived": True}
+            self._save_manifest(table, man)
+            src.unlink()
+            done.append(key)
+        return done
+
+    def read(self, table: str) -> pd.DataFrame | None:
+        if table in _PARTITIONS:
+            parts = list(self.scan(table))
+            return pd.concat(parts, ignore_index=True) if parts else None
+        p = self.path(table)
+        if not p.exists() or not p.stat().st_size:
+            return None
+        if table in _SNAPSHOTS:
+            df = self._read_snapshot(table)
+            if df is not None:
+                return df
+        if table not in _SNAPSHOTS:
+            return self.read_raw(table)
+        # görüntü yok/bayat → bir sonraki okuma için üret. Künye (boyut, mtime,
+        # inode, kuyruk) okunan baytların kendisinden alınır: okuma sırasında
+        # başka süreç satır eklerse bunlar künyeye girmez, sonraki okumada kuyruk olur.
+        with p.open("rb") as f:
+            st = os.fstat(f.fileno())
+            data = f.read(st.st_size)
+        try:
+            df = pd.read_csv(io.BytesIO(data), encoding="utf-8")
+        except pd.errors.EmptyDataError:
+            return None
+        if data.endswith(b"\n"):
+            self._write_snapshot(table, df, (st.st_size, st.st_mtime_ns, st.st_ino), data[-_TAIL_CHECK:])
+        return df
+
+    def read_raw(self, table: str) -> pd.DataFrame | None:
+        """CSV'nin kendisi; anlık görüntü kullanılmaz ve üretilmez (tipler dosyadaki gibi)."""
+        if table in _PARTITIONS:
+            return self.read(table)
+        try:
+            return pd.read_csv(self.path(table), encoding="utf-8")
+        except (FileNotFoundError, pd.errors.EmptyDataError):
+            return None
+
+    def _read_snapshot(self, table: str) -> pd.DataFrame | None:
+        """
+        Anlık görüntü CSV ile aynı içerikteyse onu döndürür. CSV'ye sonradan
+        yalnızca bu arka ucun append'iyle satır eklenmişse (yan dosyadaki damga
+        şu anki damgaya eşit, aynı inode, boyut kesin büyümüş, eski kuyruk
+        yerinde) görüntü + CSV'nin yeni kuyruğu okunur. Diğer her durumda
+        (yerinde düzenleme, aynı boyut, dosya değişimi) None → tam okuma.
+        """
+        ar, snap = _arrow(), self.snapshot_path(table)
+        if ar is None or not snap.exists():
+            return None
+        _, feather = ar
+        try:
+            t = feather.read_table(snap, memory_map=True)
+            meta = t.schema.metadata or {}
+            size0 = int(meta[b"koc_csv_size"])
+            mtime0 = int(meta[b"koc_csv_mtime_ns"])
+            ino0 = int(meta[b"koc_csv_ino"])
+            tail0 = bytes.fromhex(meta[b"koc_csv_tail"].decode())
+        except Exception:
+            return None
+
+        p = self.path(table)
+        st = p.stat()
+        now = (st.st_size, st.st_mtime_ns, st.st_ino)
+        rest = b""
+        if now != (size0, mtime0, ino0):
+            # son değişikliği görüntüden beri kesintisiz append zinciri yapmış olmalı;
+            # elle/yerinde düzenleme mtime'ı değiştirir, zincir kopar
+            if self._tail_stamp(table) != now:
+                return None
+            size1, mtime1, ino1 = now
+            # yalnız kesin büyüme + aynı dosya append sayılır
+            if ino1 != ino0 or size1 <= size0:
+                return None
+            with p.open("rb") as f:
+                f.seek(size0 - len(tail0))
+                if f.read(len(tail0)) != tail0:
+                    return None
+                rest = f.read(size1 - size0)
+            # yazımı süren yarım satır bu okumaya girmez
+            rest = rest[:rest.rfind(b"\n") + 1]
+
+        df = t.to_pandas()
+        if rest.strip():
+            extra = pd.read_csv(io.BytesIO(rest), header=None, names=t.column_names, encoding="utf-8")
+            extra = _typed(extra, _SNAPSHOTS[table])
+            # kategoriler birleşmezse concat object'e düşer; görüntünün tiplerini koru
+            for c in df.columns:
+                if isinstance(df[c].dtype, pd.CategoricalDtype) and c in extra.columns:
+                    new = extra[c].dropna().unique().tolist()
+                    df[c] = df[c].cat.add_categories([x for x in new if x not in df[c].cat.categories])
+                    extra[c] = extra[c].astype(df[c].dtype)
+            df = pd.concat([df, extra], ignore_index=True)
+            if len(extra) >= _SNAPSHOT_REFRESH_ROWS:
+                self._write_snapshot(table, df, (size0 + len(rest), mtime1, ino0),
+                                     (tail0 + rest)[-_TAIL_CHECK:])
+        return df
+
+    def _write_snapshot(self, table: str, df: pd.DataFrame, stamp: tuple[int, int, int],
+                        tail: bytes) -> None:
+        """df'i görüntüye yazar; stamp (boyut, mtime_ns, inode) ve tail df'in okunduğu baytlara ait olmalı."""
+        snap, ar = self.snapshot_path(table), _arrow()
+        try:
+            if ar is None:
+                raise ImportError
+            pa, feather = ar
+            size, mtime_ns, ino = stamp
+            t = pa.Table.from_pandas(_typed(df, _SNAPSHOTS[table]), preserve_index=False)
+            t = t.replace_schema_metadata({
+                **(t.schema.metadata or {}),
+                b"koc_csv_size": str(size).encode(),
+                b"koc_csv_mtime_ns": str(mtime_ns).encode(),
+                b"koc_csv_ino": str(ino).encode(),
+                b"koc_csv_tail": tail.hex().encode(),
+            })
+            # sıkıştırmasız: okuma tarafında bellek eşleme (memory_map) mümkün olsun
+            with atomic_path(snap) as tmp:
+                feather.write_feather(t, tmp, compression="uncompressed")
+        except Exception:
+            # görüntü yazılamazsa bayat kalmasın; CSV her zaman asıl kaynak
+            snap.unlink(missing_ok=True)
+        # eski append zinciri yeni görüntüye ait değil
+        self._tail_path(table).unlink(missing_ok=True)
+
+    # --- append zinciri: görüntüden beri yalnız append yapıldığının kanıtı ---
+    def _tail_path(self, table: str) -> Path:
+        return self.root / f"{table}.feather.tail"
+
+    def _tail_stamp(self, table: str) -> tuple | None:
+        try:
+            return tuple(int(x) for x in self._tail_path(table).read_text(encoding="utf-8").split())
+        except (OSError, ValueError):
+            return None
+
+    def _snapshot_stamp(self, table: str) -> tuple | None:
+        ar, snap = _arrow(), self.snapshot_path(table)
+        if ar is None or not snap.exists():
+            return None
+        pa, _ = ar
+        try:
+            with pa.memory_map(str(snap)) as src:
+                meta = pa.ipc.open_file(src).schema.metadata or {}
+            return tuple(int(meta[k]) for k in (b"koc_csv_size", b"koc_csv_mtime_ns", b"koc_csv_ino"))
+        except Exception:
+            return None
+
+    def _note_append(self, table: str, before: os.stat_result, after: os.stat_result) -> None:
+        """Ekleme, bilinen son damgadan (zincir ya da görüntü) başladıysa zinciri uzatır, yoksa koparır."""
+        tail = self._tail_path(table)
+        known = self._tail_stamp(table) or self._snapshot_stamp(table)
+        if known is None or known != (before.st_size, before.st_mtime_ns, before.st_ino):
+            tail.unlink(missing_ok=True)
+            return
+        with atomic_path(tail) as tmp:
+            tmp.write_text(f"{after.st_size} {after.st_mtime_ns} {after.st_ino}", encoding="utf-8")
+
+    def select(self, table: str, **where) -> pd.DataFrame | None:
+        # CSV'de indeks yok; bölüm kolonu verildiyse yalnız o bölüm okunur,
+        # diğer filtreleri modül normalize ettikten sonra uygular
+        col = _PARTITIONS.get(table)
+        if col and where.get(col) is not None:
+            self._ensure_parts(table)
+            return self._read_part(table, part_key(where[col]))
+        return self.read(table)
+
+    def write(self, table: str, df: pd.DataFrame) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        if table in _PARTITIONS:
+            self._ensure_parts(table)
+            man = self._manifest(table)
+            keys = set(_part_keys(df[_PARTITIONS[table]]).dropna())
+            for key in [k for k in man["parts"] if k not in keys]:
+                self._write_part(table, key, df.iloc[0:0], man)
+            self._write_parts(table, df, man)
+            self._save_manifest(table, man)
+            return
+        with atomic_path(self.path(table)) as tmp:
+            df.to_csv(tmp, index=False, encoding="utf-8")
+            if table in _SNAPSHOTS:
+                # künye geçici dosyadan: os.replace inode ve mtime'ı korur, yazdığımız
+                # baytlara aittir (taşımadan sonra eklenen satırlar kuyruk olur)
+                with tmp.open("rb") as f:
+                    st = os.fstat(f.fileno())
+                    f.seek(max(0, st.st_size - _TAIL_CHECK))
+                    tail = f.read()
+        if table in _SNAPSHOTS:
+            self._write_snapshot(table, df, (st.st_size, st.st_mtime_ns, st.st_ino), tail)
+
+    def append(self, table: str, df: pd.DataFrame) -> bool:
+        """Satırları dosya sonuna ekler (append + fsync). Başlık uymazsa False."""
+        if table in _PARTITIONS:
+            # bölümlü tabloda satırlar kendi bölümüne yeniden yazılarak eklenir
+            self._ensure_parts(table)
+            man = self._manifest(table)
+            for key, rows in df.groupby(_part_keys(df[_PARTITIONS[table]]), sort=True):
+                old = self._read_part(table, key, man)
+                if old is not None and list(old.columns) != [str(c) for c in df.columns]:
+                    return False
+                self._write_part(table, key, rows if old is None else pd.concat([old, rows], ignore_index=True), man)
+            self._save_manifest(table, man)
+            return True
+        p = self.path(table)
+        if not p.exists() or not p.stat().st_size:
+            return False
+        with p.open("r", encoding="utf-8") as f:
+            if f.readline().rstrip("\r\n") != ",".join(map(str, df.columns)):
+                return False
+
+        buf = io.StringIO()
+        w = csv.writer(buf, lineterminator="\n")
+        for r in _rows(df):
+            w.writerow(["" if v is None else v for v in r])
+        data = buf.getvalue().encode("utf-8")
+        with p.open("ab+") as f:
+            before = os.fstat(f.fileno())
+            # elle düzenlenmiş dosyada son satır sonu eksik olabilir
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                data = b"\n" + data
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            after = os.fstat(f.fileno())
+        if table in _SNAPSHOTS:
+            self._note_append(table, before, after)
+        return True
+
+
+# ----------------- SQLite -----------------
+
+def _sql_type(s: pd.Series) -> str:
+    kind = pd.api.types.infer_dtype(s, skipna=True)
+    if kind == "boolean":
+        return "BOOLEAN"   # 0/1 saklanır, okurken bool'a döner
+    if kind == "integer":
+        return "INTEGER"
+    if kind in ("floating", "mixed-integer-float", "decimal"):
+        return "REAL"
+    return "TEXT"
+
+
+_VERSIONS = "_versions"
+
+def _q(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class SqliteBackend:
+    name = "sqlite"
+    indexed = True
+
+    def __init__(self, path: Path = DB_PATH):
+        self.path = Path(path)
+        self.lock_root = self.path.parent
+        self._local = threading.local()
+
+    def stamp(self, table: str) -> tuple | None:
+        # tek dosya olduğundan damga dosyadan değil, tablo başına sürüm sayacından gelir
+        return self._version(table)
+
+    def _version(self, name: str, *more: str) -> tuple | None:
+        """(yol, ad, sürüm[, ek adların sürümleri]); kaydı olmayan ad 0 sayılır."""
+        if not self.path.exists():
+            return None
+        names = [name, *more]
+        try:
+            rows = dict(self._reader().execute(
+                f"SELECT name, v FROM {_VERSIONS} WHERE name IN ({', '.join('?' * len(names))})", names))
+        except sqlite3.OperationalError:
+            rows = {}
+        return (str(self.path), *names, *(rows.get(n, 0) for n in names))
+
+    @staticmethod
+    def _bump(con: sqlite3.Connection, table: str, key: str | None = None) -> None:
+        """
+        Yazımla aynı işlemde sürümü artırır. key yoksa (tam yazım/ekleme) tablonun
+        bölüm kuşağı "<tablo>/*" da artar; bölüm damgası bu kuşağı içerdiğinden
+        daha önce hiç bölüm olarak yazılmamış haftalar da geçersizlenir.
+        """
+        con.execute(f"CREATE TABLE IF NOT EXISTS {_VERSIONS} (name TEXT PRIMARY KEY, v INTEGER NOT NULL)")
+        names = [table, f"{table}/*"] if key is None else [table, f"{table}/{key}"]
+        con.executemany(f"INSERT INTO {_VERSIONS} VALUES (?, 1) ON CONFLICT(name) DO UPDATE SET v = v + 1",
+                        [[n] for n in names])
+
+    def _reader(self) -> sqlite3.Connection:
+        # damga sorguları sık: iş parçacığı (ve süreç) başına açık tutulan bağlantı
+        loc = self._local
+        if getattr(loc, "pid", None) != os.getpid():
+            loc.con, loc.pid = sqlite3.connect(self.path, timeout=30), os.getpid()
+        return loc.con
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def _columns(con: sqlite3.Connection, table: str) -> list[tuple[str, str]]:
+        return [(r[1], r[2]) for r in con.execute(f"PRAGMA table_info({_q(table)})")]
+
+    @staticmethod
+    def _query(con: sqlite3.Connection, sql: str, params: list,
+               cols: list[tuple[str, str]]) -> pd.DataFrame:
+        df = pd.read_sql_query(sql, con, params=params)
+        for c, t in cols:
+            if t == "BOOLEAN":
+                df[c] = df[c].map({1: True, 0: False}) if df[c].isna().any() else df[c].astype(bool)
+        return df
+
+    def read(self, table: str) -> pd.DataFrame | None:
+        return self.select(table)
+
+    def select(self, table: str, **where) -> pd.DataFrame | None:
+        with closing(self._connect()) as con:
+            cols = self._columns(con, table)
+            if not cols:
+                return None
+            names = {c for c, _ in cols}
+            conds = [(c, v) for c, v in where.items() if c in names and v is not None]
+            sql = f"SELECT * FROM {_q(table)}"
+            if conds:
+                sql += " WHERE " + " AND ".join(f"{_q(c)} = ?" for c, _ in conds)
+            return self._query(con, sql, [_cell(v) for _, v in conds], cols)
+
+    def _create(self, con: sqlite3.Connection, table: str, df: pd.DataFrame):
+        con.execute(f"DROP TABLE IF EXISTS {_q(table)}")
+        cols = ", ".join(f"{_q(c)} {_sql_type(df[c])}" for c in df.columns)
+        con.execute(f"CREATE TABLE {_q(table)} ({cols})")
+        for group in _INDEXES.get(table, []):
+            if all(c in df.columns for c in group):
+                ix = _q(f"ix_{table}_" + "_".join(group))
+                con.execute(f"CREATE INDEX {ix} ON {_q(table)} ({', '.join(map(_q, group))})")
+
+    def write(self, table: str, df: pd.DataFrame) -> None:
+        with closing(self._connect()) as con, con:
+            have = self._columns(con, table)
+            want = [(str(c), _sql_type(df[c])) for c in df.columns]
+            # şema değiştiyse (ya da boş tablo tipleri yanlış tahmin ettiyse) yeniden kur
+            if [c for c, _ in have] != [c for c, _ in want] or (not df.empty and have != want):
+                self._create(con, table, df)
+            else:
+                con.execute(f"DELETE FROM {_q(table)}")
+            self._insert(con, table, df)
+            self._bump(con, table)
+
+    def append(self, table: str, df: pd.DataFrame) -> bool:
+        with closing(self._connect()) as con, con:
+            if [c for c, _ in self._columns(con, table)] != [str(c) for c in df.columns]:
+                return False
+            self._insert(con, table, df)
+            self._bump(con, table)
+        return True
+
+    # --- bölümler (indeksli sorgu; dosya düzeyinde bölüm yok) ---
+    def partitions(self, table: str) -> list[str]:
+        col = _PARTITIONS[table]
+        with closing(self._connect()) as con:
+            if not self._columns(con, table):
+                return []
+            return sorted({part_key(r[0]) for r in con.execute(f"SELECT DISTINCT {_q(col)} FROM {_q(table)}")})
+
+    def partition_stamp(self, table: str, key) -> tuple | None:
+        return self._version(f"{table}/{part_key(key)}", f"{table}/*")
+
+    def scan(self, table: str):
+        if table not in _PARTITIONS:
+            df = self.read(table)
+            if df is not None:
+                yield df
+            return
+        col = _PARTITIONS[table]
+        for key in self.partitions(table):
+            if key == NO_PART:
+                # eşitlikle sorgulanamaz; tarih olmayan satırlar elle süzülür
+                df = self.select(table)
+                yield df[_part_keys(df[col]) == NO_PART].reset_index(drop=True)
+            else:
+                yield self.select(table, **{col: key})
+
+    def write_partition(self, table: str, key, df: pd.DataFrame) -> None:
+        col = _PARTITIONS[table]
+        with closing(self._connect()) as con, con:
+            have = [c for c, _ in self._columns(con, table)]
+            if not have:
+                if df.empty:
+                    return
+                self._create(con, table, df)
+            elif have != [str(c) for c in df.columns]:
+                raise ValueError(f"{table}: bölüm şeması tabloyla uyuşmuyor")
+            con.execute(f"DELETE FROM {_q(table)} WHERE {_q(col)} = ?", [part_key(key)])
+            self._insert(con, table, df)
+            self._bump(con, table, part_key(key))
+
+    def archive(self, table: str, before) -> list[str]:
+        return []
+
+    def nbytes(self, table: str, key=None) -> int:
+        return 0  # tek dosya; tablo başına bayt ayrılamaz
+
+    @staticmethod
+    def _insert(con: sqlite3.Connection, table: str, df: pd.DataFrame):
+        if df.empty:
+            return
+        marks = ", ".join("?" for _ in df.columns)
+        con.executemany(f"INSERT INTO {_q(table)} VALUES ({marks})", _rows(df))
+
+
+# ----------------- seçim -----------------
+
+# (tür, kök) → arka uç
+_BACKENDS: dict[tuple[str, Path], CsvBackend | SqliteBackend] = {}
+_WRITE_HOOKS: list = []
+_IO_HOOKS: list = []
+
+def on_write(fn) -> None:
+    """fn(table) her write/append sonrası çağrılır (örn. önbellek temizliği)."""
+    _WRITE_HOOKS.append(fn)
+
+def _notify(table: str) -> None:
+    for fn in _WRITE_HOOKS:
+        fn(table)
+
+def on_io(fn) -> None:
+    """fn(op, table, rows, nbytes) her okuma/yazımda çağrılır (op: read | write); ölçüm için."""
+    _IO_HOOKS.append(fn)
+
+def _io(op: str, table: str, df: pd.DataFrame | None, key=None) -> None:
+    # kanca yoksa maliyet tek liste kontrolü
+    if _IO_HOOKS:
+        rows = 0 if df is None else len(df)
+        nbytes = get_backend().nbytes(table, key)
+        for fn in _IO_HOOKS:
+            fn(op, table, rows, nbytes)
+
+def get_backend() -> CsvBackend | SqliteBackend:
+    """KOC_STORAGE ortam değişkenine göre (csv | sqlite) geçerli kökün arka ucunu döndürür."""
+    kind = os.environ.get("KOC_STORAGE", "csv").strip().lower() or "csv"
+    root = data_root()
+    b = _BACKENDS.get((kind, root))
+    if b is None:
+        if kind == "csv":
+            b = CsvBackend(root)
+        elif kind == "sqlite":
+            b = SqliteBackend(root / DB_NAME)
+        else:
+            raise ValueError(f"Bilinmeyen depolama türü: {kind}")
+        _BACKENDS[(kind, root)] = b
+    return b
+
+def read(table: str) -> pd.DataFrame | None:
+    df = get_backend().read(table)
+    _io("read", table, df)
+    return df
+
+def select(table: str, **where) -> pd.DataFrame | None:
+    df = get_backend().select(table, **where)
+    _io("read", table, df, where.get(_PARTITIONS.get(table, "")))
+    return df
+
+def stamp(table: str) -> tuple | None:
+    return get_backend().stamp(table)
+
+# @optimistic içindeyken tablo → okuma başındaki damga
+_EXPECT: ContextVar[dict | None] = ContextVar("koc_storage_expect", default=None)
+RETRIES = 8
+
+def optimistic(*tables: str, retries: int = RETRIES):
+    """
+    Oku-değiştir-yaz fonksiyonları için dekoratör. Giriş anında tabloların
+    damgası alınır; write() sırasında damga değişmişse ConflictError ile
+    fonksiyon baştan (taze okumayla) tekrar çalıştırılır. Son deneme tablo
+    kilitleri tutularak yapılır (yoğun yarışta da ilerleme garanti). İç içe
+    çağrılarda en dıştaki tekrar döngüsü geçerlidir.
+    """
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            outer = _EXPECT.get()
+            if outer is not None:
+                for t in tables:
+                    outer.setdefault(t, stamp(t))
+                return fn(*args, **kwargs)
+            for attempt in range(retries):
+                with ExitStack() as stack:
+                    if attempt == retries - 1:
+                        for t in sorted(tables):
+                            stack.enter_context(lock(t))
+                    token = _EXPECT.set({t: stamp(t) for t in tables})
+                    try:
+                        return fn(*args, **kwargs)
+                    except ConflictError:
+                        if attempt == retries - 1:
+                            raise
+                    finally:
+                        _EXPECT.reset(token)
+                time.sleep(random.uniform(0, 0.01 * (attempt + 1)))
+        return wrapper
+    return deco
+
+def _check(table: str) -> None:
+    exp = _EXPECT.get()
+    if exp is not None and table in exp and get_backend().stamp(table) != exp[table]:
+        raise ConflictError(f"{table}: okumadan sonra başka bir yazım oldu")
+
+def _adopt(table: str) -> None:
+    # kendi yazımımız sonrası damga: aynı işlem içindeki sonraki yazımlar çakışma sayılmaz
+    exp = _EXPECT.get()
+    if exp is not None and table in exp:
+        exp[table] = get_backend().stamp(table)
+
+def write(table: str, df: pd.DataFrame) -> None:
+    try:
+        with lock(table):
+            _check(table)
+            get_backend().write(table, df)
+            _adopt(table)
+        _io("write", table, df)
+    finally:
+        _notify(table)
+
+def append(table: str, df: pd.DataFrame) -> bool:
+    # ekleme çakışma sayılmaz (sıra önemsiz); yalnız kilit altında yapılır
+    try:
+        with lock(table):
+            exp = _EXPECT.get()
+            fresh = exp is not None and exp.get(table) == get_backend().stamp(table)
+            ok = get_backend().append(table, df)
+            if fresh:
+                _adopt(table)
+        if ok:
+            _io("write", table, df)
+        return ok
+    finally:
+        _notify(table)
+
+def scan(table: str):
+    if not _IO_HOOKS:
+        return get_backend().scan(table)
+    return _scan_counted(table)
+
+def _scan_counted(table: str):
+    for df in get_backend().scan(table):
+        for fn in _IO_HOOKS:
+            fn("read", table, len(df), 0)
+        yield df
+    for fn in _IO_HOOKS:
+        fn("read", table, 0, get_backend().nbytes(table))
+
+def partitions(table: str) -> list[str]:
+    return get_backend().partitions(table)
+
+def partition_stamp(table: str, key) -> tuple | None:
+    return get_backend().partition_stamp(table, key)
+
+_ANY = object()
+
+def write_partition(table: str, key, df: pd.DataFrame, expect=_ANY) -> None:
+    """expect (bölüm damgası ya da None) verilirse ve tutmazsa ConflictError."""
+    try:
+        with lock(table):
+            b = get_backend()
+            if expect is not _ANY and b.partition_stamp(table, key) != expect:
+                raise ConflictError(f"{table}/{part_key(key)}: okumadan sonra başka bir yazım oldu")
+            b.write_partition(table, key, df)
+        _io("write", table, df, key)
+    finally:
+        _notify(table)
+
+def archive(table: str, before) -> list[str]:
+    try:
+        with lock(table):
+            return get_backend().archive(table, before)
+    finally:
+        _notify(table)
+
+
+# ----------------- CSV → SQLite -----------------
+
+def import_csv(db_path: Path | None = None, root: Path | None = None,
+               tables: list[str] | None = None) -> dict[str, int]:
+    """<kök>/*.csv dosyalarını SQLite'a aktarır (varsayılan: geçerli kök). Dönüş: {tablo: satır sayısı}."""
+    root = Path(root) if root is not None else data_root()
+    src, dst = CsvBackend(root), SqliteBackend(Path(db_path) if db_path else root / DB_NAME)
+    out = {}
+    for t in tables or TABLES:
+        # görüntüden değil ham CSV'den: aktarılan tipler görüntünün varlığına bağlı olmasın
+        df = src.read_raw(t)
+        if df is None:
+            continue
+        dst.write(t, df)
+        out[t] = len(df)
+    return out
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Koç Asistan depolama araçları")
+    ap.add_argument("command", choices=["import", "archive"])
+    ap.add_argument("--db", type=Path, help="Varsayılan <data>/koc.sqlite3")
+    ap.add_argument("--data", type=Path, default=DATA)
+    ap.add_argument("--table", default="assignments", help="archive: bölümlü tablo")
+    ap.add_argument("--before", type=date.fromisoformat, help="archive: bu tarihten eski bölümler")
+    args = ap.parse_args()
+    if args.command == "archive":
+        # tablo kilidi altında; uygulama aynı anda yazıyorsa bölümler yarışmaz
+        with use_root(args.data):
+            keys = archive(args.table, args.before or date.today())
+        print(f"{args.table}: {len(keys)} bölüm arşivlendi")
+    else:
+        for t, n in import_csv(args.db, args.data).items():
+            print(f"{t}: {n} satır")
@@ -0,0 +1,191 @@
+# core/synth.py
+"""
+Yük testi için sentetik veri klasörü üretir.
+
+Ölçeklenen tablolar (students, curriculum, curriculum_progress, assignments,
+progress) tohumlu rastgele üretilir; planlar gerçek topics.csv'den kurulur.
+Katalog tabloları (resources, resource_features, channel_features,
+exam_reviews) catalog > 0 ise gerçek satırlar çoğaltılarak o kadar satıra
+büyütülür, değilse olduğu gibi kopyalanır. Aynı tohum ve boyut her zaman
+aynı dosyaları verir. Büyük tablolar parça parça yazılır; 10M log satırı
+belleğe sığmak zorunda değil.
+
+Üretilen klasör KOC_DATA ile kullanılır:
+    python -m core.synth /tmp/koc-xl --size xl
+    KOC_DATA=/tmp/koc-xl streamlit run ui_streamlit/app.py
+"""
+from __future__ import annotations
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import argparse
+import json
+import shutil
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+_COPY = ["topics.csv", "settings.json"]
+_CATALOG = ["resources.csv", "resource_features.csv", "channel_features.csv", "exam_reviews.csv"]
+# katalog tablosu → id kolonu
+_CATALOG_ID = {"resources.csv": "resource_id", "resource_features.csv": "resource_id",
+               "channel_features.csv": "channel_id", "exam_reviews.csv": "exam_id"}
+
+# parça başına satır (log) / hafta (ödev)
+_LOG_CHUNK = 1_000_000
+_WEEK_CHUNK = 13
+
+SIZES = {
+    "small":  {"students": 20,     "weeks": 8,   "logs_per_student": 50,   "catalog": 0},
+    "medium": {"students": 200,    "weeks": 26,  "logs_per_student": 200,  "catalog": 0},
+    "large":  {"students": 1000,   "weeks": 52,  "logs_per_student": 500,  "catalog": 2000},
+    "xl":     {"students": 10_000, "weeks": 156, "logs_per_student": 1000, "catalog": 20_000},
+}
+
+
+def _topics(src: Path) -> pd.DataFrame:
+    df = pd.read_csv(src / "topics.csv", sep=";", encoding="utf-8")
+    df["topic"] = df["topic"].astype(str).str.strip()
+    return df[df["topic"] != ""].reset_index(drop=True)
+
+
+def _append_csv(df: pd.DataFrame, path: Path, first: bool) -> None:
+    df.to_csv(path, mode="w" if first else "a", header=first, index=False, encoding="utf-8")
+
+
+def _catalog(src: Path, dst: Path, name: str, n: int) -> int:
+    """Gerçek katalog satırlarını n satıra çoğaltır; kopyalar ad sonuna '#k' alır."""
+    if n <= 0:
+        shutil.copyfile(src / name, dst / name)
+        return len(pd.read_csv(src / name, encoding="utf-8"))
+    base = pd.read_csv(src / name, encoding="utf-8", keep_default_na=False)
+    rep = np.arange(n) // len(base)
+    df = base.iloc[np.arange(n) % len(base)].reset_index(drop=True)
+    df[_CATALOG_ID[name]] = np.arange(1, n + 1)
+    df["name"] = np.where(rep == 0, df["name"], df["name"] + " #" + rep.astype(str))
+    df.to_csv(dst / name, index=False, encoding="utf-8")
+    return n
+
+
+def generate(data_dir: Path, students: int = 20, weeks: int = 8, logs_per_student: int = 50,
+             catalog: int = 0, seed: int = 0, start: date = date(2025, 9, 1),
+             src: Path | None = None) -> dict:
+    """data_dir'e CSV'leri yazar. Dönüş: tablo → satır sayısı."""
+    rng = np.random.default_rng(seed)
+    src = Path(src) if src else ROOT / "data"
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    for name in _COPY:
+        shutil.copyfile(src / name, data_dir / name)
+    (data_dir / "ui_state.json").write_text("{}", encoding="utf-8")
+    counts = {name[:-4]: _catalog(src, data_dir, name, catalog) for name in _CATALOG}
+
+    topics = _topics(src)
+    subjects = topics["subject"].unique()
+    t0 = datetime.combine(start, datetime.min.time())
+
+    # öğrenciler
+    sids = np.arange(1, students + 1)
+    st = pd.DataFrame({
+        "student_id": sids,
+        "student_name": [f"Öğrenci {i:04d}" for i in sids],
+        "active": rng.random(students) < 0.9,
+        "created_at": [(t0 - timedelta(days=int(d))).isoformat(timespec="seconds")
+                       for d in rng.integers(0, 60, students)],
+    })
+    st.to_csv(data_dir / "students.csv", index=False, encoding="utf-8")
+
+    # plan: her öğrenciye 2–4 ders, dersin tüm konuları
+    by_subject = {s: topics[topics["subject"] == s] for s in subjects}
+    plans = []
+    for sid in sids:
+        k = int(rng.integers(2, min(4, len(subjects)) + 1))
+        for subj in rng.choice(subjects, size=k, replace=False):
+            t = by_subject[subj]
+            plans.append(pd.DataFrame({"student_id": sid, "subject": subj, "topic": t["topic"].to_numpy(),
+                                       "target_min": t["beginner_min"].astype(int).to_numpy()}))
+    cur = pd.concat(plans, ignore_index=True)
+    cur.to_csv(data_dir / "curriculum.csv", index=False, encoding="utf-8")
+    cur_sid, cur_subj, cur_topic = (cur[c].to_numpy() for c in ("student_id", "subject", "topic"))
+
+    # ilerleme logları: plan satırlarından rastgele; zaman dilimi dilimi yazılır, dosya ts'e göre sıralı kalır
+    n_logs = students * logs_per_student
+    span = weeks * 7 * 86400
+    n_chunks = max(1, -(-n_logs // _LOG_CHUNK))
+    path = data_dir / "curriculum_progress.csv"
+    for j in range(n_chunks):
+        n = n_logs // n_chunks + (j < n_logs % n_chunks)
+        lo, hi = span * j // n_chunks, span * (j + 1) // n_chunks
+        pick = rng.integers(0, len(cur), n)
+        secs = np.sort(rng.integers(lo, max(hi, lo + 1), n))
+        _append_csv(pd.DataFrame({
+            "log_id": np.frombuffer(rng.bytes(16 * n).hex().encode(), dtype="S32").astype(str),
+            "ts": np.datetime_as_string(np.datetime64(t0, "s") + secs, unit="s"),
+            "student_id": cur_sid[pick],
+            "subject": cur_subj[pick],
+            "topic": cur_topic[pick],
+            "minutes": rng.integers(10, 91, n),
+        }), path, j == 0)
+    counts["curriculum_progress"] = n_logs
+
+    # ödevler: öğrenci × hafta başına 3–8 farklı konu (anahtar tekil); hafta blokları halinde
+    # plan öğrenciye göre sıralı: her öğrencinin satır aralığı [lo, hi)
+    starts = np.flatnonzero(np.r_[True, cur_sid[1:] != cur_sid[:-1]])
+    ends = np.r_[starts[1:], len(cur)]
+    wk = np.array([(start + timedelta(weeks=w)).isoformat() for w in range(weeks)])
+    path, n_asg = data_dir / "assignments.csv", 0
+    for w0 in range(0, max(weeks, 1), _WEEK_CHUNK):
+        nw = min(_WEEK_CHUNK, weeks - w0)
+        w_all, r_all = [], []
+        for lo, hi in zip(starts, ends):
+            order = np.argsort(rng.random((nw, hi - lo)), axis=1)[:, :8]
+            n = np.minimum(rng.integers(3, 9, nw), hi - lo)
+            w_idx, col = np.nonzero(np.arange(order.shape[1]) < n[:, None])
+            w_all.append(w0 + w_idx)
+            r_all.append(lo + order[w_idx, col])
+        w_idx = np.concatenate(w_all) if w_all else np.empty(0, int)
+        pick = np.concatenate(r_all) if r_all else np.empty(0, int)
+        asg = pd.DataFrame({"week_start": wk[w_idx], "student_id": cur_sid[pick],
+                            "ders": cur_subj[pick], "konu": cur_topic[pick]})
+        asg = asg.sort_values(["week_start", "student_id"], kind="stable").reset_index(drop=True)
+        k = len(asg)
+        asg["birim"] = np.where(rng.random(k) < 0.5, "Dakika", "Soru")
+        asg["miktar"] = np.where(asg["birim"] == "Dakika", 30 * rng.integers(1, 5, k), 10 * rng.integers(2, 9, k))
+        asg["kaynak"] = ""
+        asg["durum"] = rng.random(k) < 0.5
+        _append_csv(asg, path, w0 == 0)
+        n_asg += k
+    counts["assignments"] = n_asg
+
+    # günlük ilerleme tablosu (progress)
+    n_prog = max(students, 10)
+    prog = pd.DataFrame({
+        "date": [(start + timedelta(days=int(d))).isoformat() for d in rng.integers(0, weeks * 7, n_prog)],
+        "topic": topics["topic"].to_numpy()[rng.integers(0, len(topics), n_prog)],
+        "minutes": rng.integers(10, 121, n_prog),
+        "student_id": rng.choice(sids, n_prog),
+    }).sort_values("date")
+    prog.to_csv(data_dir / "progress.csv", index=False, encoding="utf-8")
+
+    counts.update(students=len(st), curriculum=len(cur), progress=len(prog))
+    (data_dir / "_synth.json").write_text(json.dumps({"seed": seed, **counts}), encoding="utf-8")
+    return counts
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Sentetik veri klasörü üretir (KOC_DATA ile kullanılır).")
+    ap.add_argument("root", type=Path, help="Hedef veri klasörü")
+    ap.add_argument("--size", choices=list(SIZES), default="small")
+    ap.add_argument("--students", type=int)
+    ap.add_argument("--weeks", type=int)
+    ap.add_argument("--logs-per-student", type=int)
+    ap.add_argument("--catalog", type=int, help="Katalog tablosu başına satır (0 → gerçek katalog)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    size = dict(SIZES[args.size])
+    for k in size:
+        if getattr(args, k) is not None:
+            size[k] = getattr(args, k)
+    counts = generate(args.root, seed=args.seed, **size)
+    print(json.dumps(counts, ensure_ascii=False))
+    print(f"KOC_DATA={args.root.resolve()}")
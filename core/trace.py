@@ -0,0 +1,188 @@
+# core/trace.py
+"""
+İsteğe bağlı sıcak yol ölçümü.
+
+KOC_TRACE=1 ortam değişkeniyle (ya da çalışırken enable()) açılır. Açıkken
+instrument(globals()) ile sarılmış modüllerin public fonksiyonlarının her
+çağrısı halka tampona düşer: süre, iç içelik derinliği, storage üzerinden
+okunan/yazılan satır ve dosya baytı. Fonksiyon başına toplamlar ayrıca
+tutulur. Kapalıyken sarmalayıcı yalnız bir bayrak kontrolü yapar.
+
+    trace.summary()   → fonksiyon başına çağrı/süre/satır/bayt
+    trace.dump(path)  → {"summary", "events"} JSON
+    KOC_TRACE_DUMP=trace.json → süreç çıkışında dump
+Arayüz: ana sayfa ?tani=1
+"""
+from __future__ import annotations
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+import atexit
+import functools
+import json
+import os
+import threading
+import types
+
+_TRUE = ("1", "true", "yes", "on")
+_ON = os.environ.get("KOC_TRACE", "").strip().lower() in _TRUE
+RING_SIZE = 5000
+
+_RING: deque[dict] = deque(maxlen=RING_SIZE)
+# ad → [çağrı, toplam_ms, en_uzun_ms, satır_okunan, satır_yazılan, bayt_okunan, bayt_yazılan, hata]
+_STATS: dict[str, list] = {}
+_LOCK = threading.Lock()
+_LOCAL = threading.local()
+_HOOKED = False
+_CO_GENERATOR = 0x20  # inspect.CO_GENERATOR; inspect import'u ~15 ms tutuyor
+
+
+def enabled() -> bool:
+    return _ON
+
+
+def enable(on: bool = True) -> None:
+    global _ON
+    _ON = bool(on)
+    if _ON:
+        _hook()
+
+
+def reset() -> None:
+    with _LOCK:
+        _RING.clear()
+        _STATS.clear()
+
+
+def _hook() -> None:
+    # storage G/Ç kancası ilk açılışta bağlanır; plan gibi saf modüller storage'ı import etmez
+    global _HOOKED
+    if not _HOOKED:
+        from core import storage
+        storage.on_io(_on_io)
+        _HOOKED = True
+
+
+def _stack() -> list:
+    s = getattr(_LOCAL, "stack", None)
+    if s is None:
+        s = _LOCAL.stack = []
+    return s
+
+
+def _on_io(op: str, table: str, rows: int, nbytes: int) -> None:
+    if not _ON:
+        return
+    s = _stack()
+    if s:
+        c = s[-1]
+        i = 0 if op == "read" else 1
+        c[i] += rows
+        c[i + 2] += nbytes
+
+
+def _record(name: str, t0: float, c: list, err: str | None) -> None:
+    ms = (perf_counter() - t0) * 1000
+    s = _stack()
+    if s:
+        # üst çağrı alt çağrının G/Ç'sini de kapsar
+        p = s[-1]
+        for i in range(4):
+            p[i] += c[i]
+    ev = {"ts": datetime.now().isoformat(timespec="milliseconds"), "fn": name, "ms": round(ms, 3),
+          "depth": len(s), "rows_read": c[0], "rows_written": c[1], "bytes_read": c[2], "bytes_written": c[3]}
+    if err:
+        ev["error"] = err
+    with _LOCK:
+        _RING.append(ev)
+        st = _STATS.get(name)
+        if st is None:
+            st = _STATS[name] = [0, 0.0, 0.0, 0, 0, 0, 0, 0]
+        st[0] += 1
+        st[1] += ms
+        st[2] = max(st[2], ms)
+        for i in range(4):
+            st[3 + i] += c[i]
+        st[7] += err is not None
+
+
+@contextmanager
+def span(name: str):
+    """Fonksiyon dışı bir bloğu ölçer: with trace.span("sayfa1.tablo"): ..."""
+    if not _ON:
+        yield
+        return
+    s, c, err = _stack(), [0, 0, 0, 0], None
+    s.append(c)
+    t0 = perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        err = type(e).__name__
+        raise
+    finally:
+        s.pop()
+        _record(name, t0, c, err)
+
+
+def timed(fn, name: str | None = None):
+    """fn'i ölçen sarmalayıcı; kapalıyken doğrudan fn çağrılır."""
+    name = name or f"{fn.__module__}.{fn.__qualname__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not _ON:
+            return fn(*args, **kwargs)
+        s, c, err = _stack(), [0, 0, 0, 0], None
+        s.append(c)
+        t0 = perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except BaseException as e:
+            err = type(e).__name__
+            raise
+        finally:
+            s.pop()
+            _record(name, t0, c, err)
+    return wrapper
+
+
+def instrument(ns: dict) -> None:
+    """Modül sonunda trace.instrument(globals()): modülde tanımlı public fonksiyonları sarar."""
+    mod = ns["__name__"]
+    for k, v in list(ns.items()):
+        if (k.startswith("_") or not isinstance(v, types.FunctionType) or v.__module__ != mod
+                or getattr(v, "__wrapped__", v).__code__.co_flags & _CO_GENERATOR):
+            continue  # üreteçte süre yalnız oluşturmayı ölçerdi
+        ns[k] = timed(v)
+    if _ON:
+        _hook()
+
+
+def events(limit: int | None = None) -> list[dict]:
+    with _LOCK:
+        ev = list(_RING)
+    return ev[-limit:] if limit else ev
+
+
+def summary() -> list[dict]:
+    with _LOCK:
+        items = [(k, list(v)) for k, v in _STATS.items()]
+    out = [{"fn": k, "calls": v[0], "total_ms": round(v[1], 3), "mean_ms": round(v[1] / v[0], 3),
+            "max_ms": round(v[2], 3), "rows_read": v[3], "rows_written": v[4],
+            "bytes_read": v[5], "bytes_written": v[6], "errors": v[7]} for k, v in items]
+    return sorted(out, key=lambda r: -r["total_ms"])
+
+
+def dump(path: Path | str | None = None) -> dict:
+    data = {"enabled": _ON, "created": datetime.now().isoformat(timespec="seconds"),
+            "summary": summary(), "events": events()}
+    if path:
+        Path(path).write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    return data
+
+
+if os.environ.get("KOC_TRACE_DUMP"):
+    atexit.register(lambda: dump(os.environ["KOC_TRACE_DUMP"]))
@@ -0,0 +1,128 @@
+# core/weekly_pdfs.py
+"""
+Pazartesi çıktısı: tüm öğrencilerin haftalık ödev PDF'lerini toplu üretir.
+
+İstenen haftaların ödev bölümleri bir kez okunur, (student_id, week_start) ile gruplanır ve her
+grup bir süreç havuzunda assignments_to_pdf ile basılır (matplotlib iş
+parçacığı güvenli değil; süreç başına ayrı kopya). Çıktı ayrı dosyalar ya da
+tek bir zip olur.
+
+    python -m core.weekly_pdfs --week 2025-09-01 --zip --workers 4
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from datetime import date, timedelta
+from pathlib import Path
+from time import perf_counter
+import argparse
+import os
+import zipfile
+
+import pandas as pd
+
+from core import storage
+from core.assignments import get_week_assignments, week_start_of
+from core.dataio import load_students
+from core.export import assignments_to_pdf
+
+def out_dir() -> Path:
+    """Varsayılan çıktı klasörü: <veri kökü>/exports."""
+    return storage.data_root() / "exports"
+
+
+def pdf_file_name(student_id: int, student_name: str, week_start) -> str:
+    # id önde: "a b" ile "a_b" aynı adı üretir, dosyalar birbirini ezmesin
+    return f"odev_{int(student_id)}_{student_name.replace(' ', '_')}_{week_start}.pdf"
+
+
+def _init_worker() -> None:
+    # alt süreçte pencere arka ucu açılmasın
+    os.environ.setdefault("MPLBACKEND", "Agg")
+
+
+def _render(job: tuple) -> tuple:
+    sid, name, ws, rows, backend = job
+    t0 = perf_counter()
+    pdf = assignments_to_pdf(rows, name, ws, ws + timedelta(days=6), backend)
+    return sid, name, ws, pdf, perf_counter() - t0
+
+
+def _jobs(weeks: list[date], student_ids: list[int] | None, backend: str | None) -> list[tuple]:
+    # yalnız istenen haftaların bölümleri okunur
+    df = pd.concat([get_week_assignments(w) for w in weeks], ignore_index=True)
+    students = load_students()
+    if student_ids is not None:
+        df = df[df["student_id"].isin([int(s) for s in student_ids])]
+    names = dict(zip(students["student_id"].astype(int), students["student_name"].astype(str)))
+    jobs = []
+    for (sid, ws), rows in df.groupby(["student_id", "week_start"], sort=True):
+        name = names.get(int(sid), f"Öğrenci {sid}")
+        jobs.append((int(sid), name, ws, rows.sort_values(["ders", "birim", "konu", "kaynak"]), backend))
+    # en büyük işler önce: havuzun sonunda tek uzun iş beklemesin
+    jobs.sort(key=lambda j: -len(j[3]))
+    return jobs
+
+
+def render_weekly_pdfs(weeks: list[date] | None = None, out: Path | None = None, as_zip: bool = False,
+                       workers: int | None = None, student_ids: list[int] | None = None,
+                       backend: str | None = None) -> dict:
+    """
+    weeks: None → bu hafta; verilen haftalar kayıtlı hafta anahtarı olarak olduğu gibi
+    aranır (pazartesiye çekilmez). Ödevi olan her (öğrenci, hafta) için bir PDF
+    out: klasör (dosyalar) ya da .zip yolu; None → data/exports
+    workers: süreç sayısı (None → CPU sayısı, 1 → havuzsuz)
+    Dönüş: {"pdfs", "workers", "seconds", "output", "per_student": [...]}
+    """
+    t0 = perf_counter()
+    weeks = list(weeks) if weeks else [week_start_of(date.today())]
+    jobs = _jobs(weeks, student_ids, backend)
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs)))
+
+    report = []
+    with ExitStack() as stack:
+        if as_zip:
+            out = Path(out) if out else out_dir() / f"odevler_{'_'.join(str(w) for w in weeks)}.zip"
+            out.parent.mkdir(parents=True, exist_ok=True)
+            sink = stack.enter_context(zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED))
+            put = sink.writestr
+        else:
+            out = Path(out) if out else out_dir()
+            out.mkdir(parents=True, exist_ok=True)
+            put = lambda name, pdf: (out / name).write_bytes(pdf)
+
+        if workers == 1:
+            results = map(_render, jobs)
+        else:
+            pool = stack.enter_context(ProcessPoolExecutor(max_workers=workers, initializer=_init_worker))
+            results = pool.map(_render, jobs)
+        # sonuçlar geldikçe yazılır; bellekte tüm PDF'ler birikmez
+        for sid, name, ws, pdf, secs in results:
+            fname = pdf_file_name(sid, name, ws)
+            put(fname, pdf)
+            report.append({"student_id": sid, "student_name": name, "week_start": str(ws),
+                           "file": fname, "bytes": len(pdf), "seconds": round(secs, 3)})
+
+    return {
+        "pdfs": len(report),
+        "workers": workers,
+        "seconds": round(perf_counter() - t0, 3),
+        "output": str(out),
+        "per_student": sorted(report, key=lambda r: (r["week_start"], r["student_id"])),
+    }
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Haftalık ödev PDF'lerini toplu üretir.")
+    ap.add_argument("--week", nargs="*", type=date.fromisoformat, help="Kayıtlı hafta(lar) YYYY-MM-DD (boş → bu hafta)")
+    ap.add_argument("--students", nargs="*", type=int, help="Öğrenci ID'leri (boş → ödevi olan herkes)")
+    ap.add_argument("--out", help="Çıktı klasörü ya da .zip yolu (varsayılan data/exports)")
+    ap.add_argument("--zip", action="store_true", help="Tek zip dosyasına yaz")
+    ap.add_argument("--workers", type=int, help="Süreç sayısı (varsayılan CPU sayısı)")
+    ap.add_argument("--backend", choices=["matplotlib", "direct"], help="PDF arka ucu")
+    args = ap.parse_args()
+    rep = render_weekly_pdfs(args.week, args.out, args.zip, args.workers, args.students, args.backend)
+    for r in rep["per_student"]:
+        print(f"{r['week_start']}  {r['student_name']:<20} {r['seconds']:>7.3f} sn  {r['file']}")
+    print(f"{rep['pdfs']} PDF, {rep['workers']} süreç, {rep['seconds']} sn → {rep['output']}")
@@ -1,6 +1,35 @@
+# --- Path bootstrap ---
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
 import streamlit as st
+from ui_streamlit.tenant import use_tenant
 
 st.set_page_config(page_title="Koç Asistan", layout="centered")
+use_tenant()
+
+# --- Gizli tanı görünümü: ?tani=1 ---
+if st.query_params.get("tani") == "1":
+    import json
+    from core import trace
+
+    st.title("🩺 Tanı – sıcak yol ölçümü")
+    on = st.toggle("Ölçümü aç", value=trace.enabled(),
+                   help="Açıkken core fonksiyonlarının süre ve satır/bayt sayıları toplanır.")
+    if on != trace.enabled():
+        trace.enable(on)
+    if st.button("Sıfırla"):
+        trace.reset()
+    st.subheader("Fonksiyon başına")
+    st.dataframe(trace.summary(), use_container_width=True, hide_index=True)
+    st.subheader("Son çağrılar")
+    st.dataframe(trace.events(200)[::-1], use_container_width=True, hide_index=True)
+    st.download_button("JSON indir", json.dumps(trace.dump(), ensure_ascii=False, indent=2),
+                       file_name="trace.json", mime="application/json")
+    st.stop()
 
 st.title("🎯 Koç Asistan – Ana Sayfa")
 st.write("Aşağıdan ihtiyaç duyduğun sayfayı açabilirsin:")
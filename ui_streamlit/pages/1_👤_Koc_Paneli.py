@@ -8,26 +8,19 @@ if str(ROOT) not in sys.path:
 
 # --- Imports ---
 from datetime import date, timedelta
-import pandas as pd
 import streamlit as st
+from ui_streamlit.tenant import use_tenant
 
 from core.dataio import (
     load_settings, level_to_col, load_topics,
-    load_students, add_student
+    load_students, add_student,
+    get_last_selected_student, set_last_selected_student
 )
 from core.assignments import (
-    week_start_of, get_assignments, add_assignments, update_status
+    week_start_of, get_assignments, add_assignments, apply_status_changes
 )
-from core.resources import get_resources
 from core.resources import get_resources, load_resources
-
-from core.export import assignments_to_pdf
-
-from core.dataio import (
-    load_settings, level_to_col, load_topics,
-    load_students, add_student,
-    get_last_selected_student, set_last_selected_student   # <<< EKLENDİ
-)
+from core.export import assignments_to_pdf_cached, pdf_cache_key, cached_pdf
 
 # --- Stil ---
 st.markdown("""
@@ -45,6 +38,7 @@ section[data-testid="stSidebar"] .stButton>button { width: 100%; }
 </style>
 """, unsafe_allow_html=True)
 
+use_tenant()
 st.title("👤 Koç Paneli")
 
 # ---- Flash mesajı ----
@@ -142,23 +136,30 @@ df_assign = get_assignments(student_id, hafta_baslangic).sort_values(["ders","bi
 if not df_assign.empty:
     col_pdf_l, col_pdf_r = st.columns([0.7, 0.3])
     with col_pdf_r:
-        pdf_bytes = assignments_to_pdf(df_assign, student_name, hafta_baslangic, hafta_bitis)
-        st.download_button(
-            label="📄 Haftalık Ödev PDF'i indir",
-            data=pdf_bytes,
-            file_name=f"odev_{student_name.replace(' ', '_')}_{hafta_baslangic}.pdf",
-            mime="application/pdf"
-        )
+        # PDF yalnızca istenince üretilir; aynı içerik için önbellekten gelir
+        pdf_bytes = cached_pdf(pdf_cache_key(df_assign, student_name, hafta_baslangic, hafta_bitis))
+        if pdf_bytes is None and st.button("📄 Haftalık Ödev PDF'i hazırla"):
+            pdf_bytes = assignments_to_pdf_cached(df_assign, student_name, hafta_baslangic, hafta_bitis)
+        if pdf_bytes is not None:
+            st.download_button(
+                label="📄 Haftalık Ödev PDF'i indir",
+                data=pdf_bytes,
+                file_name=f"odev_{student_name.replace(' ', '_')}_{hafta_baslangic}.pdf",
+                mime="application/pdf"
+            )
 if df_assign.empty:
     st.info("Bu hafta için hedef atanmadı. Aşağıdan **Yeni Hedef Ekle** kısmını kullan.")
 else:
+    # İşaretlemeler form içinde toplanır; "Kaydet" ile tek seferde yazılır
+    form = st.form(f"form_status|{student_id}|{hafta_baslangic}")
+    secimler = []
     # Ders bazında
     for ders_ad, df_ders in df_assign.groupby("ders", sort=False):
         toplam = len(df_ders)
         tamam = int(df_ders["durum"].sum())
         pct = int(round(100 * (tamam / toplam))) if toplam else 0
 
-        with st.expander(f"{ders_ad} — {tamam}/{toplam} (%{pct})", expanded=True):
+        with form.expander(f"{ders_ad} — {tamam}/{toplam} (%{pct})", expanded=True):
             # Tür bazında sıralı gösterim: Video → Dakika → Soru
             for tur, df_tur in sorted(df_ders.groupby("birim"), key=lambda kv: TYPE_ORDER.get(kv[0], 99)):
                 icon = TYPE_ICON.get(tur, "📌")
@@ -185,23 +186,17 @@ else:
                     with cols[1]:
                         st.markdown(f"**{row.konu}**  \n<span class='item-meta'>{alt}</span>",
                                     unsafe_allow_html=True)
-
                     if done != bool(row.durum):
-                        update_status(student_id, hafta_baslangic, ders_ad, row.konu, done,
-                                      birim=row.birim, kaynak=row.kaynak)
-                        # anında görsel güncelleme + rerun
-                        mask = (
-                            (df_assign["ders"] == ders_ad) &
-                            (df_assign["konu"] == row.konu) &
-                            (df_assign["birim"] == row.birim) &
-                            (df_assign["kaynak"].fillna("") ==
-                             (row.kaynak if pd.notna(row.kaynak) else ""))
-                        )
-                        df_assign.loc[mask, "durum"] = bool(done)
-                        st.session_state["flash"] = f"Güncellendi: {ders_ad} / {row.konu} [{row.birim}] → {'✓' if done else '✗'}"
-                        st.rerun()
-
-        st.progress(pct)
+                        secimler.append({"student_id": student_id, "week_start": hafta_baslangic,
+                                         "ders": ders_ad, "konu": row.konu, "birim": row.birim,
+                                         "kaynak": row.kaynak, "done": done})
+
+        form.progress(pct)
+
+    if form.form_submit_button("💾 Değişiklikleri kaydet"):
+        n = apply_status_changes(secimler) if secimler else 0
+        st.session_state["flash"] = f"{n} hedefin durumu kaydedildi."
+        st.rerun()
 
     # küçük ders özeti chip'leri
     st.caption("Bu haftanın ders bazında görev sayıları")
@@ -7,8 +7,10 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 import streamlit as st
+from ui_streamlit.tenant import use_tenant
 from core.dataio import load_students, add_student, rename_student, deactivate_student, reactivate_student
 
+use_tenant()
 st.title("🧑‍🎓 Öğrenci Yönetimi")
 
 # ➕ Ekle
@@ -7,6 +7,7 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 import streamlit as st
+from ui_streamlit.tenant import use_tenant
 import pandas as pd
 
 from core.resources import (
@@ -16,6 +17,7 @@ from core.resource_features import (
     load_resource_features, upsert_resource_feature
 )
 
+use_tenant()
 st.title("📚 Kaynak Yönetimi")
 
 st.markdown("""
@@ -8,12 +8,14 @@ if str(ROOT) not in sys.path:
 
 # --- Imports ---
 import streamlit as st
+from ui_streamlit.tenant import use_tenant
 import pandas as pd
 
 from core.dataio import load_students, load_settings, level_to_col, load_topics
-from core.curriculum import generate_from_topics, get_curriculum
+from core.curriculum import generate_plan, generate_plan_cohort, get_curriculum
 
 st.set_page_config(page_title="Müfredat Planı", page_icon="📒", layout="wide")
+use_tenant()
 st.title("📒 Müfredat Planı")
 
 # -----------------------------
@@ -106,16 +108,24 @@ def _iter_topic_min_pairs(df: pd.DataFrame):
             yield t, int(fixed_minutes)
 
 
-if st.button("📌 Bu ders için planı oluştur/güncelle", type="primary"):
-    try:
-        # Tek tek ekle (generate_from_topics idempotent; varsa dokunmaz)
-        for t, m in _iter_topic_min_pairs(sub):
-            generate_from_topics(student_id=sid, subject=subject, topics=[t], minutes_each=m)
-
-        st.success("Plan güncellendi. İzleme sayfasından ilerleyişi görebilirsiniz.")
-        st.rerun()
-    except Exception as e:
-        st.error(f"Plan oluşturma hatası: {e}")
+colb1, colb2 = st.columns([1, 1])
+with colb1:
+    if st.button("📌 Bu ders için planı oluştur/güncelle", type="primary"):
+        try:
+            # Tek okuma + tek yazım (generate_plan idempotent; varsa dokunmaz)
+            n = generate_plan(sid, subject, list(_iter_topic_min_pairs(sub)))
+            st.success(f"Plan güncellendi ({n} yeni konu). İzleme sayfasından ilerleyişi görebilirsiniz.")
+            st.rerun()
+        except Exception as e:
+            st.error(f"Plan oluşturma hatası: {e}")
+with colb2:
+    if st.button("👥 Tüm aktif öğrencilere uygula"):
+        try:
+            n = generate_plan_cohort(list(name_to_id.values()), subject, list(_iter_topic_min_pairs(sub)))
+            st.success(f"{len(name_to_id)} öğrenci için plan güncellendi ({n} yeni satır).")
+            st.rerun()
+        except Exception as e:
+            st.error(f"Plan oluşturma hatası: {e}")
 
 # İsteğe bağlı: Mevcut konu listesi önizleme
 with st.expander("Konuları göster"):
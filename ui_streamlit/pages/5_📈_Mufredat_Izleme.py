@@ -8,8 +8,8 @@ if str(ROOT) not in sys.path:
 
 # --- Imports ---
 import streamlit as st
+from ui_streamlit.tenant import use_tenant
 import pandas as pd
-import matplotlib.pyplot as plt
 
 from core.dataio import load_students, load_settings, level_to_col, load_topics
 from core.curriculum import (
@@ -18,6 +18,7 @@ from core.curriculum import (
 )
 
 st.set_page_config(page_title="Müfredat İzleme", page_icon="📈", layout="wide")
+use_tenant()
 st.title("📈 Müfredat İzleme")
 
 # -----------------------------
@@ -65,6 +66,19 @@ def _fmt(m: int) -> str:
     m = int(m); h, r = divmod(m, 60)
     return f"{h}s {r}dk" if h else f"{r}dk"
 
+def _donut_svg(done: int, total: int, label: str, size: int = 200) -> str:
+    # matplotlib (~0.4 sn import) yerine satır içi SVG: yapılan mavi, kalan turuncu
+    r, c = 32.5, 2 * 3.14159265 * 32.5
+    arc = c * min(max(done / total, 0), 1) if total else 0
+    return (
+        f"<svg width='{size}' height='{size}' viewBox='0 0 100 100'>"
+        f"<circle cx='50' cy='50' r='{r}' fill='none' stroke='#ff7f0e' stroke-width='17.5'/>"
+        f"<circle cx='50' cy='50' r='{r}' fill='none' stroke='#1f77b4' stroke-width='17.5' "
+        f"stroke-dasharray='{arc:.2f} {c:.2f}' transform='rotate(-90 50 50)'/>"
+        f"<text x='50' y='50' text-anchor='middle' dominant-baseline='central' "
+        f"font-size='11' font-weight='bold' fill='currentColor'>{label}</text></svg>"
+    )
+
 total_target = int(cur["target_min"].sum())
 total_done   = int(cur["done_min"].sum())
 total_rem    = max(total_target - total_done, 0)
@@ -73,11 +87,7 @@ pct_total    = round(100 * total_done / total_target, 1) if total_target else 0.
 st.subheader(f"Özet — {subject}")
 st.caption(f"Hedef: **{_fmt(total_target)}**, Yapılan: **{_fmt(total_done)}**, Kalan: **{_fmt(total_rem)}**")
 
-fig, ax = plt.subplots(figsize=(2.8, 2.8))
-ax.pie([total_done, max(total_target-total_done, 0)], startangle=90, wedgeprops=dict(width=0.35))
-ax.text(0, 0, f"%{pct_total}", ha="center", va="center", fontsize=14, weight="bold")
-ax.set(aspect="equal")
-st.pyplot(fig, use_container_width=False)
+st.markdown(_donut_svg(total_done, total_target, f"%{pct_total}"), unsafe_allow_html=True)
 
 st.divider()
 
@@ -8,6 +8,7 @@ if str(ROOT) not in sys.path:
 
 # --- imports ---
 import streamlit as st
+from ui_streamlit.tenant import use_tenant
 import pandas as pd
 
 from core.resource_features import (
@@ -29,6 +30,7 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+use_tenant()
 st.title("🔎 Kaynak Özellikleri")
 
 # --- veriyi yükle ---
@@ -7,8 +7,10 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 import streamlit as st
+from ui_streamlit.tenant import use_tenant
 from core.channel_features import load_channels, list_by_subject, render_channel_card
 
+use_tenant()
 st.title("📺 Kanal Önerileri")
 
 df = load_channels()
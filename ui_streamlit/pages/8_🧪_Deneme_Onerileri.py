@@ -7,9 +7,11 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 import streamlit as st
+from ui_streamlit.tenant import use_tenant
 import pandas as pd
 from core.exam_reviews import load_exam_reviews, recommend_exams, render_exam_card
 
+use_tenant()
 st.title("🧪 Deneme Önerileri")
 
 df = load_exam_reviews()
@@ -0,0 +1,31 @@
+# ui_streamlit/tenant.py
+"""
+Kiracı (koçluk merkezi) seçimi.
+
+KOC_TENANTS ayarlıysa her sayfa en başta use_tenant() çağırır: adresteki
+?merkez=<ad> (bir kez yeterli, oturumda saklanır) KOC_TENANTS/<ad>/
+klasörünü bu çalıştırmanın veri kökü yapar (core.storage.set_root). Ayarlı
+değilse tek kök (KOC_DATA ya da data/) kullanılır ve hiçbir şey yapılmaz.
+"""
+import os
+
+import streamlit as st
+
+_KEY = "_merkez"
+
+
+def use_tenant() -> str | None:
+    if not os.environ.get("KOC_TENANTS"):
+        return None
+    from core import storage
+
+    name = st.query_params.get("merkez") or st.session_state.get(_KEY)
+    try:
+        root = storage.tenant_root(name or "")
+    except ValueError as e:
+        st.error(f"Merkez seçilemedi: {e} Adresin sonuna ?merkez=<ad> ekleyin.")
+        st.stop()
+    st.session_state[_KEY] = name
+    # Streamlit her çalıştırmayı kendi iş parçacığında yürütür; kök o bağlamda kalır
+    storage.set_root(root)
+    return name